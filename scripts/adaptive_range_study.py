@@ -0,0 +1,212 @@
+'''
+# Name: adaptive_range_study.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Adaptive range refinement in place of FullFactorialDriver(num_levels=20)
+
+# Starts from a coarse set of range levels, optimizes every vehicle at each
+# level (design_optimizer.py) and recursively bisects the range intervals where
+#   - the active constraint set, the feasibility or the cheapest vehicle changes
+#     (e.g. the tiltwing / helicopter crossover, or the activation of the maximum
+#     battery fraction constraint of fuel_constraint.py), down to min_width
+#   - the estimated DOC interpolation error (h^2 / 8 |DOC''|) exceeds doc_tol
+#   - the optimal design changes by more than design_tol (relative)
+# until every interval meets the tolerances or the budget is spent. The midpoints
+# of each refinement pass are optimized in parallel, warm started from their
+# interval ends. COBYLA cold starts do not always find a feasible optimum (the
+# helicopter in particular), so before bisecting a feasibility change the
+# infeasible end is re-optimized once from the feasible end.
+
+# Inputs:
+#   vehicles    - list of vehicle types, e.g. ['tiltwing', 'helicopter']
+#   start, stop - range interval [m]
+#   levels      - initial number of range levels [default 5]
+#   doc_tol     - DOC interpolation error tolerance [$] [default 0.25]
+#   design_tol  - relative design change tolerance per interval [default 0.1]
+#   min_width   - smallest interval [m] [default 1000]
+#   max_points  - budget of range levels [default 40]
+#   max_evaluations - budget of model evaluations [default None]
+#   processes   - worker processes [default 1]
+#   battery_fraction - maximum battery mass fraction of MTOM, 1/3 in fuel_constraint.py [default None]
+
+# Outputs:
+#   dict with ranges, results ({range: {Vehicle: optimize_design result + active}}),
+#   best (cheapest feasible vehicle per range), switches (intervals where the active set,
+#   feasibility or best vehicle changes), evaluations, converged
+'''
+
+from __future__ import print_function
+
+import multiprocessing
+
+import numpy as np
+
+from design_optimizer import DesignProblem, optimize_design
+from design_grid import write_csv
+
+
+def _optimize_level(args):
+    ''' Optimize every vehicle at one range level '''
+    range, vehicles, starts, battery_fraction, assumptions = args
+    results = {}
+    for Vehicle in vehicles:
+        opt = optimize_design(Vehicle, range, x0=starts.get(Vehicle), battery_fraction=battery_fraction,
+                              **assumptions)
+        opt['active'] = DesignProblem(Vehicle, range, battery_fraction, **assumptions).active_constraints(
+            opt['xScaled'])
+        results[Vehicle] = opt
+    return range, results
+
+
+def best_vehicle(results):
+    ''' Cheapest feasible vehicle of one range level (None if none is feasible) '''
+    feasible = [(opt['DOC'], Vehicle) for Vehicle, opt in results.items() if opt['feasible']]
+    return min(feasible)[1] if feasible else None
+
+
+def _changes(a, b):
+    ''' What changes between two range levels: active sets, feasibility, cheapest vehicle '''
+    changes = []
+    for Vehicle in sorted(a):
+        if a[Vehicle]['feasible'] != b[Vehicle]['feasible']:
+            changes.append('{} feasibility'.format(Vehicle))
+        elif a[Vehicle]['feasible'] and a[Vehicle]['active'] != b[Vehicle]['active']:
+            changes.append('{} active set'.format(Vehicle))
+    if best_vehicle(a) != best_vehicle(b):
+        changes.append('best vehicle')
+    return changes
+
+
+def interval_scores(ranges, results, doc_tol, design_tol):
+    ''' Refinement score of every interval (> 1: refine), inf where the active set,
+        feasibility or cheapest vehicle changes. Infeasible optima carry no information
+        about the DOC curve and are only used to locate the feasibility boundaries. '''
+    ranges = np.asarray(ranges)
+    h = np.diff(ranges)
+    scores = np.zeros(len(h))
+    for Vehicle in results[ranges[0]]:
+        DOC = np.array([results[r][Vehicle]['DOC'] for r in ranges])
+        x = np.array([results[r][Vehicle]['x'] for r in ranges])
+        feasible = np.array([results[r][Vehicle]['feasible'] for r in ranges])
+        both = feasible[1:] & feasible[:-1]
+
+        # Linear interpolation error h^2 / 8 |DOC''|, DOC'' from the adjacent slopes
+        slopes = np.diff(DOC) / h
+        curvature = np.zeros(len(h))
+        if len(h) > 1:
+            second = np.where(both[1:] & both[:-1], np.abs(np.diff(slopes)) / (0.5 * (h[1:] + h[:-1])), 0.0)
+            curvature[:-1] = second
+            curvature[1:] = np.maximum(curvature[1:], second)
+        scores = np.where(both, np.fmax(scores, h ** 2 / 8.0 * curvature / doc_tol), scores)
+
+        change = np.max(np.abs(np.diff(x, axis=0)) / np.maximum(np.abs(x[1:]), np.abs(x[:-1])), axis=1)
+        scores = np.where(both, np.fmax(scores, change / design_tol), scores)
+
+    for i in range(len(h)):
+        if _changes(results[ranges[i]], results[ranges[i + 1]]):
+            scores[i] = np.inf
+    return scores
+
+
+def _midpoint_start(a, b):
+    ''' (Vehicle, x0) warm start of an interval midpoint from its ends, (Vehicle, None) for a cold start '''
+    if a['feasible'] and b['feasible'] and a['active'] == b['active']:
+        return a['Vehicle'], 0.5 * (a['xScaled'] + b['xScaled'])
+    if a['feasible'] or b['feasible']:
+        return a['Vehicle'], a['xScaled'] if a['feasible'] else b['xScaled']
+    return a['Vehicle'], None
+
+
+def _retry_tasks(lower, upper, results, retried, battery_fraction, assumptions):
+    ''' Re-optimize the infeasible end of a feasibility change once, warm started from the feasible end '''
+    tasks = []
+    for Vehicle in results[lower]:
+        a, b = results[lower][Vehicle], results[upper][Vehicle]
+        if a['feasible'] == b['feasible']:
+            continue
+        r, start = (lower, b['xScaled']) if b['feasible'] else (upper, a['xScaled'])
+        if (r, Vehicle) not in retried:
+            retried.add((r, Vehicle))
+            tasks.append((r, [Vehicle], {Vehicle: start}, battery_fraction, assumptions))
+    return tasks
+
+
+def adaptive_range_study(vehicles, start, stop, levels=5, doc_tol=0.25, design_tol=0.1, min_width=1000.0,
+                         max_points=40, max_evaluations=None, processes=1, battery_fraction=None,
+                         progress=False, **assumptions):
+    ''' Adaptive range study, see the header for the returned dict. '''
+    results = {}
+    retried = set()
+    evaluations = 0
+    pool = multiprocessing.Pool(processes) if processes > 1 else None
+    try:
+        tasks = [(float(r), vehicles, {}, battery_fraction, assumptions) for r in np.linspace(start, stop, levels)]
+        converged = False
+        while tasks:
+            done = pool.map(_optimize_level, tasks, chunksize=1) if pool is not None else map(_optimize_level, tasks)
+            for r, levelResults in done:
+                results.setdefault(r, {}).update(levelResults)
+                evaluations += sum(opt['nfev'] for opt in levelResults.values())
+
+            ranges = sorted(results)
+            scores = interval_scores(ranges, results, doc_tol, design_tol)
+            widths = np.diff(ranges)
+            candidates = [i for i in np.argsort(-scores, kind='mergesort')
+                          if scores[i] > 1.0 and widths[i] >= 2.0 * min_width]
+            if progress:
+                print('{} range levels, {} model evaluations, {} intervals to refine'.format(
+                    len(ranges), evaluations, len(candidates)))
+
+            budget = max_points - len(ranges)
+            if max_evaluations is not None and evaluations >= max_evaluations:
+                budget = 0
+            converged = not candidates
+            if converged or budget <= 0:
+                break
+
+            tasks = []
+            for i in candidates:
+                if len(tasks) >= max(1, processes):
+                    break
+                retry = _retry_tasks(ranges[i], ranges[i + 1], results, retried, battery_fraction, assumptions)
+                if retry or budget <= 0:
+                    tasks += retry
+                    continue
+                a, b = results[ranges[i]], results[ranges[i + 1]]
+                tasks.append((0.5 * (ranges[i] + ranges[i + 1]), vehicles, dict(_midpoint_start(a[Vehicle], b[Vehicle])
+                              for Vehicle in vehicles), battery_fraction, assumptions))
+                budget -= 1
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    ranges = sorted(results)
+    switches = [{'range': (a, b), 'changes': _changes(results[a], results[b])} for a, b in zip(ranges[:-1], ranges[1:])]
+    return {'ranges': ranges, 'results': results, 'best': [best_vehicle(results[r]) for r in ranges],
+            'switches': [s for s in switches if s['changes']], 'evaluations': evaluations, 'converged': converged}
+
+
+def study_rows(study, Vehicle):
+    ''' (range, rProp, cruiseSpeed, mBattery, mMotors, mtom, DOC) rows of one vehicle, see design_grid.COLUMNS '''
+    return np.array([[r] + list(study['results'][r][Vehicle]['x']) + [study['results'][r][Vehicle]['DOC']]
+                     for r in study['ranges']])
+
+
+if __name__ == "__main__":
+    # Sample Inputs: both vehicles over the range of vahana_optimizer.py
+    vehicles = [u'tiltwing', u'helicopter']
+    study = adaptive_range_study(vehicles, 10000.0, 200000.0, processes=2, progress=True)
+    for r, best in zip(study['ranges'], study['best']):
+        print('Range (km): {:.2f}, best: {}, '.format(r / 1000.0, best) + ', '.join(
+            '{} DOC ($): {:.3f}{}'.format(Vehicle, study['results'][r][Vehicle]['DOC'],
+                                          '' if study['results'][r][Vehicle]['feasible'] else ' (infeasible)')
+            for Vehicle in vehicles))
+    for s in study['switches']:
+        print('{:.2f} - {:.2f} km: {}'.format(s['range'][0] / 1000.0, s['range'][1] / 1000.0, ', '.join(s['changes'])))
+    print('{} range levels, {} model evaluations, converged: {}'.format(len(study['ranges']), study['evaluations'],
+                                                                        study['converged']))
+    for Vehicle in vehicles:
+        write_csv('results_{}.csv'.format(Vehicle), study_rows(study, Vehicle))
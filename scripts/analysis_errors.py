@@ -0,0 +1,65 @@
+'''
+# Name: analysis_errors.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Soft failures (openmdao.core.system.AnalysisError) of the physics components
+
+# Designs outside the valid region of the model used to abort a whole sweep
+# with a ZeroDivisionError (rProp or V of 0), a math domain error (math.sqrt
+# of a negative number in the wing / hover / loiter math) or an unrecognized
+# vehicle, or to carry NaNs silently into the DOC. The physics components now
+# check their inputs cheaply (check_positive) and are wrapped with
+# analysis_errors, which turns arithmetic and domain errors and non-finite
+# outputs into an AnalysisError naming the component. PenaltyScipyOptimizer
+# (penalty_optimizer.py) reports such points to the optimizer as infeasible
+# with a large penalty. Only openmdao.core.system is imported, so the
+# components load without openmdao.api and its drivers (scipy).
+
+# Inputs:
+#   component   - the Component raising the error (for its pathname)
+#   params      - component params, names of the ones that must be positive
+
+# Outputs:
+#   AnalysisError
+'''
+
+from __future__ import print_function
+
+import functools
+import math
+
+import numpy as np
+
+from openmdao.core.system import AnalysisError
+
+# Objective of a failed point, and minus the value of its constraints (scipy: >= 0 is feasible)
+PENALTY = 1.0e6
+
+
+def _name(component):
+    return component.pathname or type(component).__name__
+
+
+def check_positive(component, params, *names):
+    ''' Raise AnalysisError unless params[name] is finite and > 0 for every name '''
+    for name in names:
+        value = params[name]
+        if not (value > 0.0 and not math.isinf(value)):
+            raise AnalysisError('{}: {} = {} is outside of the model'.format(_name(component), name, value))
+
+
+def analysis_errors(solve_nonlinear):
+    ''' solve_nonlinear decorator: arithmetic / domain errors and non-finite outputs raise AnalysisError '''
+    @functools.wraps(solve_nonlinear)
+    def wrapper(self, params, unknowns, resids):
+        try:
+            solve_nonlinear(self, params, unknowns, resids)
+        except (ArithmeticError, ValueError) as err:
+            raise AnalysisError('{}: {}: {}'.format(_name(self), type(err).__name__, err))
+        if not np.all(np.isfinite(unknowns.vec)):
+            bad = [name for name in unknowns if not unknowns.metadata(name).get('pass_by_obj') and
+                   not np.all(np.isfinite(unknowns[name]))]
+            raise AnalysisError('{}: non-finite {}'.format(_name(self), ', '.join(bad)))
+    return wrapper
@@ -0,0 +1,281 @@
+'''
+# Name: bayesian_optimizer.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Constrained Bayesian optimization of DOC at one range point
+
+# Replaces the penalty work-around of dev/bayesian_cost_function_work_around*.py
+# (constraint violations folded into the objective with hand-tuned multipliers)
+# with separate Gaussian process surrogates (Matern 5/2, ARD, hyperparameters
+# by maximum marginal likelihood) for DOC and for each model constraint
+# (c1 .. c3, c4 for the helicopter). The acquisition is the expected improvement
+# over the best feasible DOC times the probability of feasibility (only the
+# probability of feasibility until a feasible design is found). Each iteration
+# proposes a batch of q designs (kriging believer: each proposal is added to the
+# surrogates at its predicted value before the next one is chosen), evaluated
+# in parallel workers. The design variable bounds and the optional battery
+# fraction (con5 of fuel_constraint.py) are known exactly and are not modelled.
+
+# Surrogates are fit on log(DOC) and asinh(margin / typical margin), which keeps
+# the sign (feasibility) of each margin but compresses the orders of magnitude
+# the margins span over the design space. Designs where the model breaks down
+# (nan) count as infeasible.
+
+# Inputs:
+#   Vehicle     - 'tiltwing' or 'helicopter'
+#   range       - mission range [m]
+#   evaluations - budget of model evaluations [default 60]
+#   initial     - Latin hypercube points of the initial design, plus DESIGN_START [default 2 * 5 + 1]
+#   batch       - designs per iteration (q) [default 4]
+#   bounds      - search box in optimizer units [default design_optimizer.DESIGN_BOUNDS]
+#   processes   - worker processes for the model evaluations [default 1]
+#   assumptions - "What If" inputs of vahana_batch.py (scalars)
+
+# Outputs:
+#   dict with x, xScaled, DOC, margins, feasible of the best design, nfev, and history
+#   (X: evaluated designs in optimizer units, DOC, margins, feasible)
+'''
+
+from __future__ import print_function
+
+import multiprocessing
+
+import numpy as np
+from scipy import linalg, special
+from scipy.optimize import minimize
+
+from vahana_batch import evaluate_batch
+from design_grid import latin_hypercube
+from design_optimizer import DESIGN_BOUNDS, DESIGN_START, MODEL_CONSTRAINTS, FEASIBILITY_TOL, \
+    BATTERY_FRACTION_TOL, to_design
+from vehicle import vehicle_key
+
+# Hyperparameter box (unit cube inputs, standardized outputs)
+LOG_LENGTH_BOUNDS = (np.log(0.01), np.log(10.0))
+LOG_NOISE_BOUNDS = (np.log(1e-8), np.log(1e-2))
+
+# Acquisition candidates: global uniform points and Gaussian perturbations of the best design
+CANDIDATES = 2000
+LOCAL_SCALES = (0.1, 0.02, 0.004)
+
+
+def _matern52(A, B, lengths):
+    d = np.sqrt(np.maximum(np.sum(((A[:, None, :] - B[None, :, :]) / lengths) ** 2, axis=-1), 0.0))
+    s = np.sqrt(5.0) * d
+    return (1.0 + s + s ** 2 / 3.0) * np.exp(-s)
+
+
+class GaussianProcess(object):
+    ''' Zero-mean GP on standardized outputs with a Matern 5/2 ARD kernel '''
+
+    def __init__(self, X, y, restarts=3, seed=0, theta=None):
+        self.X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self.mean = np.mean(y)
+        self.scale = np.std(y) if np.std(y) > 0.0 else 1.0
+        self.y = (y - self.mean) / self.scale
+        if theta is None:
+            theta = self._fit(restarts, seed)
+        self.theta = theta
+        self._factor()
+
+    def _unpack(self, theta):
+        return np.exp(theta[:-2]), np.exp(theta[-2]), np.exp(theta[-1])
+
+    def _nll(self, theta):
+        lengths, signal, noise = self._unpack(theta)
+        K = signal * _matern52(self.X, self.X, lengths) + (noise + 1e-10) * np.eye(len(self.X))
+        try:
+            L = linalg.cholesky(K, lower=True)
+        except linalg.LinAlgError:
+            return 1e10
+        alpha = linalg.cho_solve((L, True), self.y)
+        return 0.5 * self.y.dot(alpha) + np.sum(np.log(np.diag(L)))
+
+    def _fit(self, restarts, seed):
+        d = self.X.shape[1]
+        bounds = [LOG_LENGTH_BOUNDS] * d + [(np.log(0.05), np.log(20.0)), LOG_NOISE_BOUNDS]
+        random = np.random.RandomState(seed)
+        best = None
+        for k in np.arange(restarts):
+            start = np.concatenate((np.full(d, np.log(0.3)), [0.0, np.log(1e-6)]))
+            if k:
+                start = np.array([random.uniform(lo, hi) for lo, hi in bounds])
+            result = minimize(self._nll, start, method='L-BFGS-B', bounds=bounds)
+            if best is None or result.fun < best.fun:
+                best = result
+        return best.x
+
+    def _factor(self):
+        lengths, signal, noise = self._unpack(self.theta)
+        K = signal * _matern52(self.X, self.X, lengths) + (noise + 1e-10) * np.eye(len(self.X))
+        self._L = linalg.cholesky(K, lower=True)
+        self._alpha = linalg.cho_solve((self._L, True), self.y)
+
+    def predict(self, Xs):
+        ''' Posterior mean and standard deviation at Xs (original output units) '''
+        lengths, signal, noise = self._unpack(self.theta)
+        Ks = signal * _matern52(np.atleast_2d(Xs), self.X, lengths)
+        v = linalg.solve_triangular(self._L, Ks.T, lower=True)
+        variance = np.maximum(signal - np.sum(v ** 2, axis=0), 1e-12)
+        return self.mean + self.scale * Ks.dot(self._alpha), self.scale * np.sqrt(variance)
+
+    def condition(self, x, y):
+        ''' GP with (x, y) added to the data, same hyperparameters and output standardization '''
+        gp = GaussianProcess.__new__(GaussianProcess)
+        gp.X = np.vstack((self.X, x))
+        gp.mean, gp.scale = self.mean, self.scale
+        gp.y = np.append(self.y, (y - self.mean) / self.scale)
+        gp.theta = self.theta
+        gp._factor()
+        return gp
+
+
+def _evaluate_point(args):
+    Vehicle, range, xScaled, assumptions = args
+    result = evaluate_batch(Vehicle, range, *to_design(Vehicle, xScaled), **assumptions)
+    return float(result['DOC'][0]), result['margins'][0]
+
+
+def expected_improvement(mean, std, best):
+    ''' Expected improvement below best (minimization) '''
+    z = (best - mean) / std
+    return std * (z * special.ndtr(z) + np.exp(-0.5 * z ** 2) / np.sqrt(2.0 * np.pi))
+
+
+def acquisition(objective, constraints, best, U):
+    ''' EI x probability of feasibility (probability of feasibility while best is None) '''
+    feasibility = np.ones(len(U))
+    for gp in constraints:
+        mean, std = gp.predict(U)
+        feasibility *= special.ndtr(mean / std)
+    if best is None:
+        return feasibility
+    mean, std = objective.predict(U)
+    return expected_improvement(mean, std, best) * feasibility
+
+
+class BayesianProblem(object):
+    ''' Surrogate targets and exact (known) constraints of one range point '''
+
+    def __init__(self, Vehicle, range, bounds=None, battery_fraction=None, **assumptions):
+        self.Vehicle = Vehicle
+        self.vehicle = vehicle_key(Vehicle)
+        self.range = range
+        self.bounds = np.array(DESIGN_BOUNDS[self.vehicle] if bounds is None else bounds, dtype=float)
+        self.battery_fraction = battery_fraction
+        self.assumptions = assumptions
+        self.columns = list(MODEL_CONSTRAINTS[self.vehicle])
+
+    def to_scaled(self, U):
+        return self.bounds[:, 0] + np.asarray(U) * (self.bounds[:, 1] - self.bounds[:, 0])
+
+    def to_unit(self, X):
+        return (np.asarray(X) - self.bounds[:, 0]) / (self.bounds[:, 1] - self.bounds[:, 0])
+
+    def known_feasible(self, U):
+        ''' Exact constraints (the battery fraction) at unit points U '''
+        if self.battery_fraction is None:
+            return np.ones(len(U), dtype=bool)
+        x = to_design(self.Vehicle, self.to_scaled(U))
+        return self.battery_fraction * x[:, 4] - x[:, 2] > -BATTERY_FRACTION_TOL
+
+    def feasible(self, margins, U):
+        ok = np.all(margins[:, self.columns] > -FEASIBILITY_TOL[self.columns], axis=1)
+        return ok & self.known_feasible(U)
+
+
+def _surrogates(problem, U, DOC, margins, feasible, seed):
+    ''' GPs of log(DOC) (finite points only) and of every transformed model margin '''
+    finite = np.isfinite(DOC) & np.all(np.isfinite(margins[:, problem.columns]), axis=1)
+    objective = GaussianProcess(U[finite], np.log(np.maximum(DOC[finite], 1e-12)), seed=seed)
+    constraints = []
+    for column in problem.columns:
+        g = margins[:, column]
+        typical = np.median(np.abs(g[finite])) if np.any(finite) else 1.0
+        t = np.arcsinh(g / max(typical, 1e-12))
+        # Model failures are as infeasible as the worst point seen
+        t = np.where(np.isfinite(t), t, np.min(t[np.isfinite(t)]) if np.any(np.isfinite(t)) else -1.0)
+        constraints.append(GaussianProcess(U, t, seed=seed))
+    return objective, constraints
+
+
+def _propose(problem, objective, constraints, best, incumbent, q, random):
+    ''' q unit-cube proposals, kriging believer '''
+    d = len(problem.bounds)
+    proposals = []
+    for k in np.arange(q):
+        U = random.random_sample((CANDIDATES, d))
+        if incumbent is not None:
+            local = [incumbent + s * random.standard_normal((CANDIDATES // 4, d)) for s in LOCAL_SCALES]
+            U = np.clip(np.vstack([U] + local), 0.0, 1.0)
+        a = acquisition(objective, constraints, best, U) * problem.known_feasible(U)
+        u0 = U[np.argmax(a)]
+        polished = minimize(lambda u: -acquisition(objective, constraints, best, u[None, :])[0], u0,
+                            method='L-BFGS-B', bounds=[(0.0, 1.0)] * d)
+        u = polished.x if -polished.fun > np.max(a) and problem.known_feasible(polished.x[None, :])[0] else u0
+        proposals.append(u)
+
+        # Believe the surrogate means at u
+        objective = objective.condition(u, objective.predict(u)[0][0])
+        constraints = [gp.condition(u, gp.predict(u)[0][0]) for gp in constraints]
+    return np.array(proposals)
+
+
+def bayesian_optimize(Vehicle, range, evaluations=60, initial=None, batch=4, bounds=None, battery_fraction=None,
+                      seed=0, processes=1, progress=False, **assumptions):
+    ''' Constrained Bayesian optimization at one range, see the header for the returned dict. '''
+    problem = BayesianProblem(Vehicle, range, bounds, battery_fraction, **assumptions)
+    d = len(problem.bounds)
+    initial = 2 * d + 1 if initial is None else initial
+    random = np.random.RandomState(seed)
+    U = np.vstack((problem.to_unit(DESIGN_START[problem.vehicle]), latin_hypercube(initial - 1, d, seed)))
+    U = np.clip(U, 0.0, 1.0)
+
+    DOC = np.empty(0)
+    margins = np.empty((0, 6))
+    pool = multiprocessing.Pool(processes) if processes > 1 else None
+    try:
+        pending = U
+        U = np.empty((0, d))
+        while len(pending):
+            tasks = [(Vehicle, range, x, assumptions) for x in problem.to_scaled(pending)]
+            done = pool.map(_evaluate_point, tasks, chunksize=1) if pool is not None else map(_evaluate_point, tasks)
+            U = np.vstack((U, pending))
+            DOC = np.append(DOC, [f for f, g in done])
+            margins = np.vstack([margins] + [g for f, g in done])
+            feasible = problem.feasible(margins, U) & np.isfinite(DOC)
+
+            best = np.min(DOC[feasible]) if np.any(feasible) else None
+            if progress:
+                print('{} model evaluations, best feasible DOC ($): {}'.format(len(U), best))
+            q = min(batch, evaluations - len(U))
+            if q <= 0:
+                break
+            objective, constraints = _surrogates(problem, U, DOC, margins, feasible, seed)
+            incumbent = U[feasible][np.argmin(DOC[feasible])] if best is not None else None
+            pending = _propose(problem, objective, constraints, None if best is None else np.log(best), incumbent,
+                               q, random)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    i = np.flatnonzero(feasible)[np.argmin(DOC[feasible])] if np.any(feasible) else np.nanargmin(DOC)
+    X = problem.to_scaled(U)
+    return {'Vehicle': Vehicle, 'range': range, 'assumptions': assumptions, 'x': to_design(Vehicle, X[i]),
+            'xScaled': X[i], 'DOC': DOC[i], 'margins': margins[i], 'feasible': bool(feasible[i]), 'nfev': len(U),
+            'history': {'X': X, 'DOC': DOC, 'margins': margins, 'feasible': feasible}}
+
+
+if __name__ == "__main__":
+    # Sample Inputs: tiltwing at 50 km, compared with COBYLA (design_optimizer.py)
+    from design_optimizer import optimize_design
+    result = bayesian_optimize(u'tiltwing', 50000.0, evaluations=60, processes=2, progress=True)
+    cobyla = optimize_design(u'tiltwing', 50000.0)
+    print('Bayesian: DOC ($): {:.4f}, feasible: {}, {} model evaluations, design: {}'.format(
+        result['DOC'], result['feasible'], result['nfev'], np.round(result['x'], 3)))
+    print('COBYLA: DOC ($): {:.4f}, feasible: {}, {} model evaluations, design: {}'.format(
+        cobyla['DOC'], cobyla['feasible'], cobyla['nfev'], np.round(cobyla['x'], 3)))
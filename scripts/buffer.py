@@ -15,7 +15,7 @@ out - output
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
 
 class buffer(Component):
     def __init__(self):
@@ -15,7 +15,8 @@ range           - range [m]
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
+from analysis_errors import analysis_errors
 
 class calculate_doc_per_km(Component):
     def __init__(self):
@@ -25,5 +26,6 @@ class calculate_doc_per_km(Component):
         
         self.add_output('costPerFlightPerKm', val=0.0)
     
+    @analysis_errors
     def solve_nonlinear(self, params, unknowns, resids):
         unknowns['costPerFlightPerKm'] = params['costPerFlight']/(params['range']/1000)
\ No newline at end of file
@@ -28,7 +28,8 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
+from analysis_errors import analysis_errors
 import math
 
 class calculate_eccentricity(Component):
@@ -48,6 +49,7 @@ class calculate_eccentricity(Component):
         
         self.add_output('eccentricity', val=1.0)
         
+    @analysis_errors
     def solve_nonlinear(self, params, unknowns, resids):
         cl = float(params['Cl'])
         cd = float(params['Cd'])
@@ -0,0 +1,194 @@
+'''
+# Name: compact_recorder.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Compact OpenMDAO case recorder: whitelisted variables, packed arrays, every k-th iteration
+
+# SqliteRecorder with record_params and record_metadata pickles a dict of every
+# parameter and unknown of TopLevelSystem (the 35 C_* cost items, the cruise /
+# hover intermediates, ...) for every driver iteration. CompactRecorder keeps
+# only the variables matching the includes patterns (fnmatch globs, by default
+# the design variables, the objective and the constraints), fixes their order
+# once, and stores each recorded iteration as one packed float32 or float64
+# array in a sqlite file. Only every k-th iteration is written, plus the final
+# one (written by close()). As SqliteRecorder, it starts a new file: an
+# existing `out` file is replaced. read_compact loads a file back into an array.
+
+# Tables:
+#   variables   - name, size (of the flattened value), in column order
+#   iterations  - counter (driver iteration), coord (iteration coordinate), data (packed array)
+
+# Inputs:
+#   out         - sqlite file
+#   includes    - fnmatch patterns of the recorded unknowns [default INCLUDES]
+#   dtype       - 'float64' or 'float32' [default 'float64']
+#   every       - record every k-th iteration (and the final one) [default 1]
+
+# Outputs:
+#   read_compact(out) - (names, counters, coords, values (iterations, columns) float64 array)
+'''
+
+from __future__ import print_function
+
+import os
+import sqlite3
+
+import numpy as np
+
+from openmdao.recorders.base_recorder import BaseRecorder
+from openmdao.util.record_util import format_iteration_coordinate
+
+# Design variables, objective and constraints of the optimizer scripts
+INCLUDES = ['indep*', 'scale*.scaled', 'OperatingCost.C_costPerFlight', 'con*.c*']
+
+# Rows per transaction
+COMMIT_EVERY = 100
+
+
+class CompactRecorder(BaseRecorder):
+    ''' Records the included unknowns of every k-th iteration (and the final one) as packed arrays '''
+
+    def __init__(self, out, includes=None, dtype='float64', every=1):
+        super(CompactRecorder, self).__init__()
+        self.options['record_metadata'] = False
+        self.options['record_derivs'] = False
+        self.options['includes'] = list(INCLUDES if includes is None else includes)
+        self.dtype = np.dtype(dtype)
+        self.every = max(1, int(every))
+        # A new file per run (SqliteRecorder opens with flag 'n'), so two runs don't mix their columns
+        if os.path.exists(out):
+            os.remove(out)
+        self.out = sqlite3.connect(out)
+        self.out.execute('CREATE TABLE IF NOT EXISTS variables (name TEXT, size INTEGER)')
+        self.out.execute('CREATE TABLE IF NOT EXISTS iterations (counter INTEGER, coord TEXT, data BLOB)')
+        self._names = None
+        self._counter = 0
+        self._pending = None
+        self._uncommitted = 0
+
+    def _columns(self, values):
+        ''' Fix the recorded (numeric) variables and their order on the first iteration '''
+        self._names = []
+        rows = []
+        for name in sorted(values):
+            try:
+                size = np.asarray(values[name], dtype=float).size
+            except (TypeError, ValueError):
+                continue  # e.g. the Vehicle string
+            self._names.append(name)
+            rows.append((name, size))
+        self.out.executemany('INSERT INTO variables VALUES (?, ?)', rows)
+
+    def _write(self, counter, coord, data):
+        self.out.execute('INSERT INTO iterations VALUES (?, ?, ?)', (counter, coord, sqlite3.Binary(data)))
+        self._uncommitted += 1
+        if self._uncommitted >= COMMIT_EVERY:
+            self.out.commit()
+            self._uncommitted = 0
+
+    def record_metadata(self, group):
+        pass
+
+    def record_derivatives(self, derivs, metadata):
+        pass
+
+    def record_iteration(self, params, unknowns, resids, metadata):
+        self._counter += 1
+        coordinate = metadata['coord']
+        values = self._filter_vector(unknowns, 'u', coordinate)
+        if self._names is None:
+            self._columns(values)
+        data = np.concatenate([np.ravel(np.asarray(values[name], dtype=float)) for name in self._names]) \
+            if self._names else np.empty(0)
+        data = data.astype(self.dtype).tobytes()
+        coord = format_iteration_coordinate(coordinate)
+        if self._counter % self.every == 0:
+            self._write(self._counter, coord, data)
+            self._pending = None
+        else:
+            self._pending = (self._counter, coord, data)
+
+    def close(self):
+        if self.out is None:
+            return
+        # The final iteration is always recorded
+        if self._pending is not None:
+            self._write(*self._pending)
+            self._pending = None
+        self.out.execute('CREATE TABLE IF NOT EXISTS dtype (name TEXT)')
+        self.out.execute('DELETE FROM dtype')
+        self.out.execute('INSERT INTO dtype VALUES (?)', (self.dtype.name,))
+        self.out.commit()
+        self.out.close()
+        self.out = None
+
+
+def read_compact(path):
+    ''' (names, counters, coords, values) of a CompactRecorder file, values as a float64 array '''
+    db = sqlite3.connect(path)
+    try:
+        dtype = np.dtype(db.execute('SELECT name FROM dtype').fetchone()[0])
+        variables = db.execute('SELECT name, size FROM variables ORDER BY rowid').fetchall()
+        rows = db.execute('SELECT counter, coord, data FROM iterations ORDER BY counter').fetchall()
+    finally:
+        db.close()
+    names = []
+    for name, size in variables:
+        names += [name] if size == 1 else ['{}[{}]'.format(name, i) for i in np.arange(size)]
+    values = np.array([np.frombuffer(bytes(data), dtype=dtype) for counter, coord, data in rows], dtype=float)
+    return names, [r[0] for r in rows], [r[1] for r in rows], values.reshape(len(rows), len(names))
+
+
+if __name__ == "__main__":
+    # Benchmark: single range optimization of test/vahana_optimizer.py with no recorder, the SqliteRecorder
+    # of the optimizer scripts and CompactRecorder variants
+    import sys
+    import tempfile
+    import time
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test'))
+    from openmdao.api import Problem, ScipyOptimizer, SqliteRecorder
+    from vahana_optimizer import TopLevelSystem
+
+    def sqlite_recorder(path):
+        recorder = SqliteRecorder(path)
+        recorder.options['record_params'] = True
+        recorder.options['record_metadata'] = True
+        return recorder
+
+    variants = [('none', None),
+                ('SqliteRecorder (params, metadata)', sqlite_recorder),
+                ('CompactRecorder float64', lambda path: CompactRecorder(path)),
+                ('CompactRecorder float32, every 10', lambda path: CompactRecorder(path, dtype='float32', every=10))]
+    directory = tempfile.mkdtemp()
+    for name, make in variants:
+        sub = Problem(root=TopLevelSystem())
+        sub.driver = ScipyOptimizer()
+        sub.driver.options['optimizer'] = 'COBYLA'
+        sub.driver.options['maxiter'] = 1000
+        sub.driver.options['tol'] = 0.01
+        sub.driver.options['disp'] = False
+        for var, lower, upper in (('indep2.rProp', 30.0, 200.0), ('indep3.cruiseSpeed', 45.5, 80.0),
+                                  ('indep4.batteryMass', 1.0, 99.90), ('indep5.motorMass', 0.10, 99.90),
+                                  ('indep6.mtom', 1.0, 99.990)):
+            sub.driver.add_desvar(var, lower=lower, upper=upper)
+            sub.driver.add_constraint(var, lower=lower, upper=upper)
+        sub.driver.add_objective('OperatingCost.C_costPerFlight')
+        for con in ('con1.c1', 'con2.c2', 'con3.c3'):
+            sub.driver.add_constraint(con, lower=0.0)
+        path = os.path.join(directory, name.split()[0] + str(len(name)))
+        if make is not None:
+            sub.driver.add_recorder(make(path))
+        sub.setup(check=False)
+        sub['indep1.range'] = 50000.0
+        start = time.time()
+        sub.run()
+        sub.cleanup()
+        seconds = time.time() - start
+        size = os.path.getsize(path) / 1024.0 if make is not None else 0.0
+        print('{:<36} {:>8.2f} s {:>10.1f} kB   DOC ($): {:.4f}'.format(name, seconds, size,
+                                                                       sub['OperatingCost.C_costPerFlight']))
+    names, counters, coords, values = read_compact(path)
+    print('{} recorded iterations (of {}), {} columns: {}'.format(len(counters), counters[-1], len(names),
+                                                                  ', '.join(names)))
@@ -52,7 +52,8 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
+from analysis_errors import AnalysisError, analysis_errors
 import math
 
 class config_weight(Component):
@@ -95,6 +96,7 @@ class config_weight(Component):
         self.add_output('mass_transmission', val=0.0)
         self.add_output('mass_W', val=0.0)
 
+    @analysis_errors
     def solve_nonlinear(self, params, unknowns, resids):
         # Total payload mass
         unknowns['mass_payload'] = params['payload']
@@ -196,8 +198,7 @@ class config_weight(Component):
                 params['mBattery'] + params['mMotors'] + unknowns['mass_wire'] + unknowns['mass_brs'])
 
         else:
-            print('Unrecognized vehicle!')
-            pass
+            raise AnalysisError('Unrecognized vehicle: {}'.format(params['Vehicle']))
             
         unknowns['mass_W'] = unknowns['mass_m'] * 9.8
     
\ No newline at end of file
@@ -23,7 +23,8 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
+from analysis_errors import analysis_errors
 import math
 
 class constraint1(Component):
@@ -34,6 +35,7 @@ class constraint1(Component):
         
         self.add_output('c1', val=0.0)
     
+    @analysis_errors
     def solve_nonlinear(self, params, unknowns, resids):
         # Assumed values
         batteryEnergyDensity = 230.0  # Expected pack energy density in 3-5 years [Wh/kg]
@@ -23,7 +23,8 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
+from analysis_errors import analysis_errors
 import math
 
 class constraint2(Component):
@@ -34,6 +35,7 @@ class constraint2(Component):
         
         self.add_output('c2', val=0.0)
     
+    @analysis_errors
     def solve_nonlinear(self, params, unknowns, resids):
         # Assumed values
         motorPowerDensity = 5.0  # kW/kg, including controller and other accessories in 3-5 years
@@ -20,7 +20,8 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
+from analysis_errors import analysis_errors
 import math
 
 class constraint4(Component):
@@ -33,6 +34,7 @@ class constraint4(Component):
         
         self.add_output('c4', val=0.0)
     
+    @analysis_errors
     def solve_nonlinear(self, params, unknowns, resids):
         
         # Constraint on autorotation
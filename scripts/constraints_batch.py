@@ -0,0 +1,124 @@
+'''
+# Name: constraints_batch.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Vectorized version of constraints_checker.py / constraints_checker_optimizer.py
+# and constraint1.py .. constraint4.py
+
+# Evaluates the Vahana Trade Study constraints for arrays of design points of
+# either vehicle and returns a margin matrix (positive = satisfied) plus a
+# boolean feasibility mask, e.g. for filtering PET results or design grids.
+
+# Constraints (columns of the margin matrix):
+#   c1  - energy:       mBattery*batteryEnergyDensity*0.95/1000 - EReserve [kW-hr]
+#   c2  - motor power:  mMotors*motorPowerDensity - hoverPower_PMax/1000 [kW]
+#   c3  - MTOW:         mtow*9.8 - mass_W [N]
+#   c4  - autorotation: 1/6*mass_rotor*Vtip^2 - 1/2*mass_m*VAutoRotation^2 [J]
+#                       (helicopter only, +inf for the tiltwing)
+#   c5  - rProp bounds: distance of rProp to the nearest bound [m]
+#   c6  - cruise speed bounds: distance of cruiseSpeed to the nearest bound [m/s]
+
+# Inputs (scalars or arrays that broadcast to a common length N):
+#   Vehicle                     - vehicle type ('tiltwing' or 'helicopter'), string or array of strings
+#   mBattery                    - battery mass [kg]
+#   mMotors                     - mass of motors [kg]
+#   mtow                        - maximum take-off mass [kg]
+#   EReserve                    - energy required to complete reserve mission [kW-hr]
+#   hoverPower_PMax             - maximum hover shaft power [W]
+#   hoverPower_VAutoRotation    - auto-rotation descent rate [m/s]
+#   hoverPower_Vtip             - rotor tip speed [m/s]
+#   mass_W                      - total weight [N]
+#   mass_m                      - total mass [kg]
+#   mass_rotor                  - rotor mass [kg]
+#   rProp                       - rProp [m]
+#   cruiseSpeed                 - cruise speed [m/s]
+#   batteryEnergyDensity        - optional, [W-hr / kg] (default 230)
+#   motorPowerDensity           - optional, [kW / kg] (default 5)
+
+# Outputs:
+#   margins     - (N, 6) array of constraint margins, > 0 when satisfied
+#   feasible    - (N,) boolean array, True when all constraints are satisfied
+'''
+
+from __future__ import print_function
+
+import numpy as np
+
+from vehicle import vehicle_masks
+
+CONSTRAINTS = ('c1', 'c2', 'c3', 'c4', 'c5', 'c6')
+
+batteryEnergyDensity = 230.0  # Expected pack energy density in 3-5 years [Wh/kg]
+motorPowerDensity = 5.0  # kW/kg, including controller and other accessories in 3-5 years
+dischargeDepthReserve = 0.95  # Can only use 95% of battery energy in reserve mission
+
+# Design variable bounds (lower, upper) per vehicle
+RPROP_BOUNDS = {'tiltwing': (0.3, 2.0), 'helicopter': (1.0, 10.0)}
+CRUISE_SPEED_BOUNDS = {'tiltwing': (1.3 * 35, 80.0), 'helicopter': (30.0, 80.0)}
+
+
+def _bound_margin(x, isTiltwing, bounds):
+    lower = np.where(isTiltwing, bounds['tiltwing'][0], bounds['helicopter'][0])
+    upper = np.where(isTiltwing, bounds['tiltwing'][1], bounds['helicopter'][1])
+    return np.minimum(x - lower, upper - x)
+
+
+def constraint_margins(Vehicle, mBattery, mMotors, mtow, EReserve, hoverPower_PMax, hoverPower_VAutoRotation,
+                       hoverPower_Vtip, mass_W, mass_m, mass_rotor, rProp, cruiseSpeed,
+                       batteryEnergyDensity=batteryEnergyDensity, motorPowerDensity=motorPowerDensity):
+    ''' Return the (N, 6) constraint margin matrix, positive when a constraint is satisfied. '''
+    (mBattery, mMotors, mtow, EReserve, hoverPower_PMax, hoverPower_VAutoRotation, hoverPower_Vtip,
+     mass_W, mass_m, mass_rotor, rProp, cruiseSpeed, batteryEnergyDensity, motorPowerDensity) = \
+        [np.ravel(a) for a in np.broadcast_arrays(*[np.asarray(a, dtype=float) for a in
+         (mBattery, mMotors, mtow, EReserve, hoverPower_PMax, hoverPower_VAutoRotation, hoverPower_Vtip,
+          mass_W, mass_m, mass_rotor, rProp, cruiseSpeed, batteryEnergyDensity, motorPowerDensity)])]
+    isTiltwing, isHelicopter = vehicle_masks(Vehicle, mBattery.size)
+
+    margins = np.empty((mBattery.size, len(CONSTRAINTS)))
+
+    # Constraint on available energy (E is in kW-hr)
+    margins[:, 0] = (mBattery * batteryEnergyDensity * dischargeDepthReserve / 1000.0) - EReserve
+
+    # Constraint on available motor power (kW)
+    margins[:, 1] = (mMotors * motorPowerDensity) - (hoverPower_PMax / 1000.0)
+
+    # Constraint on max take-off weight
+    margins[:, 2] = (mtow * 9.8) - mass_W
+
+    # Auto-rotation energy constraint => kinetic energy in blades has to be
+    # twice that of vehicle in autorotation descent to be able to arrest
+    # the descent.
+    # See "Helicopter Theory" section 7-5, assume rotor CLmax is twice
+    # hover CL. Rotor inertia is approximated as a solid rod.
+    margins[:, 3] = np.where(isHelicopter,
+                             (0.5 * 1.0 / 3.0 * mass_rotor * hoverPower_Vtip**2.0) -
+                             (0.5 * mass_m * hoverPower_VAutoRotation**2.0),
+                             np.inf)
+
+    # Rotor radius and cruise speed bounds
+    margins[:, 4] = _bound_margin(rProp, isTiltwing, RPROP_BOUNDS)
+    margins[:, 5] = _bound_margin(cruiseSpeed, isTiltwing, CRUISE_SPEED_BOUNDS)
+
+    return margins
+
+
+def feasible(margins):
+    ''' Boolean feasibility mask: True where every constraint margin is positive. '''
+    return np.all(margins > 0.0, axis=1)
+
+
+def check_constraints(*args, **kwargs):
+    ''' Return (margins, feasible) for the constraint_margins arguments. '''
+    margins = constraint_margins(*args, **kwargs)
+    return margins, feasible(margins)
+
+
+if __name__ == "__main__":
+    # Sample Inputs: the same tiltwing design with three battery masses
+    margins, mask = check_constraints(u'tiltwing', [100.0, 300.0, 500.0], 55.0, 800.0, 60.0, 250000.0, 0.0, 0.0,
+                                      7500.0, 765.0, 0.0, 1.0, 50.0)
+    print("margins:")
+    print(margins)
+    print("feasible:", mask)
@@ -4,7 +4,7 @@
 # Author(s): Joseph Coombe
 # Email: jcoombe@metamorphsoftware.com
 # Create Date: 6/8/2017
-# Edit Date: 6/8/2017
+# Edit Date: 10/19/2026
 
 # Conversion of Airbus A^3's vahanaTradeStudy>reserveMission.mat code
 # (located here: https://github.com/VahanaOpenSource/vahanaTradeStudy )
@@ -36,9 +36,11 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
 import math
 
+from constraints_batch import CONSTRAINTS, constraint_margins
+
 class constraints_checker(Component):
     def __init__(self):
         super(constraints_checker, self).__init__()
@@ -66,50 +68,18 @@ class constraints_checker(Component):
         self.add_output('c6', val=0.0)
     
     def solve_nonlinear(self, params, unknowns, resids):
-        # Assumed values
-        batteryEnergyDensity = 230  # Expected pack energy density in 3-5 years [Wh/kg]
-        motorPowerDensity = 5  # kW/kg, including controller and other accessories in 3-5 years
-        dischargeDepthReserve = 0.95  # Can only use 95% of battery energy in reserve mission
-        
-        # Constraint on available energy (E is in kW-hr)
-        unknowns['c1'] = (0 > (params['EReserve'] - (params['mBattery'] * batteryEnergyDensity * dischargeDepthReserve / 1000.0)))
-        
-        # Constraint on available motor power (kW)
-        unknowns['c2'] = (0 > (params['hoverPower_PMax'] / 1000.0 - params['mMotors'] * motorPowerDensity))
-        
-        # Constraint on max take-off weight
-        unknowns['c3'] = (0 > (params['mass_W'] - params['mtow'] * 9.8))
-        
-        unknowns['c4'] = False
-        if (params["Vehicle"].lower().replace('-', '') == "helicopter"):  # helicopter
-            # Auto-rotation energy constraint => kinetic energy in blades has to be
-            # twice that of vehicle in autorotation descent to be able to arrest
-            # the descent.
-            # See "Helicopter Theory" section 7-5, assume rotor CLmax is twice
-            # hover CL. Rotor inertia is approximated as a solid rod. 
-            unknowns['c4'] = (0 > (0.5 * params['mass_m'] * params['hoverPower_VAutoRotation']**2.0 - 0.5 * 1.0 / 3.0 * params['mass_rotor'] * params['hoverPower_Vtip']**2.0))
-        else:  # tilt-wing
-            unknowns['c4'] = True
-        
-        unknowns['c5'] = False
-        if (params["Vehicle"].lower().replace('-', '') == "helicopter"):  # helicopter
-            if ((params['rProp'] > 1.0) and (params['rProp'] < 10.0)):
-                unknowns['c5'] = True
-        else:  #tilt-wing
-             if ((params['rProp'] > 0.3) and (params['rProp'] < 2.0)):
-                unknowns['c5'] = True           
-        
-        unknowns['c6'] = False
-        if (params["Vehicle"].lower().replace('-', '') == "helicopter"):  # helicopter
-            if ((params['cruiseSpeed'] > 30.0) and (params['cruiseSpeed'] < 80.0)):
-                unknowns['c6'] = True
-        else:  #tilt-wing
-             if ((params['cruiseSpeed'] > (1.3 * 35)) and (params['cruiseSpeed'] < 80.0)):
-                unknowns['c6'] = True           
+        margins = constraint_margins(params['Vehicle'], params['mBattery'], params['mMotors'], params['mtow'],
+                                     params['EReserve'], params['hoverPower_PMax'], params['hoverPower_VAutoRotation'],
+                                     params['hoverPower_Vtip'], params['mass_W'], params['mass_m'], params['mass_rotor'],
+                                     params['rProp'], params['cruiseSpeed'])
         
-        test = unknowns['c1'] and unknowns['c2'] and unknowns['c3'] and unknowns['c4'] and unknowns['c5'] and unknowns['c6']
+        # c1 - energy, c2 - motor power, c3 - max take-off weight, c4 - auto-rotation
+        # (helicopter only), c5 - rProp bounds, c6 - cruise speed bounds
+        satisfied = margins[0] > 0.0
+        for name, ok in zip(CONSTRAINTS, satisfied):
+            unknowns[name] = bool(ok)
         
-        if test:
+        if satisfied.all():
             unknowns['allPass'] = "pass"
         else:
-            unknowns['allPass'] = "fail"
\ No newline at end of file
+            unknowns['allPass'] = "fail"
@@ -4,7 +4,7 @@
 # Author(s): Joseph Coombe
 # Email: jcoombe@metamorphsoftware.com
 # Create Date: 6/8/2017
-# Edit Date: 6/8/2017
+# Edit Date: 10/19/2026
 
 # Conversion of Airbus A^3's vahanaTradeStudy>reserveMission.mat code
 # (located here: https://github.com/VahanaOpenSource/vahanaTradeStudy )
@@ -36,9 +36,11 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
 import math
 
+from constraints_batch import constraint_margins
+
 class constraints_checker(Component):
     def __init__(self):
         super(constraints_checker, self).__init__()
@@ -64,19 +66,20 @@ class constraints_checker(Component):
         self.add_output('c6', val=0.0)
     
     def solve_nonlinear(self, params, unknowns, resids):
-        # Assumed values
-        batteryEnergyDensity = 230  # Expected pack energy density in 3-5 years [Wh/kg]
-        motorPowerDensity = 5  # kW/kg, including controller and other accessories in 3-5 years
-        dischargeDepthReserve = 0.95  # Can only use 95% of battery energy in reserve mission
+        margins = constraint_margins(params['Vehicle'], params['mBattery'], params['mMotors'], params['mtow'],
+                                     params['EReserve'], params['hoverPower_PMax'], params['hoverPower_VAutoRotation'],
+                                     params['hoverPower_Vtip'], params['mass_W'], params['mass_m'], params['mass_rotor'],
+                                     params['rProp'], params['cruiseSpeed'])
         
+        # Negative when satisfied
         # Constraint on available energy (E is in kW-hr)
-        unknowns['c1'] = params['EReserve'] - (params['mBattery'] * batteryEnergyDensity * dischargeDepthReserve / 1000.0)
+        unknowns['c1'] = -margins[0, 0]
         
         # Constraint on available motor power (kW)
-        unknowns['c2'] = (params['hoverPower_PMax'] / 1000.0) - (params['mMotors'] * motorPowerDensity)
+        unknowns['c2'] = -margins[0, 1]
         
         # Constraint on max take-off weight
-        unknowns['c3'] = params['mass_W'] - (params['mtow'] * 9.8)
+        unknowns['c3'] = -margins[0, 2]
         
         # if (params["Vehicle"].lower().replace('-', '') == "helicopter"):  # helicopter
             # # Auto-rotation energy constraint => kinetic energy in blades has to be
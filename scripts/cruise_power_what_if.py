@@ -18,7 +18,8 @@
 
 from __future__ import print_function
 
-from openmdao.api import IndepVarComp, Component, Problem, Group, FileRef
+from openmdao.core.component import Component
+from analysis_errors import AnalysisError, analysis_errors, check_positive
 import numpy as np
 import platform
 from subprocess import Popen, PIPE, STDOUT
@@ -62,7 +63,10 @@ class CruisePower(Component):
         self.add_output('sigma', val=0.0, description='Blade solidity')
         
         
+    @analysis_errors
     def solve_nonlinear(self, params, unknowns, resids):
+        check_positive(self, params, 'rProp', 'V', 'W')
+
         # Altitude, compute atmospheric properties
         rho = 1.225
         
@@ -136,6 +140,8 @@ class CruisePower(Component):
 
             # Compute rotation rate at cruise to be at tip mach limit
             unknowns['omega'] = (340.2940 * MTip - params['V']) / params['rProp']
+            if unknowns['omega'] <= 0.0:
+                raise AnalysisError('Cruise speed {} m/s at or above the tip speed limit'.format(params['V']))
 
             # Fuselage drag
             unknowns['D'] = 0.5 * rho * (params['V']**2) * unknowns['SCdFuse']
@@ -176,10 +182,12 @@ class CruisePower(Component):
             unknowns['PBattery'] = unknowns['PCruise'] / unknowns['etaMotor']
 
         else:
-            pass
+            raise AnalysisError('Unrecognized vehicle: {}'.format(params['Vehicle']))
 
 
 if __name__ == "__main__":
+    from openmdao.api import Problem, Group, IndepVarComp
+
     top = Problem()
     root = top.root = Group()
 
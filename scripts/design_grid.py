@@ -0,0 +1,289 @@
+'''
+# Name: design_grid.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Dense design-space grid / DOE evaluation with Pareto front extraction
+
+# Streams blocks of candidate designs (rProp, cruiseSpeed, mBattery, mMotors,
+# mtom) through the vectorized model (vahana_batch.py) for a list of ranges,
+# keeps the feasible points and maintains an incremental non-dominated set over
+# DOC (min), MTOM (min) and range (max), plus the minimum DOC design per range
+# (what the nested COBYLA optimizers look for). Memory is bounded by the block
+# size and the size of the front, so 10^8 candidates can be processed; blocks
+# can be spread over a process pool.
+
+# For a fixed design the flight time, the mission energies and therefore DOC and
+# the reserve energy constraint are affine in range, so the model is evaluated
+# at two ranges per design and the range levels are an outer product.
+# Feasibility uses the energy, motor power, MTOW and autorotation constraints
+# (c1 .. c4); the design variable bounds are the grid / DOE bounds themselves.
+
+# Candidates:
+#   levels  - full factorial grid: {design variable: 1-D array of levels}
+#   bounds  - DOE: {design variable: (lower, upper)} sampled with a Halton
+#             sequence (or uniform random numbers) of `samples` points
+
+# Inputs:
+#   Vehicle     - 'tiltwing' or 'helicopter'
+#   ranges      - 1-D array of ranges [m]
+#   block_size  - designs per block [default 20000]
+#   processes   - worker processes [default 1]
+#   assumptions - "What If" inputs of vahana_batch.py (scalars)
+
+# Outputs:
+#   front       - ParetoFront (rows: see COLUMNS)
+#   best        - minimum DOC feasible design per range, (len(ranges), len(COLUMNS)) array (nan if none)
+#   stats       - {'candidates', 'feasible', 'seconds', 'candidatesPerSecond'}
+'''
+
+from __future__ import print_function
+
+import csv
+import multiprocessing
+import time
+
+import numpy as np
+
+from vahana_batch import DESIGN_VARIABLES, physics_batch, range_batch, _split
+from filter_csv_stream import open_csv
+
+COLUMNS = ('range',) + DESIGN_VARIABLES + ('DOC',)
+
+CSV_HEADER = ['Range [km]', 'DOC [$]', 'DOC [$/km]', 'RotorRadius [m]', 'CruiseSpeed [m/s]', 'BatteryMass [kg]',
+              'MotorMass [kg]', 'MaxTakeOffMass [kg]']
+
+_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97)
+
+
+def nondominated(F):
+    ''' Indices of the non-dominated rows of F (every column minimized). Exact duplicates are all kept. '''
+    idx = np.lexsort(F.T[::-1])  # Sorted, a row can only be dominated by rows before it
+    F = F[idx]
+    i = 0
+    while i < len(F):
+        dominated = np.all(F[i] <= F, axis=1) & np.any(F[i] < F, axis=1)
+        F = F[~dominated]
+        idx = idx[~dominated]
+        i += 1
+    return idx
+
+
+def _dominated_by(F, G, chunk=1000000):
+    ''' Boolean mask of the rows of F dominated by at least one row of G '''
+    mask = np.zeros(len(F), dtype=bool)
+    if len(G) == 0:
+        return mask
+    step = max(1, chunk // len(G))
+    for i in range(0, len(F), step):
+        f = F[i:i + step, None, :]
+        mask[i:i + step] = np.any(np.all(G[None, :, :] <= f, axis=2) & np.any(G[None, :, :] < f, axis=2), axis=1)
+    return mask
+
+
+class ParetoFront(object):
+    ''' Incremental non-dominated set. objectives are minimized, rows carry the matching data. '''
+
+    def __init__(self, nObjectives, nColumns):
+        self.objectives = np.empty((0, nObjectives))
+        self.rows = np.empty((0, nColumns))
+
+    def __len__(self):
+        return len(self.objectives)
+
+    def update(self, objectives, rows):
+        ''' Add candidate points, keeping only the non-dominated ones. '''
+        if len(objectives) == 0:
+            return
+        keep = ~_dominated_by(objectives, self.objectives)
+        objectives, rows = objectives[keep], rows[keep]
+        keep = nondominated(objectives)
+        objectives, rows = objectives[keep], rows[keep]
+        if len(objectives) == 0:
+            return
+        old = ~_dominated_by(self.objectives, objectives)
+        self.objectives = np.concatenate((self.objectives[old], objectives))
+        self.rows = np.concatenate((self.rows[old], rows))
+
+    def merge(self, other):
+        self.update(other.objectives, other.rows)
+
+
+def halton(start, stop, dims):
+    ''' Points start .. stop-1 of the Halton sequence in [0, 1)^dims, (stop-start, dims) array '''
+    index = np.arange(start + 1, stop + 1, dtype=np.int64)  # skip the origin
+    points = np.zeros((len(index), dims))
+    for d in range(dims):
+        base = _PRIMES[d]
+        i = index.copy()
+        f = 1.0
+        while np.any(i > 0):
+            f = f / base
+            points[:, d] += f * (i % base)
+            i //= base
+    return points
+
+
+def latin_hypercube(n, dims, seed=0):
+    ''' n point Latin hypercube sample in [0, 1)^dims, one point per stratum and dimension, (n, dims) array '''
+    random = np.random.RandomState(seed)
+    strata = np.column_stack([random.permutation(n) for d in range(dims)])
+    return (strata + random.random_sample((n, dims))) / n
+
+
+def grid_designs(levels, start, stop):
+    ''' Designs start .. stop-1 of the full factorial grid, (stop-start, 5) array '''
+    levels = [np.asarray(levels[name], dtype=float) for name in DESIGN_VARIABLES]
+    index = np.unravel_index(np.arange(start, stop), [len(l) for l in levels])
+    return np.column_stack([l[i] for l, i in zip(levels, index)])
+
+
+def doe_designs(bounds, start, stop, sampler='halton', seed=0):
+    ''' Designs start .. stop-1 of a DOE over bounds, (stop-start, 5) array '''
+    if sampler == 'halton':
+        unit = halton(start, stop, len(DESIGN_VARIABLES))
+    elif sampler == 'random':
+        unit = np.random.RandomState([seed, start]).random_sample((stop - start, len(DESIGN_VARIABLES)))
+    else:
+        raise ValueError('Unknown sampler: {}'.format(sampler))
+    lower = np.array([bounds[name][0] for name in DESIGN_VARIABLES], dtype=float)
+    upper = np.array([bounds[name][1] for name in DESIGN_VARIABLES], dtype=float)
+    return lower + unit * (upper - lower)
+
+
+def evaluate_designs(Vehicle, designs, ranges, front, best, **assumptions):
+    ''' Evaluate a block of designs at every range, update front and best in place.
+        Returns the number of feasible (design, range) points. '''
+    physicsAssumptions, economics = _split(assumptions)
+    physics = physics_batch(Vehicle, *designs.T, **physicsAssumptions)
+
+    # DOC and c1 are affine in range for a fixed design
+    rMax = np.max(ranges)
+    at0 = range_batch(physics, 0.0, **economics)
+    at1 = range_batch(physics, rMax, **economics)
+    scale = ranges[None, :] / rMax
+    DOC = at0['DOC'][:, None] + (at1['DOC'] - at0['DOC'])[:, None] * scale
+    c1 = at0['margins'][:, 0][:, None] + (at1['margins'][:, 0] - at0['margins'][:, 0])[:, None] * scale
+    ok = (c1 > 0.0) & np.all(at0['margins'][:, 1:4] > 0.0, axis=1)[:, None]
+
+    # Minimum DOC design per range
+    masked = np.where(ok, DOC, np.inf)
+    i = np.argmin(masked, axis=0)
+    better = masked[i, np.arange(len(ranges))] < best[:, -1]
+    best[better, 0] = ranges[better]
+    best[better, 1:-1] = designs[i[better]]
+    best[better, -1] = masked[i[better], np.where(better)[0]]
+
+    design, level = np.nonzero(ok)
+    if len(design):
+        objectives = np.column_stack((DOC[design, level], designs[design, -1], -ranges[level]))
+
+        # Only the cheapest point of each (mtom, range) pair can be non-dominated
+        order = np.lexsort((objectives[:, 0], objectives[:, 2], objectives[:, 1]))
+        objectives, design, level = objectives[order], design[order], level[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = np.any(objectives[1:, 1:] != objectives[:-1, 1:], axis=1)
+        objectives, design, level = objectives[first], design[first], level[first]
+
+        rows = np.column_stack((ranges[level], designs[design], objectives[:, 0]))
+        front.update(objectives, rows)
+    return int(np.count_nonzero(ok))
+
+
+def _new_best(ranges):
+    best = np.full((len(ranges), len(COLUMNS)), np.nan)
+    best[:, -1] = np.inf
+    return best
+
+
+def _study_task(args):
+    Vehicle, ranges, levels, bounds, sampler, seed, start, stop, block_size, assumptions = args
+    front = ParetoFront(3, len(COLUMNS))
+    best = _new_best(ranges)
+    feasibleCount = 0
+    for i in range(start, stop, block_size):
+        j = min(i + block_size, stop)
+        designs = grid_designs(levels, i, j) if levels is not None else doe_designs(bounds, i, j, sampler, seed)
+        feasibleCount += evaluate_designs(Vehicle, designs, ranges, front, best, **assumptions)
+    return front, best, feasibleCount
+
+
+def design_study(Vehicle, ranges, levels=None, bounds=None, samples=None, sampler='halton', seed=0,
+                 block_size=20000, processes=1, progress=False, **assumptions):
+    ''' Evaluate a full factorial grid (levels) or a DOE (bounds, samples) at every range.
+        Returns (front, best, stats). '''
+    ranges = np.sort(np.atleast_1d(np.asarray(ranges, dtype=float)))
+    if levels is not None:
+        nDesigns = int(np.prod([len(levels[name]) for name in DESIGN_VARIABLES]))
+    elif bounds is not None and samples is not None:
+        nDesigns = int(samples)
+    else:
+        raise ValueError('Either levels or bounds and samples are required')
+
+    # Split the candidates into tasks of whole blocks, several per process for load balancing
+    nTasks = max(1, min(4 * processes, -(-nDesigns // block_size)))
+    taskSize = -(-nDesigns // nTasks // block_size) * block_size
+    tasks = [(Vehicle, ranges, levels, bounds, sampler, seed, start, min(start + taskSize, nDesigns), block_size,
+              assumptions) for start in range(0, nDesigns, taskSize)]
+
+    front = ParetoFront(3, len(COLUMNS))
+    best = _new_best(ranges)
+    feasibleCount = 0
+    start = time.time()
+
+    pool = multiprocessing.Pool(processes) if processes > 1 else None
+    try:
+        results = pool.imap_unordered(_study_task, tasks) if pool is not None else (_study_task(t) for t in tasks)
+        for done, (taskFront, taskBest, taskFeasible) in enumerate(results):
+            front.merge(taskFront)
+            better = taskBest[:, -1] < best[:, -1]
+            best[better] = taskBest[better]
+            feasibleCount += taskFeasible
+            if progress:
+                print('{} of {} tasks, front size {}, {:.1f} s'.format(done + 1, len(tasks), len(front),
+                                                                        time.time() - start))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    best[np.isinf(best[:, -1])] = np.nan
+    seconds = time.time() - start
+    candidates = nDesigns * len(ranges)
+    stats = {'candidates': candidates, 'feasible': feasibleCount, 'seconds': seconds,
+             'candidatesPerSecond': candidates / max(seconds, 1e-9)}
+    return front, best, stats
+
+
+def csv_row(r, design, DOC):
+    ''' results.csv row (see CSV_HEADER) of a design (rProp, cruiseSpeed, mBattery, mMotors, mtom) at range r [m] '''
+    return [r / 1000.0, DOC, DOC / r * 1000.0] + [float(v) for v in design]
+
+
+def write_csv(path, rows):
+    ''' Write design rows (see COLUMNS) in the results.csv format of the optimizers '''
+    rows = rows[np.lexsort((rows[:, -1], rows[:, 0]))]
+    with open_csv(path, 'w') as csvfile:
+        writer = csv.writer(csvfile, delimiter=',')
+        writer.writerow(CSV_HEADER)
+        for row in rows:
+            writer.writerow(csv_row(row[0], row[1:-1], row[-1]))
+
+
+if __name__ == "__main__":
+    # Sample Inputs: 10 levels per design variable (10^5 tiltwing designs) at 20 ranges
+    levels = {'rProp': np.linspace(0.3, 2.0, 10),
+              'cruiseSpeed': np.linspace(45.5, 80.0, 10),
+              'mBattery': np.linspace(10.0, 999.0, 10),
+              'mMotors': np.linspace(1.0, 999.0, 10),
+              'mtom': np.linspace(100.0, 9999.0, 10)}
+    ranges = np.linspace(10000.0, 200000.0, 20)
+
+    front, best, stats = design_study(u'tiltwing', ranges, levels=levels, processes=2)
+    print('{candidates} candidates, {feasible} feasible, {seconds:.1f} s ({candidatesPerSecond:.0f} /s)'.format(**stats))
+    print('Pareto front (DOC, MTOM, range): {} designs'.format(len(front)))
+    for row in best:
+        print('Range (km): {}, DOC ($): {}, rProp (m): {}, cruiseSpeed (m/s): {}, batteryMass (kg): {}, '
+              'motorMass (kg): {}, mtom (kg): {}'.format(row[0] / 1000.0, row[-1], *row[1:-1]))
+    write_csv('pareto_front.csv', front.rows)
@@ -0,0 +1,349 @@
+'''
+# Name: design_optimizer.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Single range point DOC optimization on the vectorized model (vahana_batch.py)
+
+# Same problem as the nested SubProblem of test/vahana_optimizer.py and
+# test/vahana_optimizer_helicopter.py: COBYLA (tol 0.01) on the scaled design
+# variables indep2 .. indep6, minimizing OperatingCost.C_costPerFlight subject
+# to the design variable bounds (as constraints, in the same order) and
+# con1 .. con3 (con4 for the helicopter), without the OpenMDAO overhead.
+# battery_fraction adds the maximum fuel weight constraint of fuel_constraint.py
+# (con5: mtow / 3 - mBattery). optimize_cases runs many optimizations,
+# optionally in a process pool.
+
+# The constraint list (constraint_names, constraint_values) and the active set
+# definition (active_set: near-active constraints with a positive multiplier)
+# are shared by post_optimal_sensitivity.py, optimum_continuation.py and
+# adaptive_range_study.py.
+
+# Inputs:
+#   Vehicle     - 'tiltwing' or 'helicopter'
+#   range       - mission range [m]
+#   x0          - optional start point in optimizer (scaled) units [default DESIGN_START]
+#   rhobeg      - initial COBYLA trust region, small for warm starts [default 1.0]
+#   battery_fraction - optional maximum battery mass fraction of MTOM (1/3 in fuel_constraint.py)
+#   monitor     - optional callable(xScaled, model result, nfev), called after every model evaluation
+#   max_evaluations - optional limit on the model evaluations of the case
+#   max_seconds - optional wall clock limit of the case [s] (checked between model evaluations)
+#   stall       - optional number of evaluations without improvement of the best iterate (least
+#                 constraint violation, then DOC by more than STALL_TOL) after which the case stops
+#   assumptions - "What If" inputs of vahana_batch.py (scalars)
+
+# Outputs:
+#   dict with
+#     x         - optimum design (rProp, cruiseSpeed, mBattery, mMotors, mtom) in model units
+#     xScaled   - optimum in optimizer units (indep2 .. indep6)
+#     DOC       - direct operating cost per flight at the optimum [$]
+#     margins   - constraint margins at the optimum (see constraints_batch.CONSTRAINTS)
+#     batteryFraction, batteryFractionMargin - battery_fraction, and battery_fraction * mtom - mBattery [kg]
+#                 (battery_fraction only)
+#     feasible  - True when c1 .. c4 (and the battery fraction) are satisfied (within FEASIBILITY_TOL)
+#     success, nfev, message - scipy result
+#     status    - 'converged', 'maxiter', 'maxcv' or 'failed' (COBYLA), or the limit that stopped the case:
+#                 'evaluations', 'seconds' or 'stall'. A stopped case returns its best iterate, without
+#                 evaluating it again (nfev stays within max_evaluations).
+
+# A limit stops COBYLA by raising OptimizationStopped out of its Fortran callback,
+# so scipy's f2py wrapper prints "capi_return is NULL" and "Call-back cb_calcfc_in_
+# _cobyla__user__routines failed." on stderr once per stopped case. The message
+# is harmless; the exception is caught here and the case returns its best iterate.
+'''
+
+from __future__ import print_function
+
+import multiprocessing
+import time
+
+import numpy as np
+
+from vehicle import TILTWING, HELICOPTER, vehicle_key
+from vahana_batch import DESIGN_VARIABLES, evaluate_batch
+from constraints_batch import CONSTRAINTS
+
+# indep2 .. indep6 scaling (scale2 .. scale6 ExecComps), start values and bounds of the optimizers
+DESIGN_SCALE = {TILTWING: np.array([0.01, 1.0, 10.0, 10.0, 100.0]),
+                HELICOPTER: np.array([0.1, 1.0, 10.0, 10.0, 100.0])}
+DESIGN_START = {TILTWING: np.array([100.0, 50.0, 11.70, 3.00, 6.500]),
+                HELICOPTER: np.array([30.0, 50.0, 11.70, 3.00, 6.500])}
+DESIGN_BOUNDS = {TILTWING: [(30.0, 200.0), (45.5, 80.0), (1.0, 99.90), (0.10, 99.90), (1.0, 99.990)],
+                 HELICOPTER: [(10.0, 100.0), (30.0, 80.0), (1.0, 99.90), (0.10, 99.90), (1.0, 99.990)]}
+MAXITER = {TILTWING: 1000, HELICOPTER: 3000}
+
+# Model constraints (columns of the margin matrix) per vehicle
+MODEL_CONSTRAINTS = {TILTWING: (0, 1, 2), HELICOPTER: (0, 1, 2, 3)}
+
+# COBYLA stops with constraint violations of the order of its final trust region, per margin column
+# (c1 [kW-hr], c2 [kW], c3 [N], c4 [J], c5 [m], c6 [m/s], see constraints_batch.CONSTRAINTS)
+FEASIBILITY_TOL = np.array([1e-3, 1e-3, 1e-2, 1.0, 1e-3, 1e-3])
+BATTERY_FRACTION_TOL = 1e-3  # [kg]
+
+# Distance (in optimizer units) below which a constraint is a candidate for the active set
+ACTIVE_DISTANCE = 1e-3
+
+# Relative central difference step of the constraint gradients
+GRADIENT_STEP = 1e-6
+
+# Relative DOC decrease counted as an improvement by the stall detection
+STALL_TOL = 1e-4
+
+# Objective, and minus the constraints, at points outside of the model (as analysis_errors.PENALTY)
+PENALTY = 1.0e6
+
+# scipy COBYLA status -> status of the result
+COBYLA_STATUS = {1: 'converged', 2: 'maxiter', 4: 'maxcv'}
+
+
+class OptimizationStopped(Exception):
+    ''' Raised out of the optimizer when a case hits one of its limits '''
+
+    def __init__(self, reason):
+        super(OptimizationStopped, self).__init__('Stopped: {} limit'.format(reason))
+        self.reason = reason
+
+
+def constraint_violation(margins, columns):
+    ''' Sum of the model constraint violations beyond FEASIBILITY_TOL, in units of FEASIBILITY_TOL '''
+    columns = list(columns)
+    return float(np.sum(np.maximum(-margins[columns] - FEASIBILITY_TOL[columns], 0.0) /
+                        np.maximum(FEASIBILITY_TOL[columns], 1e-12)))
+
+
+def constraint_names(Vehicle, battery_fraction=None):
+    ''' Names of the COBYLA constraints, in DesignProblem.constraints() order '''
+    names = []
+    for name in DESIGN_VARIABLES:
+        names += [name + ' >= lower', name + ' <= upper']
+    names += [CONSTRAINTS[column] for column in MODEL_CONSTRAINTS[vehicle_key(Vehicle)]]
+    if battery_fraction is not None:
+        names.append('batteryFraction')
+    return names
+
+
+def constraint_values(Vehicle, X, margins, battery_fraction=None):
+    ''' COBYLA constraints (M, n) of M points X in optimizer units with model margins (M, 6), >= 0 is feasible '''
+    X = np.atleast_2d(X)
+    vehicle = vehicle_key(Vehicle)
+    bounds = np.array(DESIGN_BOUNDS[vehicle])
+    G = np.empty((len(X), 2 * X.shape[1]))
+    G[:, 0::2] = X - bounds[:, 0]
+    G[:, 1::2] = bounds[:, 1] - X
+    G = np.hstack((G, np.atleast_2d(margins)[:, list(MODEL_CONSTRAINTS[vehicle])]))
+    if battery_fraction is not None:
+        x = to_design(Vehicle, X)
+        G = np.hstack((G, (battery_fraction * x[:, 4] - x[:, 2])[:, None]))
+    return G
+
+
+def evaluate_scaled(Vehicle, range, X, battery_fraction=None, **assumptions):
+    ''' DOC (M,) and COBYLA constraints (M, n) for M points X in optimizer units, as one model batch '''
+    X = np.atleast_2d(X)
+    result = evaluate_batch(Vehicle, range, *to_design(Vehicle, X).T, **assumptions)
+    return result['DOC'], constraint_values(Vehicle, X, result['margins'], battery_fraction)
+
+
+def gradients(Vehicle, range, x, battery_fraction=None, **assumptions):
+    ''' Central difference gradients of DOC (n,) and the COBYLA constraints (m, n) at x '''
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    h = GRADIENT_STEP * np.maximum(1.0, np.abs(x))
+    X = np.vstack((x + np.diag(h), x - np.diag(h)))
+    f, G = evaluate_scaled(Vehicle, range, X, battery_fraction, **assumptions)
+    return (f[:n] - f[n:]) / (2.0 * h), ((G[:n] - G[n:]) / (2.0 * h)[:, None]).T
+
+
+def active_set(gradDOC, J, g):
+    ''' Active constraints (indices), multipliers and relative KKT residual at an optimum: the constraints
+        within ACTIVE_DISTANCE of their bound (first order distance g / |grad g|) whose multiplier of
+        grad DOC = J^T lambda (non-negative least squares) is positive. Empty where the model fails. '''
+    if not (np.all(np.isfinite(J)) and np.all(np.isfinite(gradDOC)) and np.all(np.isfinite(g))):
+        # The model breaks down far outside the feasible region (e.g. no hover solution)
+        return np.array([], dtype=int), np.full(len(g), np.nan), np.nan
+    from scipy.optimize import nnls
+    norms = np.sqrt(np.sum(J ** 2, axis=1))
+    candidates = np.flatnonzero(g <= ACTIVE_DISTANCE * np.maximum(norms, 1e-12))
+    lam = np.zeros(len(g))
+    if len(candidates):
+        lam[candidates] = nnls(J[candidates].T, gradDOC)[0]
+    residual = np.linalg.norm(gradDOC - J.T.dot(lam)) / max(np.linalg.norm(gradDOC), 1e-300)
+    return np.flatnonzero(lam > 0.0), lam, residual
+
+
+def to_design(Vehicle, xScaled):
+    ''' Optimizer units -> (rProp, cruiseSpeed, mBattery, mMotors, mtom) '''
+    return np.asarray(xScaled, dtype=float) * DESIGN_SCALE[vehicle_key(Vehicle)]
+
+
+def to_scaled(Vehicle, x):
+    ''' (rProp, cruiseSpeed, mBattery, mMotors, mtom) -> optimizer units '''
+    return np.asarray(x, dtype=float) / DESIGN_SCALE[vehicle_key(Vehicle)]
+
+
+class DesignProblem(object):
+    ''' Objective and constraints of one range point, with the model evaluated once per x. '''
+
+    def __init__(self, Vehicle, range, battery_fraction=None, **assumptions):
+        self.Vehicle = Vehicle
+        self.vehicle = vehicle_key(Vehicle)
+        self.range = range
+        self.battery_fraction = battery_fraction
+        self.assumptions = assumptions
+        self.nfev = 0
+        self.monitor = None
+        # Limits (see optimize_design) and the best iterate:
+        # (violation, DOC, xScaled, nfev of the last improvement, model result)
+        self.max_evaluations = None
+        self.deadline = None
+        self.stall = None
+        self.stopped = None
+        self.best = None
+        self._x = None
+        self._result = None
+
+    def evaluate(self, xScaled, limits=True):
+        xScaled = np.array(xScaled, dtype=float)
+        if self.best is not None and np.array_equal(xScaled, self.best[2]):
+            return self.best[4]
+        if self._x is None or not np.array_equal(xScaled, self._x):
+            self._result = evaluate_batch(self.Vehicle, self.range, *to_design(self.Vehicle, xScaled),
+                                          **self.assumptions)
+            self._x = xScaled
+            self.nfev += 1
+            self._update_best(xScaled, self._result)
+            if self.monitor is not None:
+                self.monitor(xScaled, self._result, self.nfev)
+            if limits and self.stopped is None:
+                self._check_limits()
+        return self._result
+
+    def _update_best(self, xScaled, result):
+        violation = constraint_violation(result['margins'][0], MODEL_CONSTRAINTS[self.vehicle])
+        if self.battery_fraction is not None:
+            violation += max(-self.battery_fraction_margin(xScaled) - BATTERY_FRACTION_TOL, 0.0) / BATTERY_FRACTION_TOL
+        DOC = float(result['DOC'][0])
+        if not (np.isfinite(DOC) and np.isfinite(violation)):
+            return
+        if self.best is None or (violation, DOC) < self.best[:2]:
+            improved = self.best is None or violation < self.best[0] or \
+                DOC < self.best[1] - STALL_TOL * abs(self.best[1])
+            self.best = (violation, DOC, xScaled, self.nfev if improved else self.best[3], result)
+
+    def _check_limits(self):
+        if self.max_evaluations is not None and self.nfev >= self.max_evaluations:
+            self.stopped = 'evaluations'
+        elif self.deadline is not None and time.time() >= self.deadline:
+            self.stopped = 'seconds'
+        elif self.stall is not None and self.nfev - (self.best[3] if self.best is not None else 0) >= self.stall:
+            self.stopped = 'stall'
+        if self.stopped is not None:
+            raise OptimizationStopped(self.stopped)
+
+    def objective(self, xScaled):
+        # Points outside of the model (NaN / inf) are infeasible with a large penalty
+        DOC = float(self.evaluate(xScaled)['DOC'][0])
+        return DOC if np.isfinite(DOC) else PENALTY
+
+    def constraint(self, xScaled, column):
+        margin = float(self.evaluate(xScaled)['margins'][0, column])
+        return margin if np.isfinite(margin) else -PENALTY
+
+    def battery_fraction_margin(self, xScaled):
+        rProp, cruiseSpeed, mBattery, mMotors, mtom = to_design(self.Vehicle, xScaled)
+        return self.battery_fraction * mtom - mBattery
+
+    def constraints(self):
+        ''' COBYLA constraint list in the order OpenMDAO's ScipyOptimizer builds it '''
+        cons = []
+        for i, (lower, upper) in enumerate(DESIGN_BOUNDS[self.vehicle]):
+            cons.append({'type': 'ineq', 'fun': lambda x, i=i, lower=lower: x[i] - lower})
+            cons.append({'type': 'ineq', 'fun': lambda x, i=i, upper=upper: upper - x[i]})
+        for column in MODEL_CONSTRAINTS[self.vehicle]:
+            cons.append({'type': 'ineq', 'fun': self.constraint, 'args': (column,)})
+        if self.battery_fraction is not None:
+            cons.append({'type': 'ineq', 'fun': self.battery_fraction_margin})
+        return cons
+
+    def constraint_names(self):
+        ''' Names of the constraints() entries '''
+        return constraint_names(self.Vehicle, self.battery_fraction)
+
+    def active_constraints(self, xScaled):
+        ''' Names of the active constraints (see active_set) at xScaled '''
+        gradDOC, J = gradients(self.Vehicle, self.range, xScaled, self.battery_fraction, **self.assumptions)
+        g = evaluate_scaled(self.Vehicle, self.range, xScaled, self.battery_fraction, **self.assumptions)[1][0]
+        names = self.constraint_names()
+        return tuple(names[i] for i in active_set(gradDOC, J, g)[0])
+
+
+def optimize_design(Vehicle, range, x0=None, tol=0.01, maxiter=None, rhobeg=1.0, battery_fraction=None,
+                    monitor=None, max_evaluations=None, max_seconds=None, stall=None, **assumptions):
+    ''' Minimize DOC at one range, see the header for the returned dict. '''
+    from scipy.optimize import minimize  # not at load: the batch tools import this module for its tables
+    problem = DesignProblem(Vehicle, range, battery_fraction, **assumptions)
+    problem.monitor = monitor
+    problem.max_evaluations = max_evaluations
+    problem.deadline = None if max_seconds is None else time.time() + max_seconds
+    problem.stall = stall
+    x0 = DESIGN_START[problem.vehicle] if x0 is None else np.asarray(x0, dtype=float)
+    maxiter = MAXITER[problem.vehicle] if maxiter is None else maxiter
+
+    try:
+        result = minimize(problem.objective, x0, method='COBYLA', constraints=problem.constraints(), tol=tol,
+                          options={'maxiter': maxiter, 'rhobeg': rhobeg, 'disp': False})
+        x = result.x
+        success, message = bool(result.success), str(result.message)
+        status = COBYLA_STATUS.get(result.status, 'failed')
+    except OptimizationStopped as stopped:
+        # Best iterate so far (least violation, then lowest DOC)
+        x = problem.best[2] if problem.best is not None else problem._x
+        success, message, status = False, str(stopped), stopped.reason
+
+    # The stored result of x when it was the last or the best evaluation, so a stopped case stays within its budget
+    model = problem.evaluate(x, limits=False)
+    margins = model['margins'][0]
+    columns = list(MODEL_CONSTRAINTS[problem.vehicle])
+    feasible = bool(np.all(margins[columns] > -FEASIBILITY_TOL[columns]))
+    out = {'Vehicle': Vehicle, 'range': range, 'assumptions': assumptions,
+           'x': to_design(Vehicle, x), 'xScaled': np.array(x),
+           'DOC': float(model['DOC'][0]), 'margins': margins, 'feasible': feasible,
+           'success': success, 'nfev': problem.nfev, 'message': message, 'status': status}
+    if battery_fraction is not None:
+        out['batteryFraction'] = battery_fraction
+        out['batteryFractionMargin'] = problem.battery_fraction_margin(x)
+        out['feasible'] = feasible and out['batteryFractionMargin'] > -BATTERY_FRACTION_TOL
+    return out
+
+
+def _optimize_case(case):
+    case = dict(case)
+    assumptions = case.pop('assumptions', None) or {}
+    case.update(assumptions)
+    return optimize_design(**case)
+
+
+def optimize_cases(cases, processes=1, pool=None):
+    ''' Run optimize_design for every case (dict of optimize_design keyword arguments,
+        "What If" inputs optionally under 'assumptions'), in order, on `processes` workers
+        or on an existing multiprocessing pool. '''
+    if pool is not None:
+        return pool.map(_optimize_case, cases, chunksize=1)
+    if processes > 1:
+        pool = multiprocessing.Pool(processes)
+        try:
+            return pool.map(_optimize_case, cases, chunksize=max(1, len(cases) // (4 * processes)))
+        finally:
+            pool.close()
+            pool.join()
+    return [_optimize_case(case) for case in cases]
+
+
+if __name__ == "__main__":
+    # Sample Inputs: the range sweep of vahana_optimizer.py
+    ranges = np.linspace(10000.0, 200000.0, 20)
+    results = optimize_cases([{'Vehicle': u'tiltwing', 'range': r} for r in ranges], processes=2)
+    for opt in results:
+        print('Range (km): {}, DOC ($): {}, rProp (m): {}, cruiseSpeed (m/s): {}, batteryMass (kg): {}, '
+              'motorMass (kg): {}, mtom (kg): {}'.format(opt['range'] / 1000.0, opt['DOC'], *opt['x']))
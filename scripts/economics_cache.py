@@ -0,0 +1,154 @@
+'''
+# Name: economics_cache.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Economics-only re-evaluation of a set-up OpenMDAO Problem (e.g. TopLevelSystem)
+
+# Changing only economic assumptions (electricity cost, battery $/kW-hr,
+# insurance rate, labor rate, flight hours per year, ...) does not change any
+# of the physics feeding the OperatingCost component. This evaluator finds
+# out from the model connections which independent variables only reach the
+# OperatingCost component ("economic" inputs) and caches the physics params of
+# OperatingCost (E, flightTime, mass_structural, mass_battery, mass_motors,
+# toolingCost, rProp, Vehicle) per design point. When only economic inputs
+# change, operating_cost_batch is re-evaluated from the cache without running
+# the model.
+
+# Inputs:
+#   problem     - a set-up Problem whose root contains an operating_cost (or
+#                 operating_cost_what_if) component
+#   cost_comp   - pathname of the operating cost component [default 'OperatingCost']
+
+# Outputs:
+#   evaluate()  - structured cost array (see operating_cost_batch.COST_ITEMS)
+'''
+
+from __future__ import print_function
+
+import numpy as np
+
+from openmdao.components.indep_var_comp import IndepVarComp
+
+from operating_cost_batch import ECONOMICS, operating_cost_batch
+
+# operating_cost params, in operating_cost_batch argument order
+COST_PHYSICS_PARAMS = ('Vehicle', 'rProp', 'flightTime', 'E', 'mass_structural', 'mass_battery',
+                       'mass_motors', 'toolingCost')
+
+
+def _hashable(value):
+    if isinstance(value, np.ndarray):
+        return tuple(float(v) for v in value.ravel())
+    if isinstance(value, (float, int, np.number)):
+        return float(value)
+    return value
+
+
+class EconomicsOnlyEvaluator(object):
+    ''' Re-evaluate the operating cost of a model, re-running the physics only when a
+        non-economic input changed since it was last evaluated at that design point. '''
+
+    def __init__(self, problem, cost_comp='OperatingCost'):
+        self.problem = problem
+        self.cost_comp = cost_comp
+        self.cache = {}
+        self.runs = 0  # Full model evaluations
+        self.hits = 0  # Evaluations served from the physics cache
+
+        root = problem.root
+        connections = root.connections  # {target param: (source unknown, idxs)}
+
+        # Component level data flow graph
+        downstream = {}
+        for tgt, (src, idxs) in connections.items():
+            downstream.setdefault(src.rsplit('.', 1)[0], set()).add(tgt.rsplit('.', 1)[0])
+
+        def reachable(comp):
+            seen = set()
+            stack = [comp]
+            while stack:
+                for nxt in downstream.get(stack.pop(), ()):
+                    if nxt not in seen:
+                        seen.add(nxt)
+                        stack.append(nxt)
+            return seen
+
+        costAndBelow = reachable(cost_comp) | set([cost_comp])
+
+        # Independent variables split into economic inputs (only reach the
+        # cost component and whatever is downstream of it) and physics inputs
+        self.economic_inputs = []
+        self.physics_inputs = []
+        for comp in root.components(recurse=True):
+            if not isinstance(comp, IndepVarComp):
+                continue
+            reach = reachable(comp.pathname)
+            names = ['{}.{}'.format(comp.pathname, name) for name in comp.unknowns.keys()]
+            if reach and reach <= costAndBelow and cost_comp in reach:
+                self.economic_inputs.extend(names)
+            else:
+                self.physics_inputs.extend(names)
+
+        # Cost component params fed by economic inputs are passed straight to
+        # operating_cost_batch (they share the what-if names)
+        economic = set(self.economic_inputs)
+        self.economic_params = {}
+        for tgt, (src, idxs) in connections.items():
+            comp, name = tgt.rsplit('.', 1)
+            if comp == cost_comp and src in economic and name in ECONOMICS:
+                self.economic_params[name] = src
+
+    def design_key(self):
+        return tuple(_hashable(self.problem[name]) for name in self.physics_inputs)
+
+    def physics(self, values=None):
+        ''' Set model inputs and return the cached OperatingCost physics params,
+            running the model only on a cache miss. '''
+        if values:
+            for name, value in values.items():
+                self.problem[name] = value
+
+        key = self.design_key()
+        if key in self.cache:
+            self.hits += 1
+        else:
+            self.problem.run_once()
+            self.runs += 1
+            self.cache[key] = dict((name, self.problem['{}.{}'.format(self.cost_comp, name)])
+                                   for name in COST_PHYSICS_PARAMS)
+        return self.cache[key]
+
+    def evaluate(self, values=None, **economics):
+        ''' Return the operating cost breakdown after setting `values` ({input: value}).
+            Economic assumptions given as keyword arguments (scalars or arrays) override
+            the ones in the model, so a whole economic sweep is one vectorized call. '''
+        physics = self.physics(values)
+        econ = dict((name, self.problem[src]) for name, src in self.economic_params.items())
+        econ.update(economics)
+        return operating_cost_batch(*[physics[name] for name in COST_PHYSICS_PARAMS], **econ)
+
+    def clear(self):
+        self.cache.clear()
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test'))
+    from openmdao.api import Problem
+    from vahana_optimizer import TopLevelSystem
+
+    top = Problem(root=TopLevelSystem())
+    top.setup(check=False)
+
+    evaluator = EconomicsOnlyEvaluator(top)
+
+    # Electricity cost sweep on a fixed design: one model run
+    costs = evaluator.evaluate(electricityCost=np.linspace(0.08, 0.20, 13))
+    print("DOC ($):", costs['C_costPerFlight'])
+
+    # Insurance rate what-if on the same design: served from the cache
+    costs = evaluator.evaluate(insuranceRate=0.08)
+    print("DOC ($):", costs['C_costPerFlight'], "model runs:", evaluator.runs, "cache hits:", evaluator.hits)
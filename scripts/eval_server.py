@@ -0,0 +1,455 @@
+'''
+# Name: eval_server.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Local evaluation server keeping the Vahana model warm
+
+# A single what-if evaluation through OpenMDAO imports OpenMDAO and scipy,
+# builds Problem(root=TopLevelSystem()), runs setup() and evaluates one point:
+# hundreds of milliseconds for microseconds of math. This long-running server
+# (localhost HTTP or a Unix socket, persistent HTTP/1.1 connections) imports the
+# vectorized model (vahana_batch.evaluate_batch) once and evaluates single or
+# batched design points on a pool of worker threads. Requests of concurrent
+# clients for the same vehicle and assumptions that are queued at the same time
+# are merged into one evaluate_batch call, whose cost per point is far below
+# its fixed cost per call.
+
+# Requests:
+#   POST /evaluate  JSON {"Vehicle": "tiltwing", "range": 50000.0 (or one per point),
+#                         "points": [[rProp, cruiseSpeed, mBattery, mMotors, mtom], ...] (or "point": [...]),
+#                         "assumptions": {...} (optional, see vahana_batch.ASSUMPTIONS)}
+#                   -> JSON {"Vehicle": ..., "outputs": {output name: list, one value per point}}
+#   POST /evaluate?Vehicle=tiltwing&assumptions={...}  application/octet-stream body of float64 (N, 6) rows
+#                   range, rProp, cruiseSpeed, mBattery, mMotors, mtom -> float64 (outputs, N) body, output
+#                   names in the X-Outputs response header (comma separated)
+#   GET /stats      -> JSON request counts and request latency histogram (server side, [ms])
+# Outputs are the evaluate_batch outputs, with the margins split per constraint (margin_c1 ..) and the
+# cost items (C_*) as separate outputs.
+
+# Usage:
+#   python eval_server.py --port 8765 --workers 2
+#   python eval_server.py --unix /tmp/vahana.sock
+#   python eval_server.py --benchmark
+#   EvaluationClient('127.0.0.1:8765').evaluate(u'tiltwing', 50000.0, [[0.85, 52.0, 115.0, 34.5, 513.0]])
+'''
+
+from __future__ import print_function
+
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import threading
+import time
+
+import numpy as np
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import TCPServer, ThreadingMixIn
+    from httplib import HTTPConnection
+    from urllib import urlencode
+    from urlparse import parse_qs, urlparse
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import TCPServer, ThreadingMixIn
+    from http.client import HTTPConnection
+    from urllib.parse import parse_qs, urlencode, urlparse
+
+from vahana_batch import DESIGN_VARIABLES, evaluate_batch
+from constraints_batch import CONSTRAINTS
+
+# Largest number of points merged into one evaluate_batch call
+MAX_BATCH_POINTS = 4096
+
+# Request latency histogram bin edges [ms]
+LATENCY_EDGES = np.concatenate([[0.0], np.logspace(-2, 4, 25)])
+
+
+class LatencyHistogram(object):
+    ''' Thread safe histogram of request latencies '''
+
+    def __init__(self, edges=LATENCY_EDGES):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges), dtype=int)  # last bin: above the last edge
+        self.requests = 0
+        self.points = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds, points=1):
+        with self._lock:
+            self.counts[np.searchsorted(self.edges, seconds * 1000.0, side='right') - 1] += 1
+            self.requests += 1
+            self.points += points
+            self.seconds += seconds
+
+    def percentile(self, q):
+        ''' Upper edge of the bin holding the q-th percentile [ms] '''
+        with self._lock:
+            if not self.requests:
+                return None
+            i = int(np.searchsorted(np.cumsum(self.counts), q / 100.0 * self.requests))
+        return float(self.edges[i + 1]) if i + 1 < len(self.edges) else float('inf')
+
+    def summary(self):
+        with self._lock:
+            out = {'requests': self.requests, 'points': self.points,
+                   'meanMs': self.seconds / self.requests * 1000.0 if self.requests else None,
+                   'meanMsPerPoint': self.seconds / self.points * 1000.0 if self.points else None,
+                   'edgesMs': [float(e) for e in self.edges], 'counts': [int(c) for c in self.counts]}
+        out['p50Ms'] = self.percentile(50.0)
+        out['p99Ms'] = self.percentile(99.0)
+        return out
+
+
+def flat_outputs(result):
+    ''' evaluate_batch result -> {name: (N,) array}, margins per constraint and cost items as outputs '''
+    out = {}
+    for name, value in result.items():
+        if name == 'costs':
+            for item in value.dtype.names:
+                out[item] = np.asarray(value[item])
+        elif name == 'margins':
+            for j, constraint in enumerate(CONSTRAINTS):
+                out['margin_' + constraint] = value[:, j]
+        elif isinstance(value, np.ndarray):
+            out[name] = value
+    return out
+
+
+class _Job(object):
+    def __init__(self, Vehicle, ranges, points, assumptions):
+        self.Vehicle = Vehicle
+        self.assumptions = assumptions
+        self.key = (Vehicle, json.dumps(assumptions, sort_keys=True))
+        self.ranges = ranges
+        self.points = points
+        self.outputs = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class EvaluationPool(object):
+    ''' Worker threads evaluating queued jobs, merging the queued jobs of the same vehicle and assumptions
+        into one evaluate_batch call '''
+
+    def __init__(self, workers=2, max_points=MAX_BATCH_POINTS):
+        self.max_points = max_points
+        self.batches = 0
+        self._pending = []
+        self._closed = False
+        self._condition = threading.Condition()
+        for i in np.arange(workers):
+            thread = threading.Thread(target=self._work, name='evaluation-{}'.format(i))
+            thread.daemon = True
+            thread.start()
+
+    def evaluate(self, Vehicle, range, points, assumptions=None):
+        ''' {output name: (N,) array} of N design points (N, 5) at range (scalar or (N,)) '''
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        if points.ndim != 2 or points.shape[1] != len(DESIGN_VARIABLES):
+            raise ValueError('Expected design points of {} values: {}'.format(len(DESIGN_VARIABLES),
+                                                                              ', '.join(DESIGN_VARIABLES)))
+        ranges = np.broadcast_to(np.asarray(range, dtype=float), (len(points),))
+        job = _Job(Vehicle, ranges, points, assumptions or {})
+        with self._condition:
+            self._pending.append(job)
+            self._condition.notify()
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.outputs
+
+    def close(self):
+        ''' Stop the worker threads once the queued jobs are done '''
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _take(self):
+        with self._condition:
+            while not self._pending:
+                if self._closed:
+                    return None
+                self._condition.wait()
+            jobs = [self._pending.pop(0)]
+            points = len(jobs[0].points)
+            for job in list(self._pending):
+                if job.key == jobs[0].key and points + len(job.points) <= self.max_points:
+                    self._pending.remove(job)
+                    jobs.append(job)
+                    points += len(job.points)
+            self.batches += 1
+        return jobs
+
+    def _work(self):
+        while True:
+            jobs = self._take()
+            if jobs is None:
+                return
+            try:
+                points = np.concatenate([job.points for job in jobs])
+                ranges = np.concatenate([job.ranges for job in jobs])
+                outputs = flat_outputs(evaluate_batch(jobs[0].Vehicle, ranges, *points.T, **jobs[0].assumptions))
+                start = 0
+                for job in jobs:
+                    stop = start + len(job.points)
+                    job.outputs = dict((name, value[start:stop]) for name, value in outputs.items())
+                    start = stop
+            except Exception as err:
+                for job in jobs:
+                    job.error = err
+            finally:
+                for job in jobs:
+                    job.done.set()
+
+
+class EvaluationHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # persistent connections
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        if self.server.address_family != getattr(socket, 'AF_UNIX', None):
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, contentType='application/json', headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Type', contentType)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, data):
+        self._send(status, json.dumps(data).encode('utf-8'))
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/stats':
+            self._send_json(200, dict(self.server.histogram.summary(), batches=self.server.pool.batches))
+        elif path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        else:
+            self._send_json(404, {'error': 'Unknown path: {}'.format(path)})
+
+    def do_POST(self):
+        start = time.time()
+        url = urlparse(self.path)
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if url.path != '/evaluate':
+            self._send_json(404, {'error': 'Unknown path: {}'.format(url.path)})
+            return
+        binary = self.headers.get('Content-Type', '').startswith('application/octet-stream')
+        try:
+            if binary:
+                query = parse_qs(url.query)
+                Vehicle = query['Vehicle'][0]
+                assumptions = json.loads(query['assumptions'][0]) if 'assumptions' in query else {}
+                rows = np.frombuffer(body, dtype='<f8').reshape(-1, 1 + len(DESIGN_VARIABLES))
+                ranges, points = rows[:, 0], rows[:, 1:]
+            else:
+                request = json.loads(body.decode('utf-8'))
+                Vehicle = request['Vehicle']
+                assumptions = request.get('assumptions', {})
+                points = request['points'] if 'points' in request else [request['point']]
+                ranges = request['range']
+            outputs = self.server.pool.evaluate(Vehicle, ranges, points, assumptions)
+        except (KeyError, ValueError, TypeError) as err:
+            self._send_json(400, {'error': '{}: {}'.format(type(err).__name__, err)})
+            return
+        if binary:
+            names = sorted(outputs)
+            body = np.array([outputs[name] for name in names], dtype='<f8').tobytes()
+            self._send(200, body, 'application/octet-stream', [('X-Outputs', ','.join(names))])
+        else:
+            self._send_json(200, {'Vehicle': Vehicle,
+                                  'outputs': dict((name, value.tolist()) for name, value in outputs.items())})
+        self.server.histogram.record(time.time() - start, len(outputs['DOC']))
+
+
+class EvaluationServer(ThreadingMixIn, HTTPServer):
+    ''' Threaded localhost HTTP server of the warm model, see the header for the requests '''
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address=('127.0.0.1', 8765), workers=2):
+        self.pool = EvaluationPool(workers)
+        self.histogram = LatencyHistogram()
+        HTTPServer.__init__(self, address, EvaluationHandler)
+
+    def server_close(self):
+        HTTPServer.server_close(self)
+        self.pool.close()
+
+
+class UnixEvaluationServer(EvaluationServer):
+    ''' EvaluationServer on a Unix socket '''
+    address_family = getattr(socket, 'AF_UNIX', None)
+
+    def __init__(self, path, workers=2):
+        if os.path.exists(path):
+            os.remove(path)
+        EvaluationServer.__init__(self, path, workers)
+
+    def server_bind(self):
+        TCPServer.server_bind(self)
+        self.server_name = 'localhost'
+        self.server_port = 0
+
+
+class _UnixConnection(HTTPConnection):
+    def __init__(self, path):
+        HTTPConnection.__init__(self, 'localhost')
+        self.socketPath = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socketPath)
+
+
+class _TCPConnection(HTTPConnection):
+    def connect(self):
+        HTTPConnection.connect(self)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+class EvaluationClient(object):
+    ''' Persistent connection to an EvaluationServer at 'host:port' or a Unix socket path (one per thread) '''
+
+    def __init__(self, address):
+        if ':' in address:
+            host, port = address.rsplit(':', 1)
+            self._connection = _TCPConnection(host, int(port))
+        else:
+            self._connection = _UnixConnection(address)
+
+    def _request(self, method, path, body=None, headers=None):
+        self._connection.request(method, path, body, headers or {})
+        response = self._connection.getresponse()
+        data = response.read()
+        if response.status != 200:
+            raise ValueError('Evaluation server: {}'.format(json.loads(data.decode('utf-8'))['error']))
+        return response, data
+
+    def evaluate(self, Vehicle, range, points, assumptions=None, binary=False):
+        ''' {output name: (N,) array} of N design points (rProp, cruiseSpeed, mBattery, mMotors, mtom) '''
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        if binary:
+            rows = np.column_stack([np.broadcast_to(np.asarray(range, dtype=float), (len(points),)), points])
+            query = [('Vehicle', Vehicle)]
+            if assumptions:
+                query.append(('assumptions', json.dumps(assumptions, separators=(',', ':'))))
+            path = '/evaluate?' + urlencode(query)
+            response, data = self._request('POST', path, rows.astype('<f8').tobytes(),
+                                           {'Content-Type': 'application/octet-stream'})
+            names = response.getheader('X-Outputs').split(',')
+            values = np.frombuffer(data, dtype='<f8').reshape(len(names), -1)
+            return dict(zip(names, values))
+        request = {'Vehicle': Vehicle, 'range': np.asarray(range, dtype=float).tolist(), 'points': points.tolist(),
+                   'assumptions': assumptions or {}}
+        response, data = self._request('POST', '/evaluate', json.dumps(request),
+                                       {'Content-Type': 'application/json'})
+        outputs = json.loads(data.decode('utf-8'))['outputs']
+        return dict((name, np.array(value)) for name, value in outputs.items())
+
+    def stats(self):
+        return json.loads(self._request('GET', '/stats')[1].decode('utf-8'))
+
+    def close(self):
+        self._connection.close()
+
+
+def _single_points(address, point, n):
+    client = EvaluationClient(address)
+    for i in np.arange(n):
+        client.evaluate(u'tiltwing', 50000.0, point, binary=True)
+    client.close()
+
+
+def benchmark(workers=2, clients=4, repeats=200):
+    ''' Cold OpenMDAO evaluation vs warm server requests, printed '''
+    import subprocess
+    import sys
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test', 'vahana_optimizer.py')
+    cold = ('import sys, time; start = time.time(); sys.path.insert(0, {!r}); '
+            'from openmdao.api import Problem; from vahana_optimizer import TopLevelSystem; '
+            'p = Problem(root=TopLevelSystem()); p.setup(check=False); p.run(); '
+            'print(time.time() - start)').format(os.path.dirname(script))
+    start = time.time()
+    output = subprocess.check_output([sys.executable, '-W', 'ignore', '-c', cold], stderr=subprocess.STDOUT)
+    print('Cold OpenMDAO evaluation (new process: imports, setup, run): {:.1f} ms (in process {:.1f} ms)'.format(
+        (time.time() - start) * 1000.0, float(output.split()[-1]) * 1000.0))
+
+    server = EvaluationServer(('127.0.0.1', 0), workers)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    address = '127.0.0.1:{}'.format(server.server_address[1])
+    point = [0.85, 52.0, 115.0, 34.5, 513.0]
+    client = EvaluationClient(address)
+    client.evaluate(u'tiltwing', 50000.0, point)
+    for binary in (False, True):
+        start = time.time()
+        for i in np.arange(repeats):
+            client.evaluate(u'tiltwing', 50000.0, point, binary=binary)
+        print('Warm single point, {}: {:.2f} ms per request'.format(
+            'binary' if binary else 'JSON', (time.time() - start) / repeats * 1000.0))
+    points = np.tile(point, (1000, 1)) * np.random.RandomState(0).uniform(0.9, 1.1, (1000, 5))
+    for binary in (False, True):
+        start = time.time()
+        client.evaluate(u'tiltwing', np.linspace(10000.0, 200000.0, 1000), points, binary=binary)
+        print('Warm batch of 1000 points, {}: {:.3f} ms per point'.format(
+            'binary' if binary else 'JSON', (time.time() - start) / len(points) * 1000.0))
+
+    # Client processes, so the clients don't share the server's interpreter lock
+    batches = server.pool.batches
+    processes = [multiprocessing.Process(target=_single_points, args=(address, point, repeats))
+                 for i in np.arange(clients)]
+    start = time.time()
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+    seconds = time.time() - start
+    print('{} concurrent clients, single points: {:.2f} ms per point, {:.1f} points per evaluate_batch call'.format(
+        clients, seconds / (clients * repeats) * 1000.0, clients * repeats / float(server.pool.batches - batches)))
+    stats = client.stats()
+    print('Server side: {} requests, p50 {:.2f} ms, p99 {:.2f} ms, {:.3f} ms per point'.format(
+        stats['requests'], stats['p50Ms'], stats['p99Ms'], stats['meanMsPerPoint']))
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Local evaluation server of the warm Vahana model.')
+    parser.add_argument('--host', default='127.0.0.1', help='[default 127.0.0.1]')
+    parser.add_argument('--port', type=int, default=8765, help='[default 8765]')
+    parser.add_argument('--unix', metavar='PATH', help='serve on a Unix socket instead')
+    parser.add_argument('--workers', type=int, default=2, help='evaluation worker threads [default 2]')
+    parser.add_argument('--benchmark', action='store_true', help='compare cold and warm evaluations and exit')
+    args = parser.parse_args(argv)
+    if args.benchmark:
+        benchmark(args.workers)
+        return
+    server = UnixEvaluationServer(args.unix, args.workers) if args.unix else \
+        EvaluationServer((args.host, args.port), args.workers)
+    print('Serving on {}'.format(args.unix or '{}:{}'.format(args.host, args.port)))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+'''
+# Name: evolution_optimizer.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Population-based (CMA-ES) DOC optimization with batch model evaluations
+
+# COBYLA takes one model evaluation per step. CMA-ES samples a whole generation
+# (64 designs by default) from a multivariate normal distribution, evaluates it
+# with one call of the vectorized model (vahana_batch.py), or split across a
+# process pool for the slow variants, and adapts the mean, step size and
+# covariance from the best half. Constraints are handled with the feasibility
+# rules: feasible designs rank by DOC and ahead of every infeasible design,
+# infeasible designs rank by their constraint violation (c1 .. c3, c4 for the
+# helicopter, and the optional battery fraction, each relative to its
+# FEASIBILITY_TOL). The search runs in the unit cube of the design variable
+# bounds; samples outside are clipped for the evaluation and penalized by their
+# distance to the box.
+
+# Inputs:
+#   Vehicle     - 'tiltwing' or 'helicopter'
+#   range       - mission range [m]
+#   population  - designs per generation [default 64]
+#   sigma       - initial step size in the unit cube [default 0.3]
+#   generations - maximum generations [default 200]
+#   tolx        - stop when the step size drops below tolx (unit cube) [default 1e-6]
+#   x0          - start mean in optimizer units [default DESIGN_START]
+#   processes   - worker processes per generation [default 1]
+#   assumptions - "What If" inputs of vahana_batch.py (scalars)
+
+# Outputs:
+#   dict with x, xScaled, DOC, margins, feasible of the best design, nfev, generations,
+#   seconds and history (per generation: evaluations, seconds, best feasible DOC)
+'''
+
+from __future__ import print_function
+
+import multiprocessing
+import time
+
+import numpy as np
+
+from vahana_batch import evaluate_batch
+from design_optimizer import DESIGN_BOUNDS, DESIGN_START, MODEL_CONSTRAINTS, FEASIBILITY_TOL, \
+    BATTERY_FRACTION_TOL, optimize_design, to_design
+from vehicle import vehicle_key
+
+
+def _evaluate_rows(args):
+    Vehicle, range, X, assumptions = args
+    result = evaluate_batch(Vehicle, range, *to_design(Vehicle, X).T, **assumptions)
+    return result['DOC'], result['margins']
+
+
+def evaluate_generation(Vehicle, range, X, pool=None, processes=1, **assumptions):
+    ''' DOC (M,) and margins (M, 6) of M designs in optimizer units, in one batch or split over a pool '''
+    if pool is None:
+        return _evaluate_rows((Vehicle, range, X, assumptions))
+    done = pool.map(_evaluate_rows, [(Vehicle, range, chunk, assumptions)
+                                     for chunk in np.array_split(X, processes) if len(chunk)])
+    return np.concatenate([f for f, g in done]), np.vstack([g for f, g in done])
+
+
+def violation(Vehicle, X, margins, battery_fraction=None):
+    ''' Total constraint violation of every design, in multiples of the feasibility tolerances '''
+    columns = list(MODEL_CONSTRAINTS[vehicle_key(Vehicle)])
+    v = np.sum(np.log1p(np.maximum(-margins[:, columns], 0.0) / FEASIBILITY_TOL[columns]), axis=1)
+    if battery_fraction is not None:
+        x = to_design(Vehicle, X)
+        v += np.log1p(np.maximum(x[:, 2] - battery_fraction * x[:, 4], 0.0) / BATTERY_FRACTION_TOL)
+    return np.where(np.isfinite(v), v, np.inf)
+
+
+def feasibility_order(DOC, v):
+    ''' Ranking by the feasibility rules: feasible by DOC, then infeasible by violation '''
+    feasible = (v == 0.0) & np.isfinite(DOC)
+    return np.lexsort((np.where(feasible, DOC, 0.0), np.where(feasible, 0.0, v), ~feasible))
+
+
+def cma_es(Vehicle, range, population=64, sigma=0.3, generations=200, tolx=1e-6, x0=None, battery_fraction=None,
+           seed=0, processes=1, target=None, progress=False, **assumptions):
+    ''' CMA-ES at one range, see the header for the returned dict. Stops early once a feasible
+        DOC <= target is found (if given). '''
+    vehicle = vehicle_key(Vehicle)
+    bounds = np.array(DESIGN_BOUNDS[vehicle], dtype=float)
+    width = bounds[:, 1] - bounds[:, 0]
+    n = len(bounds)
+    random = np.random.RandomState(seed)
+
+    # Strategy parameters (Hansen, The CMA Evolution Strategy: A Tutorial)
+    mu = population // 2
+    weights = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+    weights /= np.sum(weights)
+    mueff = 1.0 / np.sum(weights ** 2)
+    cc = (4.0 + mueff / n) / (n + 4.0 + 2.0 * mueff / n)
+    cs = (mueff + 2.0) / (n + mueff + 5.0)
+    c1 = 2.0 / ((n + 1.3) ** 2 + mueff)
+    cmu = min(1.0 - c1, 2.0 * (mueff - 2.0 + 1.0 / mueff) / ((n + 2.0) ** 2 + mueff))
+    damps = 1.0 + 2.0 * max(0.0, np.sqrt((mueff - 1.0) / (n + 1.0)) - 1.0) + cs
+    chiN = np.sqrt(n) * (1.0 - 1.0 / (4.0 * n) + 1.0 / (21.0 * n ** 2))
+
+    mean = (np.asarray(DESIGN_START[vehicle] if x0 is None else x0, dtype=float) - bounds[:, 0]) / width
+    C = np.eye(n)
+    pc = np.zeros(n)
+    ps = np.zeros(n)
+    best = None
+    history = []
+    nfev = 0
+    start = time.time()
+
+    pool = multiprocessing.Pool(processes) if processes > 1 else None
+    try:
+        for generation in np.arange(generations):
+            eigenvalues, B = np.linalg.eigh(C)
+            D = np.sqrt(np.maximum(eigenvalues, 1e-20))
+            Z = random.standard_normal((population, n))
+            Y = Z.dot(np.diag(D)).dot(B.T)
+            U = mean + sigma * Y
+
+            inside = np.clip(U, 0.0, 1.0)
+            X = bounds[:, 0] + inside * width
+            DOC, margins = evaluate_generation(Vehicle, range, X, pool, processes, **assumptions)
+            nfev += population
+            v = violation(Vehicle, X, margins, battery_fraction)
+            # Outside the box: rank behind the designs inside, by distance
+            outside = np.sum((U - inside) ** 2, axis=1)
+            v = np.where(outside > 0.0, v + 1.0 + outside, v)
+            order = feasibility_order(DOC, v)
+
+            i = order[0]
+            if v[i] == 0.0 and np.isfinite(DOC[i]) and (best is None or DOC[i] < best['DOC']):
+                best = {'xScaled': X[i], 'DOC': float(DOC[i]), 'margins': margins[i], 'nfev': nfev}
+            history.append({'evaluations': nfev, 'seconds': time.time() - start,
+                            'DOC': best['DOC'] if best is not None else np.inf})
+            if progress:
+                print('Generation {}: {} model evaluations, best feasible DOC ($): {}, sigma: {:.2e}'.format(
+                    generation, nfev, history[-1]['DOC'], sigma))
+
+            # Recombination and adaptation
+            selected = order[:mu]
+            yw = weights.dot(Y[selected])
+            mean = mean + sigma * yw
+            invsqrtC = B.dot(np.diag(1.0 / D)).dot(B.T)
+            ps = (1.0 - cs) * ps + np.sqrt(cs * (2.0 - cs) * mueff) * invsqrtC.dot(yw)
+            hsig = (np.linalg.norm(ps) / np.sqrt(1.0 - (1.0 - cs) ** (2 * (generation + 1))) / chiN <
+                    1.4 + 2.0 / (n + 1.0))
+            pc = (1.0 - cc) * pc + hsig * np.sqrt(cc * (2.0 - cc) * mueff) * yw
+            rankMu = (Y[selected].T * weights).dot(Y[selected])
+            C = ((1.0 - c1 - cmu) * C + c1 * (np.outer(pc, pc) + (1 - hsig) * cc * (2.0 - cc) * C) +
+                 cmu * rankMu)
+            sigma *= np.exp((cs / damps) * (np.linalg.norm(ps) / chiN - 1.0))
+
+            if sigma * np.sqrt(np.max(D ** 2)) < tolx:
+                break
+            if target is not None and best is not None and best['DOC'] <= target:
+                break
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    if best is None:
+        X = bounds[:, 0] + np.clip(mean, 0.0, 1.0) * width
+        DOC, margins = evaluate_generation(Vehicle, range, X[None, :], **assumptions)
+        best = {'xScaled': X, 'DOC': float(DOC[0]), 'margins': margins[0], 'nfev': nfev}
+    return {'Vehicle': Vehicle, 'range': range, 'assumptions': assumptions, 'x': to_design(Vehicle, best['xScaled']),
+            'xScaled': best['xScaled'], 'DOC': best['DOC'], 'margins': best['margins'],
+            'feasible': history[-1]['DOC'] < np.inf, 'nfev': nfev, 'generations': len(history),
+            'seconds': time.time() - start, 'history': history}
+
+
+def time_to_target(history, target):
+    ''' (evaluations, seconds) when the best feasible DOC first reached target, (None, None) if never '''
+    for h in history:
+        if h['DOC'] <= target:
+            return h['evaluations'], h['seconds']
+    return None, None
+
+
+def compare_with_cobyla(Vehicle, range, rtol=1e-3, **options):
+    ''' Evaluations and time of CMA-ES to reach the COBYLA DOC (within rtol), next to COBYLA's '''
+    start = time.time()
+    cobyla = optimize_design(Vehicle, range)
+    cobylaSeconds = time.time() - start
+    target = cobyla['DOC'] * (1.0 + rtol)
+    result = cma_es(Vehicle, range, target=target, **options)
+    evaluations, seconds = time_to_target(result['history'], target)
+    return {'Vehicle': Vehicle, 'range': range, 'target': target,
+            'cobyla': {'DOC': cobyla['DOC'], 'evaluations': cobyla['nfev'], 'seconds': cobylaSeconds},
+            'cmaes': {'DOC': result['DOC'], 'evaluations': evaluations, 'seconds': seconds,
+                      'generations': result['generations']}}
+
+
+if __name__ == "__main__":
+    # Sample Inputs: both vehicles at 50 km, time to reach the COBYLA optimum DOC
+    for Vehicle in (u'tiltwing', u'helicopter'):
+        c = compare_with_cobyla(Vehicle, 50000.0)
+        print('{}: target DOC ($) {:.4f}'.format(Vehicle, c['target']))
+        print('  COBYLA: {} model evaluations, {:.2f} s'.format(c['cobyla']['evaluations'], c['cobyla']['seconds']))
+        print('  CMA-ES: {} model evaluations in {} batches, {} s, DOC ($) {:.4f}'.format(
+            c['cmaes']['evaluations'], c['cmaes']['generations'], c['cmaes']['seconds'], c['cmaes']['DOC']))
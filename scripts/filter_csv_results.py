@@ -1,21 +1,7 @@
-import csv
-data = []
-with open('output_edited.csv', 'rb') as csvfile:
-    reader = csv.reader(csvfile, delimiter=' ', quotechar='|')
-    for row in reader:
-        data.append(row)
+from __future__ import print_function
 
-filteredData = []
-firstRow = True
-for row in data:
-    rowData = row[0].split(',')
-    if firstRow:
-        filteredData.append(row)
-        firstRow = False
-    elif (rowData[3] == '1.0') and (rowData[4] == '1.0') and (rowData[5] == '1.0') and (rowData[6] == '1.0') and (rowData[7] == '1.0') and (rowData[8] == '1.0'):
-        filteredData.append(row)
+from filter_csv_stream import filter_csv
 
-with open('filtered_data.csv', 'wb') as csvfile:
-    writer = csv.writer(csvfile, delimiter=' ', quotechar='|', quoting=csv.QUOTE_MINIMAL)
-    for row in filteredData:
-        writer.writerow(row)
+# Keep the rows of output_edited.csv whose columns 3-8 (constraint flags) are the string '1.0', as before
+stats = filter_csv('output_edited.csv', 'filtered_data.csv', ["#{}=='1.0'".format(i) for i in range(3, 9)])
+print('{rowsOut} of {rowsIn} rows kept ({rowsPerSecond:.0f} rows/s)'.format(**stats))
@@ -0,0 +1,162 @@
+'''
+# Name: filter_csv_stream.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Streaming filter for large PET output .csv files
+
+# Reads the input .csv in fixed-size chunks of rows, keeps the rows matching
+# all predicates and appends them to the output .csv as it goes, so memory use
+# is bounded by the chunk size regardless of the file size.
+
+# Predicates have the form <column><op><value>, where <column> is a header name
+# or #<index> (0-based column index), <op> is one of == != <= >= < > and <value>
+# is compared numerically when both sides are numbers, as a string otherwise.
+# A quoted <value> ('1.0' or "1.0") is always compared as a string, so
+# #3=='1.0' keeps 1.0 but not 1 or 1.00.
+
+# Usage:
+#   python filter_csv_stream.py output.csv filtered.csv --where "c1==1.0" --where "DOCPerKm<1.2"
+#   python filter_csv_stream.py output.csv filtered.csv --between Range 50000 100000 --chunk-size 50000
+
+# Outputs:
+#   filtered .csv file (header + matching rows), throughput report [rows/s]
+'''
+
+from __future__ import print_function
+
+import argparse
+import csv
+import itertools
+import operator
+import re
+import sys
+import time
+
+OPERATORS = [('==', operator.eq),
+             ('!=', operator.ne),
+             ('<=', operator.le),
+             ('>=', operator.ge),
+             ('<', operator.lt),
+             ('>', operator.gt)]
+
+_predicate = re.compile(r'^\s*(.+?)\s*(==|!=|<=|>=|<|>)\s*(.*?)\s*$')
+
+
+def open_csv(path, mode):
+    ''' Open a .csv file for the csv module under Python 2 and 3 '''
+    if sys.version_info[0] < 3:
+        return open(path, mode + 'b')
+    return open(path, mode, newline='')
+
+
+def _number(text):
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def parse_predicate(expr):
+    ''' "DOC<=120" -> ('DOC', '<=', '120') '''
+    match = _predicate.match(expr)
+    if match is None:
+        raise ValueError('Cannot parse predicate: {}'.format(expr))
+    return match.groups()
+
+
+def compile_predicates(predicates, header):
+    ''' Turn (column, op, value) predicates into a row -> bool function for header. '''
+    tests = []
+    for column, op, value in predicates:
+        if column.startswith('#'):
+            index = int(column[1:])
+        elif column in header:
+            index = header.index(column)
+        else:
+            raise KeyError('Column not found in header: {}'.format(column))
+        compare = dict(OPERATORS)[op]
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in '\'"':
+            tests.append((index, compare, value[1:-1], None))
+        else:
+            tests.append((index, compare, value, _number(value)))
+
+    def match(row):
+        for index, compare, value, number in tests:
+            cell = row[index]
+            if compare is operator.eq and cell == value:
+                continue
+            if number is not None:
+                cellNumber = _number(cell)
+                if cellNumber is not None:
+                    if not compare(cellNumber, number):
+                        return False
+                    continue
+            if not compare(cell, value):
+                return False
+        return True
+
+    return match
+
+
+def filter_csv(src, dst, predicates, chunk_size=100000, progress=False):
+    ''' Stream src to dst keeping the header and the rows matching all predicates.
+        predicates is a list of "<column><op><value>" strings or (column, op, value) tuples.
+        Returns a dict with rowsIn, rowsOut, seconds and rowsPerSecond. '''
+    predicates = [parse_predicate(p) if isinstance(p, (str, type(u''))) else p for p in predicates]
+    rowsIn = 0
+    rowsOut = 0
+    start = time.time()
+
+    with open_csv(src, 'r') as infile, open_csv(dst, 'w') as outfile:
+        reader = csv.reader(infile)
+        writer = csv.writer(outfile)
+
+        header = next(reader)
+        writer.writerow(header)
+        match = compile_predicates(predicates, header)
+
+        while True:
+            chunk = list(itertools.islice(reader, chunk_size))
+            if not chunk:
+                break
+            kept = [row for row in chunk if row and match(row)]
+            writer.writerows(kept)
+            outfile.flush()
+
+            rowsIn += len(chunk)
+            rowsOut += len(kept)
+            if progress:
+                elapsed = time.time() - start
+                print('{} rows read, {} rows kept, {:.0f} rows/s'.format(rowsIn, rowsOut, rowsIn / max(elapsed, 1e-9)),
+                      file=sys.stderr)
+
+    seconds = time.time() - start
+    return {'rowsIn': rowsIn, 'rowsOut': rowsOut, 'seconds': seconds,
+            'rowsPerSecond': rowsIn / max(seconds, 1e-9)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Stream-filter a large PET .csv file.')
+    parser.add_argument('src', help='input .csv file')
+    parser.add_argument('dst', help='output .csv file')
+    parser.add_argument('--where', action='append', default=[], metavar='PREDICATE',
+                        help='<column><op><value>, may be repeated (all must hold)')
+    parser.add_argument('--between', action='append', nargs=3, default=[], metavar=('COLUMN', 'LOW', 'HIGH'),
+                        help='keep rows with LOW <= COLUMN <= HIGH, may be repeated')
+    parser.add_argument('--chunk-size', type=int, default=100000, help='rows per chunk [default 100000]')
+    parser.add_argument('--progress', action='store_true', help='report throughput after every chunk')
+    args = parser.parse_args(argv)
+
+    predicates = [parse_predicate(p) for p in args.where]
+    for column, low, high in args.between:
+        predicates.append((column, '>=', low))
+        predicates.append((column, '<=', high))
+
+    stats = filter_csv(args.src, args.dst, predicates, chunk_size=args.chunk_size, progress=args.progress)
+    print('{rowsOut} of {rowsIn} rows kept in {seconds:.2f} s ({rowsPerSecond:.0f} rows/s)'.format(**stats))
+
+
+if __name__ == "__main__":
+    main()
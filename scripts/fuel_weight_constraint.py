@@ -18,7 +18,8 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
+from analysis_errors import analysis_errors
 import math
 
 class fuel_weight_constraint(Component):
@@ -29,6 +30,7 @@ class fuel_weight_constraint(Component):
         
         self.add_output('c', val=0.0)
     
+    @analysis_errors
     def solve_nonlinear(self, params, unknowns, resids):
         
         # Constraint on battery mass with respect to maximum takeoff mass
@@ -27,7 +27,8 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
+from analysis_errors import analysis_errors
 import math
 
 class fuselage_mass(Component):
@@ -42,6 +43,7 @@ class fuselage_mass(Component):
         
         self.add_output('mass', val=0.0)
         
+    @analysis_errors
     def solve_nonlinear(self, params, unknowns, resids):
         ng = 3.8  # Max g lift
         nl = 3.5  # Landing load factor
@@ -17,7 +17,7 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
 import math
 
 class heli_prop_mass_tail_inputs(Component):
@@ -15,7 +15,7 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
 import math
 
 class heli_wire_mass_input(Component):
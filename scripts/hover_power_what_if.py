@@ -18,7 +18,8 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component, Group, Problem, IndepVarComp
+from openmdao.core.component import Component
+from analysis_errors import AnalysisError, analysis_errors, check_positive
 import math
 
 class HoverPower(Component):
@@ -40,7 +41,10 @@ class HoverPower(Component):
         self.add_output('hoverPower_PMaxBattery', val=0.0)
         self.add_output('QMax', val=0.0)
         
+    @analysis_errors
     def solve_nonlinear(self, params, unknowns, resids):
+        check_positive(self, params, 'rProp', 'W')
+
         # Altitude, compute atmospheric properties
         rho = 1.225
 
@@ -148,10 +152,11 @@ class HoverPower(Component):
             unknowns['QMax'] = unknowns['hoverPower_PMax'] / omega
             
         else:
-            pass
-            #TODO: raise OpenMDAO exception
+            raise AnalysisError('Unrecognized vehicle: {}'.format(params['Vehicle']))
 
 if __name__ == "__main__":
+    from openmdao.api import Problem, Group, IndepVarComp
+
     top = Problem()
     root = top.root = Group()
 
@@ -0,0 +1,94 @@
+'''
+# Name: import_benchmark.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Import (cold start) time per entry point
+
+# Short testbench processes pay the import cost of every module they load.
+# Each entry point is imported in a fresh interpreter, `repeats` times (the
+# minimum is reported), and the heavy dependencies it pulled in (OpenMDAO,
+# scipy, sqlitedict) are listed. Under Python 3.7+ the total comes from
+# `python -X importtime` (cumulative microseconds of the entry module), under
+# Python 2.7 from the wall time of the import statement. Results can be
+# appended to a JSON lines file to track them over time.
+
+# Inputs:
+#   modules     - entry point modules [default ENTRY_POINTS]
+#   repeats     - fresh interpreters per module [default 5]
+#   out         - optional JSON lines file to append the results to
+
+# Outputs:
+#   [{module, seconds, heavy (list of heavy modules loaded), method, python, time}], printed table
+'''
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+
+# Kernels, OpenMDAO components, drivers and tools, and an optimizer script (test/)
+ENTRY_POINTS = ('vehicle', 'constraints_batch', 'operating_cost_batch', 'vahana_batch', 'design_optimizer',
+                'study_runner', 'eval_server', 'cruise_power', 'hover_power', 'loiter_power', 'wing_mass',
+                'prop_mass', 'operating_cost', 'vahana_optimizer')
+
+HEAVY = ('openmdao', 'scipy', 'sqlitedict')
+
+_PROBE = ('import sys, time; sys.path[:0] = [{scripts!r}, {test!r}]; start = time.time(); import {module}; '
+          'seconds = time.time() - start; '
+          'print(repr((seconds, [m for m in {heavy!r} if m in sys.modules])))')
+
+
+def import_time(module, repeats=5, python=None):
+    ''' (seconds, heavy modules loaded, method) of importing `module` in a fresh interpreter, min of repeats '''
+    python = python or sys.executable
+    code = _PROBE.format(scripts=SCRIPTS, test=os.path.join(SCRIPTS, 'test'), module=module, heavy=HEAVY)
+    importtime = sys.version_info >= (3, 7)
+    best = None
+    for i in range(repeats):
+        command = [python, '-W', 'ignore'] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=SCRIPTS)
+        stdout, stderr = process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError('import {} failed: {}'.format(module, stderr.decode('utf-8', 'replace')[-500:]))
+        seconds, heavy = eval(stdout.decode('utf-8').strip().splitlines()[-1])
+        if importtime:
+            # import time: self [us] | cumulative | imported package, the entry module's own line
+            for line in stderr.decode('utf-8').splitlines():
+                match = re.match(r'import time:\s*\d+\s*\|\s*(\d+)\s*\|\s*(\S+)\s*$', line)
+                if match and match.group(2) == module:
+                    seconds = int(match.group(1)) * 1e-6
+        if best is None or seconds < best[0]:
+            best = (seconds, heavy)
+    return best[0], best[1], '-X importtime' if importtime else 'wall time'
+
+
+def benchmark(modules=ENTRY_POINTS, repeats=5, out=None):
+    results = []
+    for module in modules:
+        seconds, heavy, method = import_time(module, repeats)
+        results.append({'module': module, 'seconds': seconds, 'heavy': heavy, 'method': method,
+                        'python': '{}.{}'.format(*sys.version_info[:2]), 'time': time.time()})
+        print('{:<22} {:8.1f} ms   {}'.format(module, seconds * 1000.0, ', '.join(heavy) or '-'))
+    if out:
+        with open(out, 'a') as f:
+            for result in results:
+                f.write(json.dumps(result, sort_keys=True) + '\n')
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Import time per entry point, in fresh interpreters.')
+    parser.add_argument('modules', nargs='*', default=list(ENTRY_POINTS), help='[default ENTRY_POINTS]')
+    parser.add_argument('--repeats', type=int, default=5, help='fresh interpreters per module [default 5]')
+    parser.add_argument('--out', metavar='PATH', help='append the results to a JSON lines file')
+    args = parser.parse_args()
+    benchmark(args.modules, args.repeats, args.out)
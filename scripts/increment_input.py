@@ -15,7 +15,7 @@ out - int output
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
 
 class increment_input(Component):
     def __init__(self):
@@ -0,0 +1,108 @@
+'''
+# Name: incremental.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Dirty-flag incremental evaluation for OpenMDAO Groups (e.g. TopLevelSystem)
+
+# OpenMDAO re-runs every component on every model evaluation. enable_incremental
+# wraps solve_nonlinear of each component of a group so that a component whose
+# params are unchanged since its last run restores its previous unknowns instead
+# of recomputing them. In TopLevelSystem a change in indep1.range then only runs
+# SimpleMission, ReserveMission, OperatingCost and con1; CruisePower, HoverPower,
+# LoiterPower, WingMass, PropMass, ... are skipped.
+
+# Inputs:
+#   group   - OpenMDAO Group, before or after Problem.setup()
+
+# Outputs:
+#   incremental_stats   - {component pathname: (runs, skipped)}
+'''
+
+from __future__ import print_function
+
+import numpy as np
+
+from openmdao.components.indep_var_comp import IndepVarComp
+
+
+def _hashable(value):
+    if isinstance(value, np.ndarray):
+        return (value.shape, value.tobytes())
+    return value
+
+
+def _incremental(comp):
+    solve_nonlinear = comp.solve_nonlinear
+    comp.incremental_runs = 0
+    comp.incremental_skips = 0
+    comp._incremental_key = None
+    comp._incremental_unknowns = None
+
+    def incremental_solve_nonlinear(params, unknowns, resids):
+        key = tuple((name, _hashable(params[name])) for name in params.keys())
+        if key == comp._incremental_key:
+            # Inputs unchanged since the last run: restore the outputs
+            for name, value in comp._incremental_unknowns.items():
+                unknowns[name] = value
+            comp.incremental_skips += 1
+            return
+
+        comp._incremental_key = None  # don't trust the cache if solve_nonlinear raises
+        solve_nonlinear(params, unknowns, resids)
+        comp._incremental_unknowns = dict((name, np.copy(unknowns[name]) if isinstance(unknowns[name], np.ndarray)
+                                           else unknowns[name]) for name in unknowns.keys())
+        comp._incremental_key = key
+        comp.incremental_runs += 1
+
+    comp.solve_nonlinear = incremental_solve_nonlinear
+
+
+def enable_incremental(group):
+    ''' Make every component of group skip solve_nonlinear when its params are unchanged. '''
+    for comp in group.components(recurse=True):
+        if not isinstance(comp, IndepVarComp) and not hasattr(comp, 'incremental_runs'):
+            _incremental(comp)
+    return group
+
+
+def reset_incremental(group):
+    ''' Forget cached outputs, e.g. after changing component options. '''
+    for comp in group.components(recurse=True):
+        if hasattr(comp, 'incremental_runs'):
+            comp._incremental_key = None
+
+
+def incremental_stats(group):
+    ''' Return {component pathname: (runs, skipped)} for an incremental group. '''
+    return dict((comp.pathname or comp.name, (comp.incremental_runs, comp.incremental_skips))
+                for comp in group.components(recurse=True) if hasattr(comp, 'incremental_runs'))
+
+
+def print_incremental_stats(group):
+    stats = incremental_stats(group)
+    totalRuns = sum(runs for runs, skips in stats.values())
+    totalSkips = sum(skips for runs, skips in stats.values())
+    for name in sorted(stats):
+        print('{:<24} runs: {:>6}  skipped: {:>6}'.format(name, *stats[name]))
+    print('{:<24} runs: {:>6}  skipped: {:>6}'.format('total', totalRuns, totalSkips))
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test'))
+    from openmdao.api import Problem
+    from vahana_optimizer import TopLevelSystem
+
+    top = Problem(root=enable_incremental(TopLevelSystem()))
+    top.setup(check=False)
+
+    # Range sweep at a fixed design
+    for r in np.linspace(10000.0, 200000.0, 20):
+        top['indep1.range'] = r
+        top.run_once()
+        print("Range (km):", r / 1000.0, "DOC ($):", top['OperatingCost.C_costPerFlight'])
+
+    print_incremental_stats(top.root)
@@ -17,9 +17,9 @@
 
 from __future__ import print_function
 
-from openmdao.api import IndepVarComp, Component, Problem, Group, FileRef
+from openmdao.core.component import Component
+from analysis_errors import AnalysisError, analysis_errors, check_positive
 import numpy as np
-from scipy import optimize, special
 import platform
 from subprocess import Popen, PIPE, STDOUT
 import os
@@ -56,7 +56,10 @@ class loiter_power(Component):
         self.add_output('Ct', val=0.0, description='Thrust coefficient (including tip loss factor for effective disk area)')
         self.add_output('PLoiter',val=0.0, description='Power required during loiter')
         
+    @analysis_errors
     def solve_nonlinear(self, params, unknowns, resids):
+        check_positive(self, params, 'rProp', 'W')
+
     
         # Altitude, compute atmospheric properties
         rho = 1.225
@@ -121,6 +124,7 @@ class loiter_power(Component):
             unknowns['Ct'] = params['W'] / (rho * math.pi * params['rProp']**2 * params['B']**2 * params['cruiseOutputOmega']**2 * params['rProp']**2)
             
             # Find velocity for min power
+            from scipy import optimize  # helicopter only, not at load
             unknowns['loiterV'] = optimize.fminbound(loiterPower, 0, params['V']) #https://docs.scipy.org/doc/scipy/reference/generated/scipy.optimize.fminbound.html#scipy.optimize.fminbound
             
             # instead of
@@ -134,5 +138,4 @@ class loiter_power(Component):
             unknowns['PBattery'] = unknowns['PLoiter'] / params['cruiseOutputEtaMotor']
     
         else:
-            pass
-            # error
\ No newline at end of file
+            raise AnalysisError('Unrecognized vehicle: {}'.format(params['Vehicle']))
@@ -22,7 +22,8 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
+from analysis_errors import analysis_errors
 
 class mass_2_weight(Component):
     def __init__(self):
@@ -31,5 +32,6 @@ class mass_2_weight(Component):
         
         self.add_output('weight', val=0.0)
     
+    @analysis_errors
     def solve_nonlinear(self, params, unknowns, resids):
         unknowns['weight'] = params['mass']*9.8
\ No newline at end of file
@@ -29,7 +29,8 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
+from analysis_errors import AnalysisError, analysis_errors
 import math
 
 class mission(Component):
@@ -49,6 +50,7 @@ class mission(Component):
         self.add_output('E', val=0.0, description='total energy use in reserve mission')
         self.add_output('t', val=0.0, description='flight time for reserve mission')
         
+    @analysis_errors
     def solve_nonlinear(self, params, unknowns, resids):
         if (params["Vehicle"].lower().replace('-', '') == "tiltwing" or params["Vehicle"].lower().replace('-', '') == "helicopter"):
             # Mission
@@ -64,6 +66,5 @@ class mission(Component):
             unknowns['t'] = params['loiterTime'] + hoverTime + cruiseTime
             
         else:
-            print('unrecognized vehicle!')
-            pass
+            raise AnalysisError('Unrecognized vehicle: {}'.format(params['Vehicle']))
             
\ No newline at end of file
@@ -0,0 +1,193 @@
+'''
+# Name: monte_carlo_doc.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Monte Carlo propagation of the operating cost and power assumptions to DOC
+
+# operating_cost.py and hover_power.py hardcode point values for the battery
+# cost ($161 / kg = $700 / kW-hr at 230 W-hr / kg), battery life (2000 cycles),
+# motor life (6000 hr), insurance (6.5 % per year), electricity ($0.12 / kW-hr),
+# motor efficiency (0.85) and wing profile drag (0.012). This module draws
+# samples of these inputs from user specified distributions, correlated through
+# a Gaussian copula, and pushes them through the vectorized model
+# (vahana_batch.py) in chunks. Every (vehicle, range) case uses one design,
+# by default the DOC optimum at the nominal assumptions (design_optimizer.py).
+# Chunks are seeded by their index, so the samples do not depend on the number
+# of processes.
+
+# Distributions ({assumption: spec}, names as in vahana_batch.ASSUMPTIONS):
+#   ('constant', value)
+#   ('uniform', lower, upper)
+#   ('triangular', lower, mode, upper)
+#   ('normal', mean, std)
+#   ('lognormal', mean, std)      - mean and std of the variable itself
+
+# Inputs:
+#   cases           - list of (Vehicle, range) pairs
+#   samples         - samples per case [default 1000000]
+#   distributions   - {assumption: spec} [default DISTRIBUTIONS]
+#   correlation     - {(assumption, assumption): rank-like correlation of the copula} [default CORRELATION]
+#   designs         - {(Vehicle, range): (rProp, cruiseSpeed, mBattery, mMotors, mtom)} [default: nominal optimum]
+#   chunk_size      - samples per vectorized chunk [default 100000]
+#   processes       - worker processes [default 1]
+
+# Outputs:
+#   list of dicts (one per case) with Vehicle, range, design, DOC (samples),
+#   feasible (samples meeting c1 .. c4), mean, std, percentiles, feasibleFraction
+'''
+
+from __future__ import print_function
+
+import multiprocessing
+import time
+
+import numpy as np
+from scipy import special
+
+from vahana_batch import DEFAULT_ASSUMPTIONS, DEFAULT_PHYSICS, physics_batch, range_batch
+from design_optimizer import optimize_design, MODEL_CONSTRAINTS, FEASIBILITY_TOL
+from vehicle import vehicle_key
+
+# Default uncertainty of the hardcoded assumptions (nominal values in vahana_batch.DEFAULT_ASSUMPTIONS)
+DISTRIBUTIONS = {'batteryCost': ('triangular', 500.0, 700.0, 1000.0),  # [$ / kW-hr]
+                 'batteryLifeCycles': ('normal', 2000.0, 300.0),
+                 'motorLifeHours': ('normal', 6000.0, 1000.0),
+                 'insuranceRate': ('uniform', 0.05, 0.08),
+                 'electricityCost': ('lognormal', 0.12, 0.02),  # [$ / kW-hr]
+                 'etaMotor': ('triangular', 0.80, 0.85, 0.90),
+                 'wingProfileCD': ('triangular', 0.010, 0.012, 0.015)}
+
+# Cells with a longer cycle life cost more
+CORRELATION = {('batteryCost', 'batteryLifeCycles'): 0.5}
+
+PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+
+
+def _inverse_cdf(spec, u):
+    ''' Map uniform samples u to the distribution spec '''
+    kind, params = spec[0], [float(p) for p in spec[1:]]
+    if kind == 'constant':
+        return np.full(u.shape, params[0])
+    if kind == 'uniform':
+        lower, upper = params
+        return lower + u * (upper - lower)
+    if kind == 'triangular':
+        lower, mode, upper = params
+        split = (mode - lower) / (upper - lower)
+        return np.where(u < split, lower + np.sqrt(u * (upper - lower) * (mode - lower)),
+                        upper - np.sqrt((1.0 - u) * (upper - lower) * (upper - mode)))
+    if kind == 'normal':
+        mean, std = params
+        return mean + std * special.ndtri(u)
+    if kind == 'lognormal':
+        mean, std = params
+        sigma2 = np.log(1.0 + (std / mean) ** 2)
+        return np.exp(np.log(mean) - 0.5 * sigma2 + np.sqrt(sigma2) * special.ndtri(u))
+    raise ValueError('Unknown distribution: {}'.format(kind))
+
+
+def copula_factor(names, correlation):
+    ''' Cholesky factor of the copula correlation matrix over names '''
+    C = np.eye(len(names))
+    for (a, b), rho in correlation.items():
+        if a not in names or b not in names:
+            raise KeyError('Correlated assumption without a distribution: {}, {}'.format(a, b))
+        i, j = names.index(a), names.index(b)
+        C[i, j] = C[j, i] = rho
+    try:
+        return np.linalg.cholesky(C)
+    except np.linalg.LinAlgError:
+        raise ValueError('Correlation matrix is not positive definite')
+
+
+def draw_samples(distributions, correlation, n, seed=0, chunk=0):
+    ''' n correlated samples of every assumption, {assumption: (n,) array} '''
+    names = sorted(distributions)
+    unknown = set(names) - set(DEFAULT_ASSUMPTIONS)
+    if unknown:
+        raise TypeError('Unknown assumptions: {}'.format(', '.join(sorted(unknown))))
+    z = np.random.RandomState([seed, chunk]).standard_normal((n, len(names)))
+    u = special.ndtr(z.dot(copula_factor(names, correlation).T))
+    return dict((name, _inverse_cdf(distributions[name], u[:, i])) for i, name in enumerate(names))
+
+
+def _chunk_task(args):
+    Vehicle, range, design, distributions, correlation, seed, chunk, n = args
+    assumptions = draw_samples(distributions, correlation, n, seed, chunk)
+    physicsAssumptions = dict((k, v) for k, v in assumptions.items() if k in DEFAULT_PHYSICS)
+    economics = dict((k, v) for k, v in assumptions.items() if k not in DEFAULT_PHYSICS)
+
+    # Physics only needs one evaluation when just the economics are uncertain
+    if not physicsAssumptions:
+        design = [np.atleast_1d(x) for x in design]
+    physics = physics_batch(Vehicle, *design, **physicsAssumptions)
+    result = range_batch(physics, range, **economics)
+
+    columns = list(MODEL_CONSTRAINTS[vehicle_key(Vehicle)])
+    margins = np.broadcast_to(result['margins'], (n, result['margins'].shape[-1]))
+    ok = np.all(margins[:, columns] > -FEASIBILITY_TOL[columns], axis=1)
+    return np.broadcast_to(result['DOC'], (n,)), ok
+
+
+def summarize(DOC, ok):
+    ''' Statistics of a DOC sample '''
+    return {'mean': np.mean(DOC), 'std': np.std(DOC),
+            'percentiles': dict(zip(PERCENTILES, np.percentile(DOC, PERCENTILES))),
+            'feasibleFraction': np.mean(ok)}
+
+
+def monte_carlo_doc(cases, samples=1000000, distributions=DISTRIBUTIONS, correlation=CORRELATION, designs=None,
+                    chunk_size=100000, processes=1, seed=0, progress=False):
+    ''' DOC distribution of every (Vehicle, range) case, see the header for the returned dicts. '''
+    designs = dict(designs or {})
+    for Vehicle, range in cases:
+        if (Vehicle, range) not in designs:
+            designs[(Vehicle, range)] = optimize_design(Vehicle, range)['x']
+
+    tasks = []
+    for Vehicle, range in cases:
+        for chunk, start in enumerate(np.arange(0, samples, chunk_size)):
+            tasks.append((Vehicle, range, designs[(Vehicle, range)], distributions, correlation, seed, chunk,
+                          min(chunk_size, samples - start)))
+
+    DOC = dict((case, []) for case in cases)
+    ok = dict((case, []) for case in cases)
+    start = time.time()
+
+    pool = multiprocessing.Pool(processes) if processes > 1 else None
+    try:
+        results = pool.imap(_chunk_task, tasks) if pool is not None else (_chunk_task(t) for t in tasks)
+        for done, (task, (chunkDOC, chunkOk)) in enumerate(zip(tasks, results)):
+            DOC[task[:2]].append(chunkDOC)
+            ok[task[:2]].append(chunkOk)
+            if progress:
+                print('{} of {} chunks, {:.1f} s'.format(done + 1, len(tasks), time.time() - start))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    out = []
+    for Vehicle, range in cases:
+        caseDOC = np.concatenate(DOC[(Vehicle, range)])
+        caseOk = np.concatenate(ok[(Vehicle, range)])
+        summary = summarize(caseDOC, caseOk)
+        summary.update(Vehicle=Vehicle, range=range, design=designs[(Vehicle, range)], DOC=caseDOC,
+                       feasible=caseOk)
+        out.append(summary)
+    return out
+
+
+if __name__ == "__main__":
+    # Sample Inputs: both vehicles at 50 km and 100 km
+    cases = [(u'tiltwing', 50000.0), (u'tiltwing', 100000.0), (u'helicopter', 50000.0), (u'helicopter', 100000.0)]
+    start = time.time()
+    results = monte_carlo_doc(cases, samples=1000000, processes=2)
+    seconds = time.time() - start
+    for r in results:
+        print('{} {:.0f} km: DOC ($) mean {:.2f}, std {:.2f}, 5% {:.2f}, 50% {:.2f}, 95% {:.2f}, feasible {:.1%}'.format(
+            r['Vehicle'], r['range'] / 1000.0, r['mean'], r['std'], r['percentiles'][5.0], r['percentiles'][50.0],
+            r['percentiles'][95.0], r['feasibleFraction']))
+    print('{} samples in {:.1f} s'.format(len(cases) * 1000000, seconds))
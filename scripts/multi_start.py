@@ -0,0 +1,161 @@
+'''
+# Name: multi_start.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Parallel multi-start DOC optimization with early pruning
+
+# COBYLA from the single hardcoded start (indep2 .. indep6 of the optimizers)
+# can stop in a poor local optimum, which is what the different scalings of the
+# test/vahana_optimizer_scaled_*.py scripts were trying to work around. Here
+# every range point is optimized (design_optimizer.py) from the hardcoded start
+# plus a Latin hypercube of starts over the design variable bounds. All
+# (range, start) runs go through one process pool in stages: after each stage
+# of `stages` COBYLA iterations the starts that are clearly dominated are pruned
+#   - DOC more than `prune` (relative) above the best feasible DOC of the range
+#   - infeasible with a DOC no better than the best feasible DOC
+#   - within `spacing` of a better start (same basin)
+# and the survivors continue warm started, the last stage to convergence.
+
+# Inputs:
+#   Vehicle     - 'tiltwing' or 'helicopter'
+#   ranges      - mission ranges [m]
+#   starts      - starts per range, including the hardcoded one [default 8]
+#   stages      - COBYLA iterations before each pruning pass [default STAGES]
+#   prune       - relative DOC margin of the pruning [default 0.05]
+#   spacing     - distance of duplicate starts in optimizer units (max norm) [default 0.05]
+#   bounds      - start bounds in optimizer units [default design_optimizer.DESIGN_BOUNDS]
+#   processes   - worker processes [default 1]
+#   assumptions - "What If" inputs of vahana_batch.py (scalars)
+
+# Outputs:
+#   list of dicts (one per range) with best (optimize_design result of the cheapest feasible
+#   start, or the cheapest start if none is feasible), starts (x0, DOC, feasible, nfev,
+#   pruned: None or (stage, reason)), spread (statistics of the converged starts)
+#   and evaluations (model evaluations)
+'''
+
+from __future__ import print_function
+
+import multiprocessing
+
+import numpy as np
+
+from design_grid import latin_hypercube
+from design_optimizer import DESIGN_BOUNDS, DESIGN_START, optimize_cases
+from vehicle import vehicle_key
+
+# COBYLA iterations before each pruning pass, the survivors then run to convergence
+STAGES = (50, 200)
+
+# Relative DOC difference below which two converged starts count as the same optimum
+SAME_OPTIMUM = 1e-3
+
+
+def start_points(Vehicle, starts, seed=0, bounds=None):
+    ''' The hardcoded start and starts - 1 Latin hypercube points in optimizer units, (starts, 5) array '''
+    bounds = np.array(DESIGN_BOUNDS[vehicle_key(Vehicle)] if bounds is None else bounds, dtype=float)
+    unit = latin_hypercube(starts - 1, len(bounds), seed)
+    return np.vstack((DESIGN_START[vehicle_key(Vehicle)], bounds[:, 0] + unit * (bounds[:, 1] - bounds[:, 0])))
+
+
+def prune_starts(results, prune=0.05, spacing=0.05):
+    ''' Pruning reason (or None) of every optimize_design result of one range point '''
+    DOC = np.array([r['DOC'] for r in results])
+    feasible = np.array([r['feasible'] for r in results])
+    bestFeasible = np.min(DOC[feasible]) if np.any(feasible) else np.inf
+    reasons = [None] * len(results)
+    kept = []
+    # Best first (feasible before infeasible), so duplicates are pruned in favour of the better start
+    for i in np.lexsort((DOC, ~feasible)):
+        if not np.isfinite(DOC[i]):
+            reasons[i] = 'model failure'
+        elif DOC[i] > bestFeasible + prune * abs(bestFeasible):
+            reasons[i] = 'dominated'
+        elif not feasible[i] and DOC[i] >= bestFeasible:
+            reasons[i] = 'infeasible, dominated'
+        elif any(np.max(np.abs(results[i]['xScaled'] - results[j]['xScaled'])) <= spacing for j in kept):
+            reasons[i] = 'duplicate'
+        else:
+            kept.append(i)
+    return reasons
+
+
+def spread_statistics(results):
+    ''' Spread of the DOC over the converged starts of one range point '''
+    DOC = np.array([r['DOC'] for r in results if r['feasible']])
+    stats = {'converged': len(results), 'feasible': len(DOC)}
+    if len(DOC):
+        best = np.min(DOC)
+        stats.update(min=best, median=np.median(DOC), max=np.max(DOC), std=np.std(DOC),
+                     hitRate=np.mean(DOC <= best + SAME_OPTIMUM * abs(best)),
+                     optima=len(np.unique(np.round((DOC - best) / (SAME_OPTIMUM * abs(best))))))
+    return stats
+
+
+def multi_start(Vehicle, ranges, starts=8, stages=STAGES, prune=0.05, spacing=0.05, bounds=None, seed=0, tol=0.01,
+                battery_fraction=None, processes=1, progress=False, **assumptions):
+    ''' Multi-start optimization of every range point, see the header for the returned dicts. '''
+    ranges = [float(r) for r in np.atleast_1d(ranges)]
+    x0 = start_points(Vehicle, starts, seed, bounds)
+    # runs[(range index, start index)] = latest optimize_design result
+    runs = {}
+    pruned = {}
+    evaluations = {}
+    active = [(k, s) for k in np.arange(len(ranges)) for s in np.arange(starts)]
+
+    pool = multiprocessing.Pool(processes) if processes > 1 else None
+    try:
+        for stage, maxiter in enumerate(tuple(stages) + (None,)):
+            cases = []
+            for key in active:
+                last = runs.get(key)
+                # Warm restart with a trust region of the size of the last stage's progress
+                start = x0[key[1]] if last is None else last['xScaled']
+                moved = 1.0 if last is None else np.max(np.abs(last['xScaled'] - last['x0Scaled']))
+                cases.append({'Vehicle': Vehicle, 'range': ranges[key[0]], 'x0': start, 'tol': tol,
+                              'maxiter': maxiter, 'rhobeg': float(np.clip(moved, 10.0 * tol, 1.0)),
+                              'battery_fraction': battery_fraction, 'assumptions': assumptions})
+            for key, case, opt in zip(active, cases, optimize_cases(cases, processes, pool)):
+                opt['x0Scaled'] = case['x0']
+                evaluations[key] = evaluations.get(key, 0) + opt['nfev']
+                runs[key] = opt
+
+            if maxiter is not None:
+                for k in np.arange(len(ranges)):
+                    keys = [key for key in active if key[0] == k]
+                    for key, reason in zip(keys, prune_starts([runs[key] for key in keys], prune, spacing)):
+                        if reason is not None:
+                            pruned[key] = (stage, reason)
+                active = [key for key in active if key not in pruned]
+            if progress:
+                print('Stage {}: {} runs, {} pruned, {} model evaluations'.format(
+                    stage, len(cases), len(pruned), sum(evaluations.values())))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    out = []
+    for k, r in enumerate(ranges):
+        keys = [(k, s) for s in np.arange(starts)]
+        finished = [runs[key] for key in keys if key not in pruned]
+        candidates = [opt for opt in finished if opt['feasible']] or finished or [runs[key] for key in keys]
+        out.append({'Vehicle': Vehicle, 'range': r, 'best': min(candidates, key=lambda opt: opt['DOC']),
+                    'starts': [{'x0': x0[key[1]], 'DOC': runs[key]['DOC'], 'feasible': runs[key]['feasible'],
+                                'nfev': evaluations[key], 'pruned': pruned.get(key)} for key in keys],
+                    'spread': spread_statistics(finished), 'evaluations': sum(evaluations[key] for key in keys)})
+    return out
+
+
+if __name__ == "__main__":
+    # Sample Inputs: helicopter at the ranges of vahana_optimizer_scaled_helicopter.py, 8 starts per range
+    for result in multi_start(u'helicopter', np.linspace(10000.0, 100000.0, 4), starts=8, processes=2):
+        best, spread = result['best'], result['spread']
+        print('Range (km): {}, DOC ($): {:.4f}, feasible: {}, design: {}'.format(
+            result['range'] / 1000.0, best['DOC'], best['feasible'], np.round(best['x'], 3)))
+        print('  {} of {} starts converged, {} feasible, {} distinct optima, DOC spread ($): {:.4f} - {:.4f}, '
+              '{} model evaluations'.format(spread['converged'], len(result['starts']), spread['feasible'],
+                                            spread.get('optima', 0), spread.get('min', np.nan),
+                                            spread.get('max', np.nan), result['evaluations']))
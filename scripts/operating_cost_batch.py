@@ -0,0 +1,214 @@
+'''
+# Name: operating_cost_batch.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Vectorized version of operating_cost.py / operating_cost_what_if.py
+
+# Estimate direct operating costs per flight including: acquisition cost,
+# insurance cost, operating facility cost, energy cost, and maintenance for
+# arrays of design points at once. Every cost item of operating_cost.py is
+# returned as one field of a NumPy structured array, so per-item DOC
+# breakdowns for an entire sweep come out of a single call.
+
+# Inputs (scalars or arrays that broadcast to a common length N):
+#   Vehicle          - vehicle type ('tiltwing' or 'helicopter'), string or array of strings
+#   rProp            - propeller or rotor radius [m]
+#   flightTime       - flight time for nominal flight [sec]
+#   E                - energy use for flight [kW-hr]
+#   mass_structural  - structural mass [kg]
+#   mass_battery     - battery mass [kg]
+#   mass_motors      - motor mass [kg]
+#   toolingCost      - tooling cost per vehicle [$]
+
+# "What If" Inputs (optional, default to the operating_cost.py assumptions):
+#   batteryEnergyDensity    - battery energy density [W-hr / kg]
+#   batteryCost             - battery cost [$ / kW-hr]
+#   batteryLifeCycles       - battery life cycles
+#   motorCost               - motor cost [$ / kg]
+#   motorLifeHours          - motor life [hr]
+#   electricityCost         - electricity cost [$ / kW-hr]
+#   flightHoursPerYear      - flight hours per year [hr / yr]
+#   vehicleLifeYears        - vehicle life [yr]
+#   insuranceRate           - yearly insurance cost as a fraction of acquisition cost
+#   humanCostPerHour        - maintenance labor rate [$ / hr]
+
+# Outputs:
+#   costs            - structured array of shape (N,) with one float64 field per COST_ITEMS entry
+'''
+
+from __future__ import print_function
+
+import numpy as np
+
+from vehicle import vehicle_masks
+
+# Cost items in the order operating_cost.py computes them
+COST_ITEMS = ('C_flightHoursPerYear',
+              'C_flightsPerYear',
+              'C_vehicleLifeYears',
+              'C_nVehiclesPerFacility',
+              'C_toolCostPerVehicle',
+              'C_materialCostPerKg',
+              'C_materialCost',
+              'C_batteryCostPerKg',
+              'C_batteryCost',
+              'C_motorCostPerKg',
+              'C_motorCost',
+              'C_servoCost',
+              'C_avionicsCost',
+              'C_BRSCost',
+              'C_acquisitionCost',
+              'C_acquisitionCostPerFlight',
+              'C_insuranceCostPerYear',
+              'C_insuranceCostPerFlight',
+              'C_vehicleFootprint',
+              'C_areaCost',
+              'C_facilityCostPerYear',
+              'C_facilityCostPerFlightHour',
+              'C_facilityCostPerFlight',
+              'C_energyCostPerFlight',
+              'C_battLifeCycles',
+              'C_batteryReplCostPerFlight',
+              'C_motorLifeHrs',
+              'C_motorReplCostPerFlight',
+              'C_servoLifeHrs',
+              'C_servoReplCostPerFlight',
+              'C_humanCostPerHour',
+              'C_manHrPerFlightHour',
+              'C_manHrPerFlight',
+              'C_laborCostPerFlight',
+              'C_costPerFlight')
+
+cost_dtype = np.dtype([(name, np.float64) for name in COST_ITEMS])
+
+# Economic assumptions of operating_cost.py
+DEFAULT_ECONOMICS = {'batteryEnergyDensity': 230.0,  # [W-hr / kg]
+                     'batteryCost': 700.0,  # [$ / kW-hr], 700 * 230 / 1000 = $161 / kg
+                     'batteryLifeCycles': 2000.0,
+                     'motorCost': 150.0,  # [$ / kg]
+                     'motorLifeHours': 6000.0,
+                     'electricityCost': 0.12,  # [$ / kW-hr]
+                     'flightHoursPerYear': 600.0,
+                     'vehicleLifeYears': 10.0,
+                     'insuranceRate': 0.065,
+                     'humanCostPerHour': 60.0}
+
+ECONOMICS = tuple(sorted(DEFAULT_ECONOMICS))
+
+
+def operating_cost_batch(Vehicle, rProp, flightTime, E, mass_structural, mass_battery, mass_motors,
+                         toolingCost, **economics):
+    ''' Return the operating cost breakdown of N design points as a structured array. '''
+    unknown = set(economics) - set(DEFAULT_ECONOMICS)
+    if unknown:
+        raise TypeError('Unknown economic assumptions: {}'.format(', '.join(sorted(unknown))))
+    econ = dict(DEFAULT_ECONOMICS)
+    econ.update((k, v) for k, v in economics.items() if v is not None)
+
+    arrays = np.broadcast_arrays(*[np.asarray(a, dtype=float) for a in
+                                   [rProp, flightTime, E, mass_structural, mass_battery, mass_motors, toolingCost] +
+                                   [econ[k] for k in ECONOMICS]])
+    arrays = [np.ravel(a) for a in arrays]
+    rProp, flightTime, E, mass_structural, mass_battery, mass_motors, toolingCost = arrays[:7]
+    econ = dict(zip(ECONOMICS, arrays[7:]))
+    n = rProp.size
+    isTiltwing, isHelicopter = vehicle_masks(Vehicle, n)
+
+    C = np.empty(n, dtype=cost_dtype)
+
+    # Assumptions
+    C['C_flightHoursPerYear'] = econ['flightHoursPerYear']
+    C['C_flightsPerYear'] = C['C_flightHoursPerYear'] / (flightTime/3600)
+    C['C_vehicleLifeYears'] = econ['vehicleLifeYears']
+    C['C_nVehiclesPerFacility'] = 200  # Size of storage depot
+
+    # Tooling cost
+    C['C_toolCostPerVehicle'] = toolingCost
+
+    # Material cost
+    C['C_materialCostPerKg'] = 220.0  # Material plus assmebly cost
+    C['C_materialCost'] = C['C_materialCostPerKg'] * mass_structural
+
+    # Battery cost per kg
+    C['C_batteryCostPerKg'] = econ['batteryCost'] * econ['batteryEnergyDensity'] * 0.001
+    C['C_batteryCost'] = C['C_batteryCostPerKg'] * mass_battery
+
+    # Motor cost per kg
+    C['C_motorCostPerKg'] = econ['motorCost']  # Approx $1500 for 10 kg motor? + controller
+    C['C_motorCost'] = C['C_motorCostPerKg'] * mass_motors
+
+    # Servo cost: 8 props, 4 surfaces, 2 tilt (tiltwing) or cyclic (2x) / collective,
+    # tail rotor w/ redundancy (helicopter). Estimate $800 per servo in large quantities
+    C['C_servoCost'] = np.where(isTiltwing, 14, 8) * 800
+
+    # Avionics cost
+    C['C_avionicsCost'] = 30000.0  # guess for all sensors and computers in large quantities
+
+    # BRS cost
+    C['C_BRSCost'] = np.where(isTiltwing, 5200.0, 0.0)
+
+    # Total aquisition cost
+    C['C_acquisitionCost'] = C['C_batteryCost'] + C['C_motorCost'] + C['C_servoCost'] + \
+        C['C_avionicsCost'] + C['C_BRSCost'] + C['C_materialCost'] + C['C_toolCostPerVehicle']
+    C['C_acquisitionCostPerFlight'] = C['C_acquisitionCost'] / (C['C_flightsPerYear'] * C['C_vehicleLifeYears'])
+
+    # Insurance cost
+    # Follow R22 for estimate of 6.5% of acquisition cost
+    C['C_insuranceCostPerYear'] = C['C_acquisitionCost'] * econ['insuranceRate']
+    C['C_insuranceCostPerFlight'] = C['C_insuranceCostPerYear'] / C['C_flightsPerYear']
+
+    # Facility rental cost, m^2, 20% for movement around aircraft for maintenance, etc.
+    C['C_vehicleFootprint'] = np.where(isTiltwing,
+                                       1.2 * (8 * rProp + 1) * (4 * rProp + 3),
+                                       1.2 * (2 * rProp)**2)
+
+    C['C_areaCost'] = 10.7639 * 2 * 12  # $/m^2, $2/ft^2 per month assumed
+
+    # Facility cost = Vehicle footprint + 10x footprint for operations,
+    # averaged over # of vehicles at each facility
+    C['C_facilityCostPerYear'] = (C['C_vehicleFootprint'] + 10 * C['C_vehicleFootprint'] / C['C_nVehiclesPerFacility']) * C['C_areaCost']
+    C['C_facilityCostPerFlightHour'] = C['C_facilityCostPerYear'] / C['C_flightHoursPerYear']
+    C['C_facilityCostPerFlight'] = C['C_facilityCostPerFlightHour'] * flightTime / 3600
+
+    # Electricity cost
+    # E * $/kWhr including 90% charging efficiency
+    C['C_energyCostPerFlight'] = econ['electricityCost'] * E / 0.9
+
+    # Battery replacement cost
+    C['C_battLifeCycles'] = econ['batteryLifeCycles']
+    C['C_batteryReplCostPerFlight'] = C['C_batteryCost'] / C['C_battLifeCycles']  # 1 cycle per flight
+
+    # Motor replacement cost
+    C['C_motorLifeHrs'] = econ['motorLifeHours']
+    C['C_motorReplCostPerFlight'] = flightTime / 3600 / C['C_motorLifeHrs'] * C['C_motorCost']
+
+    # Servo replacement cost
+    C['C_servoLifeHrs'] = 6000.0
+    C['C_servoReplCostPerFlight'] = flightTime / 3600 / C['C_servoLifeHrs'] * C['C_servoCost']
+
+    # Maintenance cost: periodic maintenance estimate per flight hour plus
+    # inspection, battery swap estimate per flight
+    C['C_humanCostPerHour'] = econ['humanCostPerHour']
+    C['C_manHrPerFlightHour'] = np.where(isTiltwing, 0.10, 0.05)
+    C['C_manHrPerFlight'] = 0.2
+
+    C['C_laborCostPerFlight'] = (C['C_manHrPerFlightHour'] * flightTime / 3600.0 + C['C_manHrPerFlight']) * C['C_humanCostPerHour']
+
+    # Cost per flight
+    C['C_costPerFlight'] = C['C_acquisitionCostPerFlight'] + C['C_insuranceCostPerFlight'] + C['C_facilityCostPerFlight'] + \
+        C['C_energyCostPerFlight'] + C['C_batteryReplCostPerFlight'] + C['C_motorReplCostPerFlight'] + \
+        C['C_servoReplCostPerFlight'] + C['C_laborCostPerFlight']
+
+    return C
+
+
+if __name__ == "__main__":
+    # Sample Inputs: DOC breakdown of one tiltwing design over a sweep of electricity costs
+    costs = operating_cost_batch(u'tiltwing', 1.4, 500.0, 150.0, 200.0, 800.0, 400.0, 12000.0,
+                                 electricityCost=np.linspace(0.08, 0.20, 4))
+
+    for row in costs:
+        print("energyCostPerFlight:", row['C_energyCostPerFlight'],
+              "OperatingCost:", row['C_costPerFlight'])
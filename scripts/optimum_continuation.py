@@ -0,0 +1,149 @@
+'''
+# Name: optimum_continuation.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Predictor-corrector continuation of the DOC optimum along range
+
+# Traces the optimum of design_optimizer.py as a function of range instead of
+# running independent optimizations at fixed range levels:
+#   - predictor: extrapolate the optimum along the secant tangent of the last step
+#   - corrector: warm-started COBYLA with a trust region sized to the prediction
+#   - step control: grow the step on smooth stretches (small predictor error),
+#     shrink and retry when the prediction is poor or the corrector stalls, and
+#     bisect down to min_step where the active constraint set or the feasibility
+#     changes (the kinks of the DOC curve, e.g. where a design variable bound
+#     becomes active)
+# Every point also gets dDOC*/drange from the active constraint multipliers
+# (post_optimal_sensitivity.py), so the curve is interpolated with cubic Hermite
+# segments between points.
+
+# Inputs:
+#   Vehicle     - 'tiltwing' or 'helicopter'
+#   start, stop - range interval [m]
+#   step        - initial step [default (stop - start) / 20]
+#   min_step    - resolution of the active set switches [m] [default 1000]
+#   max_step    - [m] [default (stop - start) / 4]
+#   step_tol    - target relative predictor error of the design [default 0.02]
+#   tol         - COBYLA tol of the corrector [default 1e-3]
+#   stop_infeasible - stop at the first infeasible optimum after a feasible one, i.e. at the
+#                 maximum feasible range (within min_step) [default True]
+
+# Outputs:
+#   dict with points (range, x, xScaled, DOC, dDOCdRange, active, feasible, evaluations),
+#   switches (range interval, active sets and feasibility before / after), evaluations (model evaluations
+#   including the derivatives), rejected (steps)
+'''
+
+from __future__ import print_function
+
+import numpy as np
+
+from design_optimizer import active_set, constraint_names, evaluate_scaled, gradients, optimize_design
+
+# Relative finite difference step of the range derivative
+RANGE_STEP = 1e-5
+
+
+def optimum_point(opt, **assumptions):
+    ''' Add the active set and dDOC*/drange (envelope theorem) to an optimize_design result '''
+    Vehicle, range, x = opt['Vehicle'], opt['range'], opt['xScaled']
+    fraction = opt.get('batteryFraction')
+    gradDOC, J = gradients(Vehicle, range, x, fraction, **assumptions)
+    g = evaluate_scaled(Vehicle, range, x, fraction, **assumptions)[1][0]
+    active, lam, residual = active_set(gradDOC, J, g)
+    step = RANGE_STEP * max(1.0, range)
+    fp, Gp = evaluate_scaled(Vehicle, range + step, x, fraction, **assumptions)
+    fm, Gm = evaluate_scaled(Vehicle, range - step, x, fraction, **assumptions)
+    names = constraint_names(Vehicle, fraction)
+    return {'range': range, 'x': opt['x'], 'xScaled': x, 'DOC': opt['DOC'],
+            'dDOCdRange': (fp[0] - fm[0] - lam.dot(Gp[0] - Gm[0])) / (2.0 * step),
+            'active': tuple(names[i] for i in active), 'feasible': opt['feasible'],
+            'evaluations': opt['nfev'] + 2 * len(x) + 3}
+
+
+def trace_optimum(Vehicle, start, stop, step=None, min_step=1000.0, max_step=None, step_tol=0.02, tol=1e-3,
+                  maxiter=300, stop_infeasible=True, **assumptions):
+    ''' Trace the DOC optimum from start to stop, see the header for the returned dict. '''
+    step = (stop - start) / 20.0 if step is None else step
+    max_step = (stop - start) / 4.0 if max_step is None else max_step
+
+    # Cold start as in the OpenMDAO driver, then tighten to the corrector tolerance
+    opt = optimize_design(Vehicle, start, **assumptions)
+    evaluations = opt['nfev']
+    opt = optimize_design(Vehicle, start, x0=opt['xScaled'], tol=tol, rhobeg=0.1, **assumptions)
+    points = [optimum_point(opt, **assumptions)]
+    evaluations += points[-1]['evaluations']
+    switches = []
+    rejected = 0
+    tangent = None
+
+    while points[-1]['range'] < stop:
+        last = points[-1]
+        h = min(step, stop - last['range'])
+        x0 = last['xScaled']
+        xPredicted = x0 + tangent * h if tangent is not None else x0
+        # Without a tangent the change of the design is unknown, start from the default trust region
+        rhobeg = max(10.0 * tol, min(1.0, np.max(np.abs(xPredicted - x0)))) if tangent is not None else 1.0
+
+        opt = optimize_design(Vehicle, last['range'] + h, x0=xPredicted, tol=tol, maxiter=maxiter, rhobeg=rhobeg,
+                              **assumptions)
+        point = optimum_point(opt, **assumptions)
+        evaluations += point['evaluations']
+        error = np.max(np.abs(point['xScaled'] - xPredicted) / np.maximum(1.0, np.abs(point['xScaled'])))
+        switched = point['active'] != last['active'] or point['feasible'] != last['feasible']
+        poor = tangent is not None and error > 2.0 * step_tol
+        stalled = opt['nfev'] >= maxiter
+
+        if (switched or poor or stalled) and h > min_step:
+            # Refine: retry with a smaller step (bisects towards an active set switch)
+            rejected += 1
+            step = max(min_step, 0.5 * h)
+            continue
+
+        points.append(point)
+        if switched:
+            switches.append({'range': (last['range'], point['range']), 'before': last['active'],
+                             'after': point['active'], 'feasible': (last['feasible'], point['feasible'])})
+            # The secant across a kink is not a tangent of either branch
+            tangent = None
+            step = min_step
+            if stop_infeasible and last['feasible'] and not point['feasible']:
+                break
+        else:
+            tangent = (point['xScaled'] - x0) / h
+            factor = 2.0 if error == 0.0 else min(2.0, max(0.5, 0.9 * np.sqrt(step_tol / error)))
+            step = min(max_step, max(min_step, factor * h))
+
+    return {'Vehicle': Vehicle, 'points': points, 'switches': switches, 'evaluations': evaluations,
+            'rejected': rejected}
+
+
+def interpolate_doc(curve, ranges):
+    ''' Cubic Hermite interpolation of the traced DOC curve (uses dDOC*/drange) '''
+    r = np.array([p['range'] for p in curve['points']])
+    f = np.array([p['DOC'] for p in curve['points']])
+    d = np.array([p['dDOCdRange'] for p in curve['points']])
+    ranges = np.asarray(ranges, dtype=float)
+    i = np.clip(np.searchsorted(r, ranges) - 1, 0, len(r) - 2)
+    h = r[i + 1] - r[i]
+    t = (ranges - r[i]) / h
+    return ((2 * t ** 3 - 3 * t ** 2 + 1) * f[i] + (t ** 3 - 2 * t ** 2 + t) * h * d[i] +
+            (-2 * t ** 3 + 3 * t ** 2) * f[i + 1] + (t ** 3 - t ** 2) * h * d[i + 1])
+
+
+if __name__ == "__main__":
+    # Sample Inputs: the 10 - 200 km range of vahana_optimizer.py, compared with its 20 level sweep
+    for Vehicle in (u'tiltwing', u'helicopter'):
+        curve = trace_optimum(Vehicle, 10000.0, 200000.0)
+        for p in curve['points']:
+            print('Range (km): {:.1f}, DOC ($): {:.4f}, dDOC/dRange ($/km): {:.4f}, feasible: {}, active: {}'.format(
+                p['range'] / 1000.0, p['DOC'], p['dDOCdRange'] * 1000.0, p['feasible'], ', '.join(p['active'])))
+        for s in curve['switches']:
+            print('Switch between {:.1f} and {:.1f} km: {} -> {}, feasible: {} -> {}'.format(
+                s['range'][0] / 1000.0, s['range'][1] / 1000.0, ', '.join(s['before']), ', '.join(s['after']),
+                *s['feasible']))
+        sweep = sum(optimize_design(Vehicle, r)['nfev'] for r in np.linspace(10000.0, 200000.0, 20))
+        print('{}: {} points, {} model evaluations (20 level sweep: {})'.format(
+            Vehicle, len(curve['points']), curve['evaluations'], sweep))
@@ -0,0 +1,64 @@
+'''
+# Name: penalty_optimizer.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# ScipyOptimizer that survives model failures (AnalysisError) of the optimizer scripts
+
+# PenaltyScipyOptimizer catches AnalysisError (see analysis_errors.py) during an
+# iteration and reports the point to the optimizer as infeasible with a large
+# penalty (objective PENALTY, every constraint -PENALTY) instead of stopping the
+# sub-problem, keeps a list of the failed points, and leaves the model at the
+# last point it could analyze. Kept out of analysis_errors.py, which every
+# component imports, because the scipy drivers are slow to load.
+
+# Inputs:
+#   same options as ScipyOptimizer
+
+# Outputs:
+#   PenaltyScipyOptimizer.failures - list of (iteration, design vector, message)
+'''
+
+from __future__ import print_function
+
+import numpy as np
+
+from openmdao.drivers.scipy_optimizer import ScipyOptimizer
+
+from analysis_errors import PENALTY, AnalysisError
+
+
+class PenaltyScipyOptimizer(ScipyOptimizer):
+    ''' ScipyOptimizer treating points whose model raises AnalysisError as infeasible with a large penalty '''
+
+    def __init__(self):
+        super(PenaltyScipyOptimizer, self).__init__()
+        self.failures = []
+        self._failed = False
+        self._good = None
+
+    def run(self, problem):
+        self.failures = []
+        self._failed = False
+        self._good = None
+        super(PenaltyScipyOptimizer, self).run(problem)
+        if self._failed and self._good is not None:
+            # Leave the model at the last point it could analyze, not at a failed one
+            self._objfunc(self._good)
+
+    def _objfunc(self, x_new):
+        try:
+            f_new = super(PenaltyScipyOptimizer, self)._objfunc(x_new)
+        except AnalysisError as err:
+            self._failed = True
+            self.failures.append((self.iter_count, np.array(x_new), str(err)))
+            return PENALTY
+        self._failed = False
+        self._good = np.array(x_new)
+        return f_new
+
+    def _confunc(self, x_new, name, idx):
+        if self._failed:
+            return -PENALTY
+        return super(PenaltyScipyOptimizer, self)._confunc(x_new, name, idx)
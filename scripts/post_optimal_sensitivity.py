@@ -0,0 +1,159 @@
+'''
+# Name: post_optimal_sensitivity.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Post-optimal sensitivity of the DOC optimum to the "What If" assumptions
+
+# Instead of re-running the nested optimization for every what-if (e.g. battery
+# energy density 230 -> 260 W-hr / kg, or the 230 W-hr / kg and 5 kW / kg
+# constants of con1 / con2), the optimum of design_optimizer.py is differentiated
+# with respect to the assumptions:
+#   - multipliers lambda >= 0 of the active constraints (design variable bounds,
+#     c1 .. c4 and the battery fraction) from grad DOC = J_active^T lambda
+#     (non-negative least squares, design_optimizer.active_set)
+#   - dDOC*/dp = dDOC/dp - lambda^T dg_active/dp (envelope theorem)
+#   - dx*/dp from the linearized KKT conditions (Hessian of the Lagrangian)
+# All derivatives are central finite differences, evaluated as single batches
+# on the vectorized model (vahana_batch.py). The first-order prediction for one
+# parameter is spot-checked against a warm-started re-optimization.
+
+# Inputs:
+#   Vehicle     - 'tiltwing' or 'helicopter'
+#   ranges      - mission ranges [m]
+#   battery_fraction - optional maximum battery mass fraction (as design_optimizer.optimize_design)
+#   parameters  - assumptions to differentiate [default PARAMETERS]
+#   deltas      - {assumption: change} for the predicted shifts [default 10 % of nominal,
+#                 batteryEnergyDensity 230 -> 260]
+#   check       - assumption to spot-check by re-optimization [default 'batteryEnergyDensity']
+#   processes   - worker processes over the range points [default 1]
+
+# Outputs:
+#   list of dicts (one per range) with x, DOC, active (constraint names), multipliers,
+#   kktResidual, dDOC and dx ({assumption: value}), predicted ({assumption: (delta, dDOC, dx)})
+#   and spotCheck (parameter, delta, predicted and actual DOC / design change)
+'''
+
+from __future__ import print_function
+
+import itertools
+import multiprocessing
+
+import numpy as np
+
+from vahana_batch import DEFAULT_ASSUMPTIONS
+from design_optimizer import active_set, constraint_names, evaluate_scaled, gradients, to_design, optimize_design
+
+PARAMETERS = ('batteryEnergyDensity', 'motorPowerDensity', 'batteryCost', 'batteryLifeCycles', 'motorCost',
+              'motorLifeHours', 'electricityCost', 'flightHoursPerYear', 'vehicleLifeYears', 'insuranceRate',
+              'etaMotor', 'rotorTipMaxMachNumber', 'wingProfileCD')
+
+DELTAS = {'batteryEnergyDensity': 30.0}  # 230 -> 260 W-hr / kg
+
+# Relative finite difference steps for the Hessian and the parameters
+HESSIAN_STEP = 1e-4
+PARAMETER_STEP = 1e-5
+
+
+def lagrangian_hessian(Vehicle, range, x, weights, battery_fraction=None, **assumptions):
+    ''' Central difference Hessian of DOC - weights^T g at x '''
+    n = len(x)
+    h = HESSIAN_STEP * np.maximum(1.0, np.abs(x))
+    E = np.diag(h)
+    X = np.array([x + si * E[j] + sk * E[k] for j, k in itertools.product(np.arange(n), repeat=2)
+                  for si, sk in ((1, 1), (1, -1), (-1, 1), (-1, -1))])
+    f, G = evaluate_scaled(Vehicle, range, X, battery_fraction, **assumptions)
+    L = (f - G.dot(weights)).reshape(n, n, 4)
+    H = (L[:, :, 0] - L[:, :, 1] - L[:, :, 2] + L[:, :, 3]) / (4.0 * np.outer(h, h))
+    return 0.5 * (H + H.T)
+
+
+def post_optimal_sensitivity(opt, parameters=PARAMETERS, deltas=None):
+    ''' Sensitivities of an optimize_design result, see the header for the returned dict. '''
+    Vehicle, range, x = opt['Vehicle'], opt['range'], np.asarray(opt['xScaled'], dtype=float)
+    base = dict(DEFAULT_ASSUMPTIONS)
+    base.update(opt['assumptions'])
+    fraction = opt.get('batteryFraction')
+    names = constraint_names(Vehicle, fraction)
+
+    gradDOC, J = gradients(Vehicle, range, x, fraction, **base)
+    g = evaluate_scaled(Vehicle, range, x, fraction, **base)[1][0]
+    active, lam, residual = active_set(gradDOC, J, g)
+    H = lagrangian_hessian(Vehicle, range, x, lam, fraction, **base)
+    JA = J[active]
+    n, m = len(x), len(active)
+    K = np.vstack((np.hstack((H, -JA.T)), np.hstack((JA, np.zeros((m, m))))))
+
+    dDOC = {}
+    dx = {}
+    for p in parameters:
+        step = PARAMETER_STEP * max(1.0, abs(base[p]))
+        fp, Gp = evaluate_scaled(Vehicle, range, x, fraction, **dict(base, **{p: base[p] + step}))
+        fm, Gm = evaluate_scaled(Vehicle, range, x, fraction, **dict(base, **{p: base[p] - step}))
+        dfdp = (fp[0] - fm[0]) / (2.0 * step)
+        dgdp = (Gp[0] - Gm[0]) / (2.0 * step)
+        dDOC[p] = dfdp - lam.dot(dgdp)
+
+        gradPlus, JPlus = gradients(Vehicle, range, x, fraction, **dict(base, **{p: base[p] + step}))
+        gradMinus, JMinus = gradients(Vehicle, range, x, fraction, **dict(base, **{p: base[p] - step}))
+        dGradL = ((gradPlus - JPlus.T.dot(lam)) - (gradMinus - JMinus.T.dot(lam))) / (2.0 * step)
+        solution = np.linalg.lstsq(K, -np.concatenate((dGradL, dgdp[active])), rcond=None)[0]
+        dx[p] = to_design(Vehicle, solution[:n])
+
+    deltas = dict([(p, 0.1 * base[p]) for p in parameters] + list(DELTAS.items()) + list((deltas or {}).items()))
+    predicted = dict((p, (deltas[p], dDOC[p] * deltas[p], dx[p] * deltas[p])) for p in parameters)
+
+    return {'Vehicle': Vehicle, 'range': range, 'x': opt['x'], 'DOC': opt['DOC'],
+            'active': [names[i] for i in active], 'multipliers': dict((names[i], lam[i]) for i in active),
+            'kktResidual': residual, 'dDOC': dDOC, 'dx': dx, 'predicted': predicted}
+
+
+def spot_check(opt, sensitivity, parameter, tol=1e-6):
+    ''' Re-optimize with `parameter` changed by its predicted delta (warm started) and
+        compare with the first-order prediction. '''
+    delta, predictedDOC, predictedX = sensitivity['predicted'][parameter]
+    assumptions = dict(DEFAULT_ASSUMPTIONS)
+    assumptions.update(opt['assumptions'])
+    assumptions[parameter] += delta
+    shifted = optimize_design(opt['Vehicle'], opt['range'], x0=opt['xScaled'], tol=tol,
+                              battery_fraction=opt.get('batteryFraction'), **assumptions)
+    return {'parameter': parameter, 'delta': delta,
+            'predictedDOC': predictedDOC, 'actualDOC': shifted['DOC'] - opt['DOC'],
+            'predictedX': predictedX, 'actualX': shifted['x'] - opt['x'], 'feasible': shifted['feasible']}
+
+
+def _range_task(args):
+    Vehicle, range, parameters, deltas, check, tol, battery_fraction = args
+    opt = optimize_design(Vehicle, range, battery_fraction=battery_fraction)
+    # Tighten the tol 0.01 optimum of the OpenMDAO driver, the multipliers need a KKT point
+    opt = optimize_design(Vehicle, range, x0=opt['xScaled'], tol=tol, battery_fraction=battery_fraction)
+    sensitivity = post_optimal_sensitivity(opt, parameters, deltas)
+    if check is not None:
+        sensitivity['spotCheck'] = spot_check(opt, sensitivity, check, tol)
+    return sensitivity
+
+
+def range_sensitivities(Vehicle, ranges, parameters=PARAMETERS, deltas=None, check='batteryEnergyDensity',
+                        tol=1e-6, processes=1, battery_fraction=None):
+    ''' Optimize every range point and add its post-optimal sensitivity (and spot check). '''
+    tasks = [(Vehicle, float(r), parameters, deltas, check, tol, battery_fraction) for r in ranges]
+    if processes > 1:
+        pool = multiprocessing.Pool(processes)
+        try:
+            return pool.map(_range_task, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    return [_range_task(task) for task in tasks]
+
+
+if __name__ == "__main__":
+    # Sample Inputs: tiltwing range sweep, battery energy density 230 -> 260 W-hr / kg
+    for s in range_sensitivities(u'tiltwing', np.linspace(10000.0, 200000.0, 5), processes=2):
+        check = s['spotCheck']
+        print('Range (km): {}, DOC ($): {:.4f}, active: {}'.format(s['range'] / 1000.0, s['DOC'], ', '.join(s['active'])))
+        print('  dDOC/dbatteryEnergyDensity ($ / W-hr / kg): {:.5f}, dDOC/dmotorPowerDensity ($ / kW / kg): {:.5f}'.format(
+            s['dDOC']['batteryEnergyDensity'], s['dDOC']['motorPowerDensity']))
+        print('  {} +{}: predicted dDOC {:.4f}, re-optimized dDOC {:.4f}'.format(
+            check['parameter'], check['delta'], check['predictedDOC'], check['actualDOC']))
@@ -22,11 +22,10 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component
-from openmdao.api import Problem, IndepVarComp, Group  # for unit testing
+from openmdao.core.component import Component
+from analysis_errors import analysis_errors
 import math
 import numpy as np
-from scipy import interpolate
 
 class prop_mass(Component):
 
@@ -37,6 +36,7 @@ class prop_mass(Component):
         
         self.add_output('mass', val=1.0)
         
+    @analysis_errors
     def solve_nonlinear(self, params, unknowns, resids):
         
         rProp = params['rProp']
@@ -234,6 +234,8 @@ class prop_mass(Component):
 
             
 if __name__ == "__main__":  # DEBUG
+    from openmdao.api import Problem, IndepVarComp, Group  # for unit testing
+
     top = Problem()
     root = top.root = Group()
 
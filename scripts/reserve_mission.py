@@ -25,7 +25,8 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
+from analysis_errors import AnalysisError, analysis_errors
 import math
 
 class reserve_mission(Component):
@@ -45,6 +46,7 @@ class reserve_mission(Component):
         self.add_output('t', val=0.0, description='flight time for reserve mission')
 
 
+    @analysis_errors
     def solve_nonlinear(self, params, unknowns, resids): #QUESTION: does this always need to be named solve_nonlinear
         if params['Vehicle'].lower() in ('tiltwing', 'helicopter'):
             # Reserve mission
@@ -63,5 +65,4 @@ class reserve_mission(Component):
             unknowns['t'] = hoverTime + cruiseTime + loiterTime;
 
         else:
-            print('Unrecognized vehicle!')
-            pass
\ No newline at end of file
+            raise AnalysisError('Unrecognized vehicle: {}'.format(params['Vehicle']))
\ No newline at end of file
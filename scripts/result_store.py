@@ -0,0 +1,141 @@
+'''
+# Name: result_store.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Checkpointed results store for long sweeps
+
+# The optimizer scripts only read their results back from the 'subprob' sqlite
+# recorder and write results.csv once the whole sweep has finished, so a crash
+# at range point 17 of 20 loses everything. This sqlite store (one file, shared
+# by the worker processes) commits every completed case in its own transaction
+# and keeps the best iterate of every in-flight optimization, written at most
+# every `interval` seconds. On restart, study_runner.py skips the completed
+# cases and warm starts the interrupted ones from their last recorded iterate.
+
+# Tables:
+#   cases       - key, result (json), finished (time)
+#   iterates    - key, xScaled (json), DOC, violation, nfev, updated (time)
+
+# Inputs:
+#   path        - sqlite file
+#   timeout     - seconds to wait for a lock held by another process [default 60]
+
+# Outputs:
+#   ResultStore - completed(), result(key), commit_result(key, result), iterate(key),
+#                 save_iterate(key, ...), recorder(key) (a design_optimizer monitor)
+'''
+
+from __future__ import print_function
+
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from design_optimizer import constraint_violation
+
+# Result entries restored as arrays
+ARRAY_KEYS = ('x', 'xScaled', 'margins', 'x0Scaled')
+
+
+def _default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError('Not serializable: {!r}'.format(value))
+
+
+def dumps(result):
+    return json.dumps(result, default=_default, allow_nan=True)
+
+
+def loads(text):
+    result = json.loads(text)
+    for key in ARRAY_KEYS:
+        if key in result:
+            result[key] = np.array(result[key], dtype=float)
+    return result
+
+
+class ResultStore(object):
+    ''' sqlite store of completed cases and in-flight iterates, one connection per process '''
+
+    def __init__(self, path, timeout=60.0):
+        self.path = path
+        self.timeout = timeout
+        self._connection = None
+        self._pid = None
+        with self._connect() as db:
+            db.execute('CREATE TABLE IF NOT EXISTS cases (key TEXT PRIMARY KEY, result TEXT, finished REAL)')
+            db.execute('CREATE TABLE IF NOT EXISTS iterates (key TEXT PRIMARY KEY, xScaled TEXT, DOC REAL, '
+                       'violation REAL, nfev INTEGER, updated REAL)')
+
+    def __getstate__(self):
+        return {'path': self.path, 'timeout': self.timeout}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'], state['timeout'])
+
+    def _connect(self):
+        # sqlite connections must not be shared with forked workers
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=self.timeout)
+            self._pid = os.getpid()
+        return self._connection
+
+    def completed(self):
+        ''' Keys of the completed cases '''
+        return set(row[0] for row in self._connect().execute('SELECT key FROM cases'))
+
+    def result(self, key):
+        row = self._connect().execute('SELECT result FROM cases WHERE key = ?', (key,)).fetchone()
+        return None if row is None else loads(row[0])
+
+    def commit_result(self, key, result):
+        ''' Store a completed case and drop its iterate, in one transaction '''
+        with self._connect() as db:
+            db.execute('INSERT OR REPLACE INTO cases VALUES (?, ?, ?)', (key, dumps(result), time.time()))
+            db.execute('DELETE FROM iterates WHERE key = ?', (key,))
+
+    def iterate(self, key):
+        ''' (xScaled, nfev) of the last recorded iterate of an in-flight case, or None '''
+        row = self._connect().execute('SELECT xScaled, nfev FROM iterates WHERE key = ?', (key,)).fetchone()
+        return None if row is None else (np.array(json.loads(row[0])), row[1])
+
+    def save_iterate(self, key, xScaled, DOC, violation, nfev):
+        with self._connect() as db:
+            db.execute('INSERT OR REPLACE INTO iterates VALUES (?, ?, ?, ?, ?, ?)',
+                       (key, dumps(list(xScaled)), float(DOC), float(violation), int(nfev), time.time()))
+
+    def recorder(self, key, columns, offset=0, interval=5.0):
+        ''' design_optimizer monitor that records the best iterate of a case (least violation of the
+            model constraints, then lowest DOC) every `interval` seconds '''
+        return IterateRecorder(self, key, columns, offset, interval)
+
+
+class IterateRecorder(object):
+    ''' Monitor of optimize_design keeping the best iterate, saved to the store at most every interval s '''
+
+    def __init__(self, store, key, columns, offset=0, interval=5.0):
+        self.store = store
+        self.key = key
+        self.columns = list(columns)
+        self.offset = offset
+        self.interval = interval
+        self.best = None
+        self.saved = time.time()
+
+    def __call__(self, xScaled, result, nfev):
+        violation = constraint_violation(result['margins'][0], self.columns)
+        DOC = float(result['DOC'][0])
+        if np.isfinite(DOC) and np.isfinite(violation) and (
+                self.best is None or (violation, DOC) < (self.best[1], self.best[2])):
+            self.best = (np.array(xScaled), violation, DOC)
+        if self.best is not None and time.time() - self.saved >= self.interval:
+            self.store.save_iterate(self.key, self.best[0], self.best[2], self.best[1], self.offset + nfev)
+            self.saved = time.time()
@@ -0,0 +1,161 @@
+'''
+# Name: sobol_sensitivity.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Variance-based (Sobol) sensitivity of DOC to the "What If" assumptions
+
+# Saltelli sampling of the assumptions behind the *_what_if.py components
+# (hover tip Mach number, battery energy density / cost / life cycles, motor
+# cost / life, electricity cost, flight hours per year, vehicle life and wing
+# profile drag), evaluated with the vectorized model (vahana_batch.py) in large
+# batches. DOC is either evaluated at a fixed design (by default the optimum at
+# the nominal assumptions) or re-optimized for every sample with
+# design_optimizer.py on a process pool. First and total order indices use the
+# Saltelli (2010) and Jansen estimators, with bootstrap confidence intervals.
+
+# Inputs:
+#   Vehicle     - 'tiltwing' or 'helicopter'
+#   range       - mission range [m]
+#   N           - base sample size, N * (d + 2) model evaluations [default 4096]
+#   factors     - {assumption: (lower, upper)} uniform distributions [default FACTORS]
+#   design      - fixed (rProp, cruiseSpeed, mBattery, mMotors, mtom) [default: nominal optimum]
+#   reoptimize  - re-optimize the design for every sample [default False]
+#   processes   - worker processes for reoptimize [default 1]
+#   bootstrap   - bootstrap resamples for the confidence intervals [default 200]
+#   confidence  - confidence level [default 0.95]
+
+# Outputs:
+#   dict with names, S1, S1_conf, ST, ST_conf (per factor), mean and variance of DOC,
+#   feasibleFraction (share of samples whose design meets c1 .. c4)
+'''
+
+from __future__ import print_function
+
+import numpy as np
+
+from vahana_batch import evaluate_batch
+from design_grid import halton
+from design_optimizer import optimize_cases, optimize_design, MODEL_CONSTRAINTS, FEASIBILITY_TOL
+from vehicle import vehicle_key
+
+# Default uncertainty ranges of the "What If" assumptions (nominal values in vahana_batch.DEFAULT_ASSUMPTIONS)
+FACTORS = [('rotorTipMaxMachNumber', (0.55, 0.75)),
+           ('batteryEnergyDensity', (180.0, 300.0)),  # [W-hr / kg]
+           ('batteryCost', (400.0, 1000.0)),  # [$ / kW-hr]
+           ('batteryLifeCycles', (1000.0, 3000.0)),
+           ('motorCost', (100.0, 200.0)),  # [$ / kg]
+           ('motorLifeHours', (3000.0, 9000.0)),
+           ('electricityCost', (0.08, 0.20)),  # [$ / kW-hr]
+           ('flightHoursPerYear', (400.0, 800.0)),
+           ('vehicleLifeYears', (5.0, 15.0)),
+           ('wingProfileCD', (0.008, 0.016))]
+
+
+def saltelli_sample(factors, N, seed=0, sampler='random'):
+    ''' Saltelli sample matrices A, B (N, d) and AB (d, N, d), AB[i] = A with column i from B '''
+    d = len(factors)
+    if sampler == 'halton':
+        unit = halton(0, N, 2 * d)
+    elif sampler == 'random':
+        unit = np.random.RandomState(seed).random_sample((N, 2 * d))
+    else:
+        raise ValueError('Unknown sampler: {}'.format(sampler))
+    lower = np.array([bounds[0] for name, bounds in factors], dtype=float)
+    upper = np.array([bounds[1] for name, bounds in factors], dtype=float)
+    A = lower + unit[:, :d] * (upper - lower)
+    B = lower + unit[:, d:] * (upper - lower)
+    AB = np.repeat(A[None, :, :], d, axis=0)
+    for i in range(d):
+        AB[i, :, i] = B[:, i]
+    return A, B, AB
+
+
+def _indices(fA, fB, fAB):
+    variance = np.var(np.concatenate((fA, fB), axis=-1), axis=-1)
+    S1 = np.mean(fB[..., None, :] * (fAB - fA[..., None, :]), axis=-1) / variance[..., None]  # Saltelli 2010
+    ST = 0.5 * np.mean((fA[..., None, :] - fAB) ** 2, axis=-1) / variance[..., None]  # Jansen 1999
+    return S1, ST
+
+
+def sobol_analyze(fA, fB, fAB, bootstrap=200, confidence=0.95, seed=0):
+    ''' First and total order indices from model outputs fA (N,), fB (N,), fAB (d, N),
+        with bootstrap confidence interval half widths. '''
+    S1, ST = _indices(fA, fB, fAB)
+    result = {'S1': S1, 'ST': ST, 'mean': np.mean(np.concatenate((fA, fB))),
+              'variance': np.var(np.concatenate((fA, fB)))}
+
+    if bootstrap:
+        N = len(fA)
+        rows = np.random.RandomState(seed).randint(0, N, (bootstrap, N))
+        S1b, STb = _indices(fA[rows], fB[rows], np.transpose(fAB[:, rows], (1, 0, 2)))
+        alpha = 100.0 * (1.0 - confidence) / 2.0
+        result['S1_conf'] = (np.percentile(S1b, 100.0 - alpha, axis=0) - np.percentile(S1b, alpha, axis=0)) / 2.0
+        result['ST_conf'] = (np.percentile(STb, 100.0 - alpha, axis=0) - np.percentile(STb, alpha, axis=0)) / 2.0
+    return result
+
+
+def _evaluate_fixed(Vehicle, range, design, names, X, chunk_size):
+    ''' DOC and feasibility of a fixed design for every assumption sample (row of X) '''
+    DOC = np.empty(len(X))
+    ok = np.empty(len(X), dtype=bool)
+    columns = list(MODEL_CONSTRAINTS[vehicle_key(Vehicle)])
+    for i in np.arange(0, len(X), chunk_size):
+        chunk = X[i:i + chunk_size]
+        result = evaluate_batch(Vehicle, range, *design, **dict(zip(names, chunk.T)))
+        DOC[i:i + chunk_size] = result['DOC']
+        ok[i:i + chunk_size] = np.all(result['margins'][:, columns] > -FEASIBILITY_TOL[columns], axis=1)
+    return DOC, ok
+
+
+def _evaluate_optimum(Vehicle, range, x0, names, X, processes):
+    ''' Optimum DOC for every assumption sample (row of X) '''
+    cases = [{'Vehicle': Vehicle, 'range': range, 'x0': x0, 'assumptions': dict(zip(names, row))} for row in X]
+    results = optimize_cases(cases, processes=processes)
+    return np.array([r['DOC'] for r in results]), np.array([r['feasible'] for r in results])
+
+
+def sobol_indices(Vehicle, range, N=4096, factors=FACTORS, design=None, reoptimize=False, processes=1,
+                  bootstrap=200, confidence=0.95, seed=0, sampler='random', chunk_size=100000):
+    ''' Sobol indices of DOC at one range, see the header for the returned dict. '''
+    names = [name for name, bounds in factors]
+    d = len(names)
+    A, B, AB = saltelli_sample(factors, N, seed, sampler)
+    X = np.concatenate((A, B, AB.reshape(d * N, d)))
+
+    nominal = None
+    if design is None or reoptimize:
+        nominal = optimize_design(Vehicle, range)
+    if reoptimize:
+        DOC, ok = _evaluate_optimum(Vehicle, range, nominal['xScaled'], names, X, processes)
+    else:
+        design = nominal['x'] if design is None else np.asarray(design, dtype=float)
+        DOC, ok = _evaluate_fixed(Vehicle, range, design, names, X, chunk_size)
+
+    result = sobol_analyze(DOC[:N], DOC[N:2 * N], DOC[2 * N:].reshape(d, N), bootstrap, confidence, seed)
+    result.update(names=names, N=N, evaluations=len(X), feasibleFraction=np.mean(ok), design=design,
+                  reoptimize=reoptimize)
+    return result
+
+
+def print_indices(result):
+    print('{:<24} {:>8} {:>8} {:>8} {:>8}'.format('factor', 'S1', '+/-', 'ST', '+/-'))
+    for i in np.argsort(-result['ST']):
+        print('{:<24} {:>8.4f} {:>8.4f} {:>8.4f} {:>8.4f}'.format(
+            result['names'][i], result['S1'][i], result.get('S1_conf', np.zeros(len(result['S1'])))[i],
+            result['ST'][i], result.get('ST_conf', np.zeros(len(result['ST'])))[i]))
+    print('DOC mean ($): {:.3f}, std ($): {:.3f}, feasible: {:.1%}'.format(
+        result['mean'], np.sqrt(result['variance']), result['feasibleFraction']))
+
+
+if __name__ == "__main__":
+    # Sample Inputs: tiltwing at 50 km, optimum design at the nominal assumptions
+    result = sobol_indices(u'tiltwing', 50000.0, N=8192)
+    print('Fixed design, {} model evaluations'.format(result['evaluations']))
+    print_indices(result)
+
+    # Re-optimized for every sample
+    result = sobol_indices(u'tiltwing', 50000.0, N=32, reoptimize=True, processes=2, bootstrap=100)
+    print('Re-optimized design, {} optimizations'.format(result['evaluations']))
+    print_indices(result)
@@ -0,0 +1,97 @@
+'''
+# Name: stream_export.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Streaming export of finished cases to .csv and JSON lines
+
+# The optimizer scripts write results.csv only after top.run() and
+# top.cleanup(), by unpickling every case of the sqlitedict recorder. The
+# exporter is called by the study runner (study_runner.py) as each case
+# finishes and appends one row to a .csv file per study and vehicle (the
+# results.csv columns, see design_grid.CSV_HEADER) and one record to a JSON
+# lines file of all studies, flushing after every case, so partial results can
+# be read while a sweep is running. Rows are in completion order. Cases whose
+# model failed (status 'error') are left out of both files, as they are left
+# out of the final tables. Non-finite numbers are written as null.
+
+# Inputs:
+#   csv_pattern - .csv path per study and vehicle, with {name} and {vehicle} fields [default None: no .csv]
+#   jsonl_path  - JSON lines path [default None: no .jsonl]
+
+# Outputs:
+#   .csv rows: Range [km], DOC [$], DOC [$/km], RotorRadius [m], CruiseSpeed [m/s], BatteryMass [kg],
+#              MotorMass [kg], MaxTakeOffMass [kg]
+#   .jsonl records: study, Vehicle, the .csv columns, feasible, nfev, seconds, status (COBYLA cases)
+'''
+
+from __future__ import print_function
+
+import csv
+import json
+import math
+import os
+
+from design_grid import CSV_HEADER, csv_row
+from filter_csv_stream import open_csv
+
+
+def _json_number(value):
+    ''' value as a float, None (null) if it is NaN or infinite '''
+    value = float(value)
+    return value if not (math.isnan(value) or math.isinf(value)) else None
+
+
+class StreamExporter(object):
+    ''' Appends every finished case to its .csv file and to the .jsonl file, flushing as it goes '''
+
+    def __init__(self, csv_pattern=None, jsonl_path=None, sync=False):
+        self.csv_pattern = csv_pattern
+        self.sync = sync
+        self._csv = {}
+        self._jsonl = open(jsonl_path, 'w') if jsonl_path else None
+
+    def _flush(self, f):
+        f.flush()
+        if self.sync:
+            os.fsync(f.fileno())
+
+    def _writer(self, name, Vehicle):
+        path = self.csv_pattern.format(name=name, vehicle=Vehicle)
+        if path not in self._csv:
+            f = open_csv(path, 'w')
+            writer = csv.writer(f, delimiter=',')
+            writer.writerow(CSV_HEADER)
+            self._csv[path] = (f, writer)
+        return self._csv[path]
+
+    def write(self, name, Vehicle, opt):
+        ''' Export one finished case of study `name` '''
+        if opt.get('status') == 'error':
+            return
+        row = csv_row(opt['range'], opt['x'], opt['DOC'])
+        if self.csv_pattern:
+            f, writer = self._writer(name, Vehicle)
+            writer.writerow(row)
+            self._flush(f)
+        if self._jsonl is not None:
+            record = dict(zip(CSV_HEADER, [_json_number(value) for value in row]), study=name, Vehicle=Vehicle,
+                          feasible=bool(opt['feasible']), nfev=int(opt['nfev']),
+                          seconds=_json_number(opt.get('seconds', 0.0)), status=opt.get('status'))
+            self._jsonl.write(json.dumps(record, sort_keys=True, allow_nan=False) + '\n')
+            self._flush(self._jsonl)
+
+    def close(self):
+        for f, writer in self._csv.values():
+            f.close()
+        self._csv = {}
+        if self._jsonl is not None:
+            self._jsonl.close()
+            self._jsonl = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
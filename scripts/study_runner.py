@@ -0,0 +1,416 @@
+'''
+# Name: study_runner.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Config-driven range study runner
+
+# One runner for the studies of the copy-pasted optimizer scripts
+# (test/vahana_optimizer*.py, fuel_constraint.py), which only differ in vehicle,
+# range levels, constants and active constraints and each build and set up
+# their own TopLevelSystem. A study is a declarative config (dict or .json file):
+#   {"name": "fuel_constraint",
+#    "vehicles": ["tiltwing"],
+#    "ranges": {"lower": 10000.0, "upper": 200000.0, "levels": 20},  (or a list of ranges [m])
+#    "battery_fraction": 0.3333,              con5, optional
+#    "assumptions": {"batteryEnergyDensity": 260.0},   "What If" constants, optional
+#    "optimizer": {"method": "cobyla", "tol": 0.01},   see OPTIMIZERS, optional
+#                 (COBYLA limits: "max_evaluations", "max_seconds", "stall", see design_optimizer.py)
+#    "output": "results_{name}_{vehicle}.csv"}        optional
+# A config file holds one study or {"defaults": {...}, "studies": [...]}. All cases
+# of all studies run from one invocation on one worker pool, and identical cases
+# (same vehicle, range, constraints, constants and optimizer) are optimized once
+# and shared between the studies. The model itself is the vectorized
+# vahana_batch.py, which needs no per-vehicle setup. Cases are scheduled longest
+# expected run first (helicopter and population optimizers before tiltwing
+# COBYLA), one at a time per worker, so the run time of a sweep approaches the
+# slowest single case rather than the sum of the cases.
+
+# Multi-variant sweeps (the README comparisons of tiltwing vs helicopter and of
+# the tiltwing with and without the fuel weight constraint) are the cross
+# product vehicles x CONSTRAINT_SETS x ranges, one study per variant, written to
+# one merged table keyed by variant (--sweep, --merged).
+
+# With a results store (result_store.py, --store) every completed case is
+# committed as soon as it finishes and COBYLA cases record their best iterate
+# while they run. Re-running the same command after a crash or preemption skips
+# the completed cases and warm starts the interrupted COBYLA cases from their
+# last iterate (the other optimizers restart the case).
+
+# Finished cases can also be streamed as they complete (stream_export.py,
+# --stream-csv, --stream-jsonl), for reading partial results of a long sweep.
+# Every iteration of the COBYLA cases (objective, maximum constraint violation,
+# design vector, wall time) can be logged for tuning tolerances (telemetry.py,
+# --telemetry), and --progress shows a progress line with the ETA of the sweep.
+# A case whose model fails (AnalysisError, LinAlgError) is
+# logged and skipped (status 'error', left out of the .csv files) instead of
+# aborting the sweep.
+
+# Usage:
+#   python study_runner.py studies.json --processes 2
+#   python study_runner.py --preset vahana_optimizer_scaled_tiltwing --preset fuel_constraint
+#   python study_runner.py --sweep --merged variants.csv --processes 4 --store sweep.sqlite
+#   python study_runner.py --sweep --stream-csv "partial_{name}_{vehicle}.csv" --stream-jsonl partial.jsonl
+#   python study_runner.py --preset vahana_optimizer_scaled_helicopter --telemetry iterations.jsonl --progress
+#   python study_runner.py --sweep --max-seconds 10 --stall 200
+
+# Outputs:
+#   {study name: {Vehicle: list of optimizer results per range}}, results.csv files (see design_grid.write_csv),
+#   optional merged .csv of all studies (see MERGED_HEADER)
+'''
+
+from __future__ import print_function
+
+import argparse
+import csv
+import json
+import multiprocessing
+import sys
+import time
+
+import numpy as np
+
+from design_optimizer import MODEL_CONSTRAINTS, optimize_design
+from constraints_batch import CONSTRAINTS
+from design_grid import write_csv
+from filter_csv_stream import open_csv
+from multi_start import multi_start
+from evolution_optimizer import cma_es
+from result_store import ResultStore
+from stream_export import StreamExporter
+from vehicle import TILTWING, HELICOPTER, vehicle_key
+
+
+def _bayesian_optimize(*args, **kwargs):
+    # The GP surrogate (scipy.linalg, scipy.optimize) only loads for the studies using it
+    from bayesian_optimizer import bayesian_optimize
+    return bayesian_optimize(*args, **kwargs)
+
+
+# Optimizer methods: function(Vehicle, range, battery_fraction=..., **options and assumptions) -> result dict
+OPTIMIZERS = {'cobyla': optimize_design,
+              'multi_start': lambda Vehicle, range, **kwargs: multi_start(Vehicle, [range], **kwargs)[0]['best'],
+              'cmaes': cma_es,
+              'bayesian': _bayesian_optimize}
+
+# Failures of a case's model that skip the case, AnalysisError is added by _model_errors. Other errors
+# (bad study keys, programming errors) still abort the sweep.
+MODEL_ERRORS = (np.linalg.LinAlgError,)
+
+# Expected seconds of a cold COBYLA run on one core, and the cost of the other optimizers relative to COBYLA
+EXPECTED_SECONDS = {TILTWING: 0.3, HELICOPTER: 1.0}
+METHOD_COST = {'cobyla': 1.0, 'multi_start': 10.0, 'cmaes': 3.0, 'bayesian': 100.0}
+
+# Constraint sets of the variant sweeps (study keys added to every variant)
+CONSTRAINT_SETS = {'base': {}, 'fuel_weight': {'battery_fraction': 1.0 / 3.0}}
+
+MERGED_HEADER = ['Variant', 'Vehicle', 'BatteryFraction', 'Range [km]', 'DOC [$]', 'DOC [$/km]', 'RotorRadius [m]',
+                 'CruiseSpeed [m/s]', 'BatteryMass [kg]', 'MotorMass [kg]', 'MaxTakeOffMass [kg]', 'Feasible',
+                 'Seconds']
+
+# Status of the cases stopped at one of their limits (see design_optimizer.optimize_design)
+STOPPED = ('evaluations', 'seconds', 'stall')
+
+STUDY_KEYS = ('name', 'vehicles', 'ranges', 'battery_fraction', 'assumptions', 'optimizer', 'output')
+
+FULL_RANGE = {'lower': 10000.0, 'upper': 200000.0}
+HELICOPTER_RANGE = {'lower': 10000.0, 'upper': 110000.0}
+
+# The studies of the optimizer scripts (test/vahana_optimizer_old.py and test/vahana_optimizer_single_range.py
+# use other bounds and constants)
+PRESETS = {'vahana_optimizer': {'vehicles': ['tiltwing'], 'ranges': dict(FULL_RANGE, levels=20)},
+           'vahana_optimizer_scaled': {'vehicles': ['tiltwing'], 'ranges': dict(FULL_RANGE, levels=20)},
+           'vahana_optimizer_scaled_tiltwing': {'vehicles': ['tiltwing'], 'ranges': dict(FULL_RANGE, levels=20)},
+           'vahana_optimizer_helicopter': {'vehicles': ['helicopter'], 'ranges': dict(HELICOPTER_RANGE, levels=11)},
+           'vahana_optimizer_scaled_helicopter': {'vehicles': ['helicopter'],
+                                                  'ranges': dict(HELICOPTER_RANGE, levels=11)},
+           'vahana_optimizer_scaled_helicopter_single_run': {'vehicles': ['helicopter'], 'ranges': [100000.0]},
+           'vahana_optimizer_scaled_tiltwing_one_third_battery_constraint': {
+               'vehicles': ['tiltwing'], 'ranges': dict(FULL_RANGE, levels=77), 'battery_fraction': 1.0 / 3.0},
+           'vahana_optimizer_scaled_helicopter_one_third_battery_constraint': {
+               'vehicles': ['helicopter'], 'ranges': dict(HELICOPTER_RANGE, levels=41), 'battery_fraction': 1.0 / 3.0},
+           'fuel_constraint': {'vehicles': ['tiltwing'], 'ranges': dict(FULL_RANGE, levels=20),
+                               'battery_fraction': 1.0 / 3.0}}
+
+
+def study_ranges(ranges):
+    ''' Range levels [m] of a study config (list, or lower / upper / levels as FullFactorialDriver) '''
+    if isinstance(ranges, dict):
+        return [float(r) for r in np.linspace(ranges['lower'], ranges['upper'], ranges['levels'])]
+    return [float(r) for r in ranges]
+
+
+def normalize_study(study, defaults=None):
+    ''' Study config with the defaults filled in, checked for unknown keys and optimizers '''
+    out = {'battery_fraction': None, 'assumptions': {}, 'optimizer': {'method': 'cobyla'},
+           'output': 'results_{name}_{vehicle}.csv'}
+    out.update(defaults or {})
+    out.update(study)
+    unknown = set(out) - set(STUDY_KEYS)
+    if unknown:
+        raise ValueError('Unknown study keys: {}'.format(', '.join(sorted(unknown))))
+    for key in ('name', 'vehicles', 'ranges'):
+        if key not in out:
+            raise ValueError('Study without {}: {}'.format(key, out.get('name')))
+    optimizer = dict(out['optimizer'])
+    if optimizer.get('method', 'cobyla') not in OPTIMIZERS:
+        raise ValueError('Unknown optimizer: {}'.format(optimizer['method']))
+    optimizer.setdefault('method', 'cobyla')
+    out['optimizer'] = optimizer
+    out['vehicles'] = [u'{}'.format(v) for v in out['vehicles']]
+    for Vehicle in out['vehicles']:
+        vehicle_key(Vehicle)
+    out['ranges'] = study_ranges(out['ranges'])
+    return out
+
+
+def load_config(path):
+    ''' Study configs of a .json file '''
+    with open(path) as f:
+        config = json.load(f)
+    if 'studies' in config:
+        return [normalize_study(s, config.get('defaults')) for s in config['studies']]
+    return [normalize_study(config)]
+
+
+def preset(name):
+    return normalize_study(dict(PRESETS[name], name=name))
+
+
+def variant_studies(vehicles, constraint_sets=None, ranges=None, **study):
+    ''' One study per (vehicle, constraint set) variant, named <vehicle>_<constraint set> '''
+    constraint_sets = CONSTRAINT_SETS if constraint_sets is None else constraint_sets
+    ranges = dict(FULL_RANGE, levels=20) if ranges is None else ranges
+    studies = []
+    for Vehicle in vehicles:
+        for name in sorted(constraint_sets):
+            variant = dict(study, name='{}_{}'.format(Vehicle, name), vehicles=[Vehicle], ranges=ranges)
+            variant.update(constraint_sets[name])
+            studies.append(normalize_study(variant))
+    return studies
+
+
+def expected_cost(task):
+    ''' Expected run time of a case, for the scheduling '''
+    Vehicle, range, battery_fraction, assumptions, optimizer = task
+    return EXPECTED_SECONDS[vehicle_key(Vehicle)] * METHOD_COST[optimizer['method']]
+
+
+def _case_key(Vehicle, range, study):
+    ''' Identical cases are optimized once '''
+    return json.dumps([Vehicle, range, study['battery_fraction'], study['assumptions'], study['optimizer']],
+                      sort_keys=True)
+
+
+def _model_errors():
+    ''' MODEL_ERRORS, plus OpenMDAO's AnalysisError once OpenMDAO is loaded (it can't be raised before) '''
+    system = sys.modules.get('openmdao.core.system')
+    return MODEL_ERRORS + ((system.AnalysisError,) if system is not None else ())
+
+
+def _monitors(monitors):
+    ''' One optimize_design monitor calling all of them '''
+    def monitor(xScaled, result, nfev):
+        for m in monitors:
+            m(xScaled, result, nfev)
+    return monitors[0] if len(monitors) == 1 else monitor
+
+
+def _run_case(task, store=None, key=None, telemetry=None):
+    ''' _solve_case, logging and skipping a case whose model fails instead of aborting the sweep '''
+    start = time.time()
+    try:
+        return _solve_case(task, store, key, telemetry)
+    except _model_errors() as err:
+        Vehicle, range = task[:2]
+        message = '{}: {}'.format(type(err).__name__, err)
+        print('Skipping {} at {:.1f} km: {}'.format(Vehicle, range / 1000.0, message), file=sys.stderr)
+        # Not committed to the store, so the case is retried by the next run
+        return {'Vehicle': Vehicle, 'range': range, 'assumptions': task[3], 'x': np.full(5, np.nan),
+                'xScaled': np.full(5, np.nan), 'DOC': np.nan, 'margins': np.full(len(CONSTRAINTS), np.nan),
+                'feasible': False, 'success': False, 'nfev': 0, 'message': message, 'status': 'error',
+                'seconds': time.time() - start}
+
+
+def _solve_case(task, store=None, key=None, telemetry=None):
+    Vehicle, range, battery_fraction, assumptions, optimizer = task
+    options = dict(optimizer)
+    method = options.pop('method')
+    resumed = 0
+    if method == 'cobyla':
+        columns = MODEL_CONSTRAINTS[vehicle_key(Vehicle)]
+        monitors = []
+        if store is not None:
+            # Warm start an interrupted case from its last recorded iterate
+            last = store.iterate(key)
+            if last is not None:
+                options.update(x0=last[0], rhobeg=0.1)
+                resumed = last[1]
+            monitors.append(store.recorder(key, columns, resumed))
+        if telemetry is not None:
+            from telemetry import OptimizerTelemetry  # telemetry.py loads OpenMDAO's BaseRecorder
+            monitors.append(OptimizerTelemetry(telemetry, key, Vehicle, columns, resumed))
+        if monitors:
+            options['monitor'] = _monitors(monitors)
+    options.update(assumptions)
+    start = time.time()
+    opt = OPTIMIZERS[method](Vehicle, range, battery_fraction=battery_fraction, **options)
+    opt['seconds'] = time.time() - start
+    opt['nfev'] += resumed
+    if store is not None:
+        opt['resumedAt'] = resumed
+        store.commit_result(key, opt)
+    return opt
+
+
+def _run_indexed(args):
+    i, task, store, key, telemetry = args
+    return i, _run_case(task, store, key, telemetry)
+
+
+def run_studies(studies, processes=1, write=True, progress=False, store=None, exporter=None, telemetry=None):
+    ''' Run every case of every study on one pool, see the header for the returned dict.
+        store: ResultStore (or sqlite path) to checkpoint to and resume from.
+        exporter: StreamExporter that gets every case as it finishes.
+        telemetry: TelemetryLog (or .jsonl path) of every iteration of the COBYLA cases. '''
+    if telemetry is not None:
+        from telemetry import TelemetryLog
+        if not isinstance(telemetry, TelemetryLog):
+            telemetry = TelemetryLog(telemetry)
+    if store is not None and not isinstance(store, ResultStore):
+        store = ResultStore(store)
+    keys = []
+    tasks = []
+    # (study, Vehicle) pairs sharing each case
+    owners = {}
+    for study in studies:
+        for Vehicle in study['vehicles']:
+            for r in study['ranges']:
+                key = _case_key(Vehicle, r, study)
+                if key not in owners:
+                    keys.append(key)
+                    tasks.append((Vehicle, r, study['battery_fraction'], study['assumptions'], study['optimizer']))
+                owners.setdefault(key, []).append((study['name'], Vehicle))
+
+    def finished(key, opt):
+        cases[key] = opt
+        if exporter is not None:
+            for name, Vehicle in owners[key]:
+                exporter.write(name, Vehicle, opt)
+
+    cases = {}
+    if store is not None:
+        for key in store.completed().intersection(keys):
+            finished(key, store.result(key))
+    if progress:
+        print('{} studies, {} unique cases, {} already completed'.format(len(studies), len(tasks), len(cases)))
+
+    # Longest expected case first, handed out one at a time as workers free up
+    order = sorted([i for i in np.arange(len(tasks)) if keys[i] not in cases], key=lambda i: -expected_cost(tasks[i]))
+    start = time.time()
+    pool = multiprocessing.Pool(processes) if processes > 1 else None
+    try:
+        scheduled = [(i, tasks[i], store, keys[i], telemetry) for i in order]
+        done = pool.imap_unordered(_run_indexed, scheduled, chunksize=1) if pool is not None else \
+            (_run_indexed(task) for task in scheduled)
+        for n, (i, opt) in enumerate(done):
+            finished(keys[i], opt)
+            if progress:
+                elapsed = time.time() - start
+                sys.stdout.write('\r{}/{} cases  {:.1f} s  ETA {:.1f} s '.format(
+                    n + 1, len(order), elapsed, elapsed / (n + 1) * (len(order) - n - 1)))
+                sys.stdout.flush()
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    if progress and order:
+        print()
+        seconds = [cases[keys[i]]['seconds'] for i in order]
+        print('{} cases in {:.1f} s, slowest case {:.1f} s, sum of cases {:.1f} s'.format(
+            len(order), time.time() - start, max(seconds), sum(seconds)))
+
+    results = {}
+    for study in studies:
+        results[study['name']] = {}
+        for Vehicle in study['vehicles']:
+            opts = [cases[_case_key(Vehicle, r, study)] for r in study['ranges']]
+            results[study['name']][Vehicle] = opts
+            if write and study['output']:
+                rows = np.array([[opt['range']] + list(opt['x']) + [opt['DOC']] for opt in opts
+                                 if opt.get('status') != 'error'])
+                write_csv(study['output'].format(name=study['name'], vehicle=Vehicle), rows)
+    return results
+
+
+def write_merged_csv(path, studies, results):
+    ''' One table of all studies, keyed by variant (study name), see MERGED_HEADER '''
+    with open_csv(path, 'w') as csvfile:
+        writer = csv.writer(csvfile, delimiter=',')
+        writer.writerow(MERGED_HEADER)
+        for study in studies:
+            for Vehicle in study['vehicles']:
+                for opt in results[study['name']][Vehicle]:
+                    if opt.get('status') == 'error':
+                        continue
+                    r = opt['range']
+                    writer.writerow([study['name'], Vehicle, study['battery_fraction'], r / 1000.0, opt['DOC'],
+                                     opt['DOC'] / r * 1000.0] + list(opt['x']) + [int(opt['feasible']),
+                                                                                   opt['seconds']])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run range studies from .json configs or presets.')
+    parser.add_argument('configs', nargs='*', help='.json study configs')
+    parser.add_argument('--preset', action='append', default=[], choices=sorted(PRESETS),
+                        help='built-in study of an optimizer script')
+    parser.add_argument('--sweep', action='store_true',
+                        help='tiltwing and helicopter, with and without the fuel weight constraint, 10 - 200 km')
+    parser.add_argument('--merged', metavar='PATH', help='also write one .csv of all studies, keyed by variant')
+    parser.add_argument('--store', metavar='PATH', help='sqlite results store to checkpoint to and resume from')
+    parser.add_argument('--stream-csv', metavar='PATTERN',
+                        help='append every finished case to a .csv per study and vehicle ({name}, {vehicle} fields)')
+    parser.add_argument('--stream-jsonl', metavar='PATH', help='append every finished case to a JSON lines file')
+    parser.add_argument('--telemetry', metavar='PATH',
+                        help='append every iteration of the COBYLA cases to a JSON lines file')
+    parser.add_argument('--max-evaluations', type=int, help='model evaluations per COBYLA case')
+    parser.add_argument('--max-seconds', type=float, help='wall clock seconds per COBYLA case')
+    parser.add_argument('--stall', type=int,
+                        help='stop a COBYLA case after this many evaluations without improvement')
+    parser.add_argument('--processes', type=int, default=1, help='worker processes [default 1]')
+    parser.add_argument('--progress', action='store_true',
+                        help='report the number of cases, a progress line with ETA and the run time')
+    args = parser.parse_args(argv)
+
+    studies = [preset(name) for name in args.preset]
+    if args.sweep:
+        studies += variant_studies([u'tiltwing', u'helicopter'])
+    for path in args.configs:
+        studies += load_config(path)
+    if not studies:
+        parser.error('no studies, give a config or a --preset')
+    limits = dict((key, value) for key, value in (('max_evaluations', args.max_evaluations),
+                                                  ('max_seconds', args.max_seconds), ('stall', args.stall))
+                  if value is not None)
+    for study in studies:
+        if study['optimizer']['method'] == 'cobyla':
+            for key, value in limits.items():
+                study['optimizer'].setdefault(key, value)
+    with StreamExporter(args.stream_csv, args.stream_jsonl) as exporter:
+        results = run_studies(studies, args.processes, progress=args.progress, store=args.store, exporter=exporter,
+                              telemetry=args.telemetry)
+    if args.merged:
+        write_merged_csv(args.merged, studies, results)
+    for name in sorted(results):
+        for Vehicle, opts in sorted(results[name].items()):
+            infeasible = sum(not opt['feasible'] for opt in opts)
+            stopped = sum(opt.get('status') in STOPPED for opt in opts)
+            skipped = sum(opt.get('status') == 'error' for opt in opts)
+            DOC = [opt['DOC'] for opt in opts if opt.get('status') != 'error'] or [np.nan]
+            print('{} {}: {} ranges, DOC ($) {:.2f} - {:.2f}, {} infeasible, {} stopped at a limit, {} skipped'
+                  .format(name, Vehicle, len(opts), min(DOC), max(DOC), infeasible, stopped, skipped))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+'''
+# Name: telemetry.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Per-iteration convergence telemetry of COBYLA runs
+
+# With disp=True COBYLA only prints its final NFVALS / F / MAXCV summary, so the
+# number of iterations a range point needs (and what tol=0.01 buys) is only
+# known after the fact. TelemetryLog appends one JSON record per optimizer
+# iteration (objective evaluation) to a JSON lines file:
+#   case        - case label (the range [m] of the sub-problem, or the study runner case)
+#   iteration   - objective evaluations of the case so far
+#   objective   - DOC [$]
+#   violation   - maximum constraint violation (COBYLA's MAXCV, in the units of the constraints)
+#   x           - design vector rProp, cruiseSpeed, mBattery, mMotors, mtom in model units [m, m/s, kg, kg, kg]
+#                 (design_optimizer.to_design of the optimizer units; the scale2 .. scale6 outputs of the
+#                 optimizer scripts), the same for both hooks
+#   seconds     - cumulative wall time of the case
+#   sweepSeconds - cumulative wall time of the sweep
+# With live=True a progress line (case, iteration, objective, violation, elapsed
+# time and ETA of the whole sweep) is rewritten on stderr.
+
+# Hooks:
+#   TelemetryRecorder - OpenMDAO case recorder for the sub.driver of the optimizer scripts:
+#                           sub.driver.add_recorder(TelemetryRecorder(sub.driver, TelemetryLog(path, total=20, live=True)))
+#   OptimizerTelemetry - monitor of design_optimizer.optimize_design (study_runner.py --telemetry)
+
+# Inputs:
+#   path        - JSON lines file, appended to [default None: no file]
+#   total       - cases of the sweep, for the ETA [default None: no ETA]
+#   live        - progress line on stderr [default False]
+
+# Outputs:
+#   .jsonl records, see above; read_telemetry(path) -> {case: list of records}
+'''
+
+from __future__ import print_function
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from openmdao.recorders.base_recorder import BaseRecorder
+
+from design_optimizer import DESIGN_BOUNDS, to_design
+from vehicle import vehicle_key
+
+# Seconds between rewrites of the progress line
+LIVE_INTERVAL = 0.5
+
+# Model unit design variables of the optimizer scripts: the indep2 .. indep6 desvars times the
+# DESIGN_SCALE of the vehicle, computed by the scale2 .. scale6 components
+DESIGN_UNKNOWNS = ('scale2.scaled', 'scale3.scaled', 'scale4.scaled', 'scale5.scaled', 'scale6.scaled')
+
+
+class TelemetryLog(object):
+    ''' JSON lines telemetry file and progress line, one file handle per process '''
+
+    def __init__(self, path=None, total=None, live=False, stream=None):
+        self.path = path
+        self.total = total
+        self.live = live
+        self.stream = sys.stderr if stream is None else stream
+        self._file = None
+        self._pid = None
+        self.start = time.time()
+        self.cases = 0
+        self.case = None
+        self.caseStart = self.start
+        self._shown = 0.0
+
+    def __getstate__(self):
+        # Workers append to the same file, the progress line stays with the parent
+        return {'path': self.path, 'start': self.start}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+        self.start = state['start']
+
+    def _write_line(self, text):
+        if self.path is None:
+            return
+        if self._file is None or self._pid != os.getpid():
+            self._file = open(self.path, 'a')
+            self._pid = os.getpid()
+        # One write per record, so records of concurrent workers don't interleave
+        self._file.write(text + '\n')
+        self._file.flush()
+
+    def start_case(self, case):
+        self.cases += 1
+        self.case = case
+        self.caseStart = time.time()
+
+    def eta(self):
+        ''' Seconds to the end of the sweep, from the mean time of the finished cases, or None '''
+        if not self.total or self.cases < 2:
+            return None
+        elapsed = self.caseStart - self.start
+        return elapsed / (self.cases - 1) * (self.total - self.cases + 1) - (time.time() - self.caseStart)
+
+    def write(self, iteration, objective, violation, x):
+        now = time.time()
+        record = {'case': self.case, 'iteration': int(iteration), 'objective': float(objective),
+                  'violation': float(violation), 'x': [float(value) for value in x],
+                  'seconds': now - self.caseStart, 'sweepSeconds': now - self.start}
+        self._write_line(json.dumps(record, sort_keys=True))
+        if self.live and now - self._shown >= LIVE_INTERVAL:
+            self.show(iteration, objective, violation)
+            self._shown = now
+
+    def show(self, iteration, objective, violation):
+        eta = self.eta()
+        self.stream.write('\rcase {}{} ({})  iteration {:4d}  DOC ($) {:9.4f}  maxcv {:9.3e}  {:7.1f} s  ETA {}'.format(
+            self.cases, '/{}'.format(self.total) if self.total else '', self.case, int(iteration), objective,
+            violation, time.time() - self.start, '{:7.1f} s'.format(max(eta, 0.0)) if eta is not None else '-'))
+        self.stream.flush()
+
+    def close(self):
+        if self.live:
+            self.stream.write('\n')
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class TelemetryRecorder(BaseRecorder):
+    ''' OpenMDAO recorder of the sub.driver: objective, maximum constraint violation and design vector of
+        every iteration, a new case each time the driver restarts its iteration count '''
+
+    def __init__(self, driver, log, case='indep1.range', design=DESIGN_UNKNOWNS):
+        super(TelemetryRecorder, self).__init__()
+        self.options['record_metadata'] = False
+        self.options['record_unknowns'] = False
+        self.options['record_derivs'] = False
+        self.driver = driver
+        self.log = log
+        self.caseVariable = case
+        self.design = list(design)
+
+    def record_metadata(self, group):
+        pass
+
+    def record_derivatives(self, derivs, metadata):
+        pass
+
+    def record_iteration(self, params, unknowns, resids, metadata):
+        if self.driver.iter_count <= 1:
+            self.log.start_case(float(unknowns[self.caseVariable]) if self.caseVariable in unknowns
+                                else self.log.cases + 1)
+        objective = list(self.driver.get_objectives().values())[0]
+        violation = 0.0
+        meta = self.driver.get_constraint_metadata()
+        for name, value in self.driver.get_constraints().items():
+            if meta[name]['lower'] is not None:
+                violation = max(violation, np.max(meta[name]['lower'] - value))
+            if meta[name]['upper'] is not None:
+                violation = max(violation, np.max(value - meta[name]['upper']))
+            if meta[name]['equals'] is not None:
+                violation = max(violation, np.max(np.abs(value - meta[name]['equals'])))
+        if all(name in unknowns for name in self.design):
+            x = np.concatenate([np.ravel(unknowns[name]) for name in self.design])
+        else:
+            # No scale components: the desvars feed the model, less the scaler and adder get_desvars() applies
+            desvarMeta = self.driver.get_desvar_metadata()
+            x = np.concatenate([np.ravel(value / desvarMeta[name]['scaler'] - desvarMeta[name]['adder'])
+                                for name, value in self.driver.get_desvars().items()])
+        self.log.write(self.driver.iter_count, np.ravel(objective)[0], violation, x)
+
+    def close(self):
+        self.log.close()
+
+
+class OptimizerTelemetry(object):
+    ''' Monitor of optimize_design writing every model evaluation of one case to a TelemetryLog '''
+
+    def __init__(self, log, case, Vehicle, columns, offset=0):
+        self.log = log
+        self.bounds = np.array(DESIGN_BOUNDS[vehicle_key(Vehicle)])
+        self.Vehicle = Vehicle
+        self.columns = list(columns)
+        self.offset = offset
+        log.start_case(case)
+
+    def __call__(self, xScaled, result, nfev):
+        x = np.ravel(to_design(self.Vehicle, xScaled))
+        violation = max(0.0, np.max(-result['margins'][0, self.columns]),
+                        np.max(self.bounds[:, 0] - x), np.max(x - self.bounds[:, 1]))
+        self.log.write(self.offset + nfev, result['DOC'][0], violation, x)
+
+
+def read_telemetry(path):
+    ''' {case: records in iteration order} of a telemetry file '''
+    cases = {}
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            cases.setdefault(record['case'], []).append(record)
+    for records in cases.values():
+        records.sort(key=lambda record: record['iteration'])
+    return cases
+
+
+if __name__ == "__main__":
+    # Telemetry of a 5 level range sweep of test/vahana_optimizer.py's sub-problem, then iterations per case and
+    # the iteration from which on the DOC stayed within 0.1% of its final value (what a looser tol would save).
+    # The violation is left out of that test: it is in the raw units of each constraint, so a fixed threshold
+    # only holds on the last iterations of a case (see design_optimizer.constraint_violation for a normalized one)
+    import tempfile
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test'))
+    from openmdao.api import Problem, ScipyOptimizer
+    from vahana_optimizer import TopLevelSystem
+
+    path = os.path.join(tempfile.mkdtemp(), 'telemetry.jsonl')
+    ranges = np.linspace(10000.0, 200000.0, 5)
+    log = TelemetryLog(path, total=len(ranges), live=True)
+    sub = Problem(root=TopLevelSystem())
+    sub.driver = ScipyOptimizer()
+    sub.driver.options['optimizer'] = 'COBYLA'
+    sub.driver.options['disp'] = False
+    sub.driver.options['maxiter'] = 1000
+    sub.driver.options['tol'] = 0.01
+    for var, lower, upper in (('indep2.rProp', 30.0, 200.0), ('indep3.cruiseSpeed', 45.5, 80.0),
+                              ('indep4.batteryMass', 1.0, 99.90), ('indep5.motorMass', 0.10, 99.90),
+                              ('indep6.mtom', 1.0, 99.990)):
+        sub.driver.add_desvar(var, lower=lower, upper=upper)
+        sub.driver.add_constraint(var, lower=lower, upper=upper)
+    sub.driver.add_objective('OperatingCost.C_costPerFlight')
+    for con in ('con1.c1', 'con2.c2', 'con3.c3'):
+        sub.driver.add_constraint(con, lower=0.0)
+    sub.driver.add_recorder(TelemetryRecorder(sub.driver, log))
+    sub.setup(check=False)
+    for r in ranges:
+        for var, value in (('indep2.rProp', 100.0), ('indep3.cruiseSpeed', 50.0), ('indep4.batteryMass', 11.70),
+                           ('indep5.motorMass', 3.00), ('indep6.mtom', 6.500)):
+            sub[var] = value
+        sub['indep1.range'] = r
+        sub.run()
+    sub.cleanup()
+
+    for case, records in sorted(read_telemetry(path).items()):
+        final = records[-1]
+        settled = None
+        for record in records:
+            if abs(record['objective'] - final['objective']) <= 1e-3 * abs(final['objective']):
+                settled = record['iteration'] if settled is None else settled
+            else:
+                settled = None
+        print('Range (km): {:6.1f}  iterations: {:4d}  DOC ($): {:8.4f}  maxcv: {:.2e}  within 0.1% from: {}  {:.2f} s'
+              .format(case / 1000.0, final['iteration'], final['objective'], final['violation'],
+                      '-' if settled is None else settled, final['seconds']))
@@ -22,7 +22,7 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
 
 class tenth(Component):
     def __init__(self):
@@ -0,0 +1,75 @@
+'''
+# Name: test_compact_recorder.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Testing: compact_recorder.CompactRecorder re-using its output file
+
+# Two optimizer runs recorded into the same path must leave only the second
+# run in the file (as SqliteRecorder does), so read_compact can reshape it.
+
+# Usage:
+#   python -m unittest discover -s scripts/test -p "test_compact_recorder.py"
+'''
+
+from __future__ import print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openmdao.api import Problem, Group, IndepVarComp, ExecComp, ScipyOptimizer
+
+from compact_recorder import CompactRecorder, read_compact
+
+
+def _run(path, start):
+    ''' Minimize (x - 3)^2 + (y + 1)^2 with COBYLA from x = y = start, recorded to path '''
+    top = Problem(root=Group())
+    top.root.add('indep1', IndepVarComp('x', start))
+    top.root.add('indep2', IndepVarComp('y', start))
+    top.root.add('con1', ExecComp('c1 = (x - 3.0)**2 + (y + 1.0)**2'))
+    top.root.connect('indep1.x', 'con1.x')
+    top.root.connect('indep2.y', 'con1.y')
+    top.driver = ScipyOptimizer()
+    top.driver.options['optimizer'] = 'COBYLA'
+    top.driver.options['disp'] = False
+    top.driver.add_desvar('indep1.x', lower=-10.0, upper=10.0)
+    top.driver.add_desvar('indep2.y', lower=-10.0, upper=10.0)
+    top.driver.add_objective('con1.c1')
+    top.driver.add_recorder(CompactRecorder(path, includes=['indep*', 'con*.c*']))
+    top.setup(check=False)
+    top.run()
+    top.cleanup()
+    return top
+
+
+class TestCompactRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'compact')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_reused_path(self):
+        _run(self.path, 0.0)
+        top = _run(self.path, 5.0)
+        names, counters, coords, values = read_compact(self.path)
+        self.assertEqual(names, ['con1.c1', 'indep1.x', 'indep2.y'])
+        self.assertEqual(values.shape, (len(counters), 3))
+        # Only the iterations of the second run, which starts at x = y = 5 and ends at the optimum
+        self.assertEqual(counters, list(range(1, len(counters) + 1)))
+        self.assertEqual(list(values[0, 1:]), [5.0, 5.0])
+        self.assertAlmostEqual(values[-1, 1], top['indep1.x'])
+        self.assertAlmostEqual(values[-1, 2], top['indep2.y'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+'''
+# Name: test_telemetry.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Testing: telemetry.TelemetryRecorder and telemetry.OptimizerTelemetry log the same design vector
+
+# Both hooks write the same record format, so the same design (vahana_optimizer.py's
+# start point) must be logged in the same (model) units by both.
+
+# Usage:
+#   python -m unittest discover -s scripts/test -p "test_telemetry.py"
+'''
+
+from __future__ import print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from openmdao.api import Problem, Driver
+
+from design_optimizer import MODEL_CONSTRAINTS
+from telemetry import TelemetryLog, TelemetryRecorder, OptimizerTelemetry, read_telemetry
+from vahana_batch import evaluate_batch
+from vahana_optimizer import TopLevelSystem
+
+# indep2 .. indep6 of vahana_optimizer.py (optimizer units)
+START = np.array([100.0, 50.0, 11.70, 3.00, 6.500])
+
+
+class TestTelemetryUnits(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_same_design(self):
+        path = os.path.join(self.directory, 'recorder.jsonl')
+        sub = Problem(root=TopLevelSystem())
+        sub.driver = Driver()
+        for var in ('indep2.rProp', 'indep3.cruiseSpeed', 'indep4.batteryMass', 'indep5.motorMass', 'indep6.mtom'):
+            sub.driver.add_desvar(var)
+        sub.driver.add_objective('OperatingCost.C_costPerFlight')
+        sub.driver.add_recorder(TelemetryRecorder(sub.driver, TelemetryLog(path)))
+        sub.setup(check=False)
+        sub['indep1.range'] = 50000.0
+        sub.run()
+        sub.cleanup()
+        recorded = read_telemetry(path)[50000.0][0]['x']
+
+        path = os.path.join(self.directory, 'monitor.jsonl')
+        log = TelemetryLog(path)
+        x = START * np.array([0.01, 1.0, 10.0, 10.0, 100.0])
+        OptimizerTelemetry(log, 50000.0, u'tiltwing', MODEL_CONSTRAINTS['tiltwing'])(
+            START, evaluate_batch(u'tiltwing', 50000.0, *x), 1)
+        log.close()
+        monitored = read_telemetry(path)[50000.0][0]['x']
+
+        self.assertTrue(np.allclose(recorded, monitored, rtol=1e-12), (recorded, monitored))
+        self.assertTrue(np.allclose(recorded, [1.0, 50.0, 117.0, 30.0, 650.0], rtol=1e-12), recorded)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+'''
+# Name: test_vahana_batch.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Testing: vahana_batch.evaluate_batch with a nan design point in the batch
+
+# The loiter speed search (_minimize_scalar) runs over all rows of a batch at
+# once; a nan row must not change the results of the other rows, in the small
+# (<= 64 rows) and in the golden-section (large batch) search.
+
+# Usage:
+#   python -m unittest discover -s scripts/test -p "test_vahana_batch.py"
+'''
+
+from __future__ import print_function
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vahana_batch import evaluate_batch
+
+
+def _designs(n):
+    ''' n designs around (rProp, cruiseSpeed, mBattery, mMotors, mtom) = (3, 50, 117, 30, 650) '''
+    x = np.tile(np.array([3.0, 50.0, 117.0, 30.0, 650.0]), (n, 1))
+    x[:, 1] += np.linspace(0.0, 20.0, n)
+    return x
+
+
+class TestNanRow(unittest.TestCase):
+
+    def check(self, Vehicle, n):
+        x = _designs(n)
+        xNan = x.copy()
+        xNan[0, 1] = np.nan
+        result = evaluate_batch(Vehicle, 50000.0, *x.T)
+        resultNan = evaluate_batch(Vehicle, 50000.0, *xNan.T)
+        for name, value in result.items():
+            if np.ndim(value):
+                self.assertTrue(np.array_equal(np.asarray(value)[1:], np.asarray(resultNan[name])[1:]), name)
+
+    def test_small_batch(self):
+        self.check(u'helicopter', 10)
+
+    def test_large_batch(self):
+        self.check(u'helicopter', 100)
+        self.check(u'tiltwing', 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -27,7 +27,7 @@ import csv  # for data export
 
 # OpenMDAO imports
 from openmdao.api import Problem, Group, Component, IndepVarComp, ExecComp, \
-                         ScipyOptimizer, SubProblem, FullFactorialDriver, \
+                         SubProblem, FullFactorialDriver, \
                          SqliteRecorder  
  
 # Recorder import
@@ -46,6 +46,7 @@ from fuselage_mass import fuselage_mass
 from config_weight import config_weight
 from tooling_cost import tooling_cost
 from operating_cost import operating_cost
+from penalty_optimizer import PenaltyScipyOptimizer
 
 # Group imports
 
@@ -241,7 +242,7 @@ if __name__ == '__main__':
     sub = Problem(root=TopLevelSystem())
     
     # SubProblem: set up the optimizer
-    sub.driver = ScipyOptimizer()
+    sub.driver = PenaltyScipyOptimizer()  # AnalysisError points are infeasible, see penalty_optimizer.py
     sub.driver.options['optimizer'] = 'COBYLA'  # The 'COBYLA' optimizer is supported by OpenMETA. 
                                                 # Unlike the 'SLSQP' optimizer, the 'COBYLA' optimizer doesn't require a Jacobian matrix.
     sub.driver.options['disp'] = True  # enable optimizer output
@@ -26,7 +26,7 @@ import math
 
 # OpenMDAO imports
 from openmdao.api import Problem, Group, Component, IndepVarComp, ExecComp, \
-                         ScipyOptimizer, SqliteRecorder  
+                         SqliteRecorder  
  
 # Recorder import
 import sqlitedict  
@@ -43,6 +43,7 @@ from wire_mass import wire_mass
 from config_weight import config_weight
 from tooling_cost import tooling_cost
 from operating_cost import operating_cost
+from penalty_optimizer import PenaltyScipyOptimizer
 
 # Group imports
 
@@ -216,7 +217,7 @@ if __name__ == '__main__':
     top.root = TopLevelSystem()
     
     # SubProblem: set up the optimizer
-    top.driver = ScipyOptimizer()
+    top.driver = PenaltyScipyOptimizer()  # AnalysisError points are infeasible, see penalty_optimizer.py
     top.driver.options['optimizer'] = 'COBYLA'  # The 'COBYLA' optimizer is supported by OpenMETA. 
                                                 # Unlike the 'SLSQP' optimizer, the 'COBYLA' optimizer doesn't require a Jacobian matrix.
     top.driver.options['disp'] = True  # enable optimizer output
@@ -27,7 +27,8 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component, IndepVarComp, Problem, Group
+from openmdao.core.component import Component
+from analysis_errors import AnalysisError, analysis_errors
 import math
 
 class tooling_cost(Component):
@@ -41,6 +42,7 @@ class tooling_cost(Component):
         
         self.add_output('toolCostPerVehicle', val=0.0)
     
+    @analysis_errors
     def solve_nonlinear(self, params, unknowns, resids):
         # Assumed values
         fuselageWidth = 1.0
@@ -177,12 +179,14 @@ class tooling_cost(Component):
             # Total tool cost
             totalToolCost = fuselageToolCost+rotorToolCost+tailRotorToolCost
         else:
-            pass
+            raise AnalysisError('Unrecognized vehicle: {}'.format(params['Vehicle']))
             
         unknowns['toolCostPerVehicle'] = totalToolCost / params['partsPerTool']
 
         
 if __name__ == "__main__":
+    from openmdao.api import Problem, Group, IndepVarComp
+
     top = Problem()
     root = top.root = Group()
     
@@ -0,0 +1,742 @@
+'''
+# Name: vahana_batch.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Vectorized version of the TopLevelSystem models in test/vahana_optimizer.py
+# (tiltwing) and test/vahana_optimizer_helicopter.py (helicopter)
+
+# Evaluates CruisePower, HoverPower, LoiterPower, WingMass, CanardMass, PropMass,
+# PropMass_Tail, WireMass, FuselageMass, ConfigWeight, ToolingCost, SimpleMission,
+# ReserveMission, OperatingCost and the con1 .. con4 constraints for arrays of
+# design points of one vehicle at once. The model is split in two stages:
+# physics_batch (everything that does not depend on range) and range_batch
+# (missions, operating cost and constraints), so a range sweep re-uses the
+# physics of each design.
+
+# The only departures from the component code are the helicopter loiter speed,
+# found by a vectorized bracketing search instead of scipy's fminbound
+# (same 1e-5 m/s tolerance), and the wing / blade section properties, which are
+# computed once for a unit chord and scaled.
+
+# Inputs (scalars or arrays that broadcast to a common length N):
+#   Vehicle         - vehicle type ('tiltwing' or 'helicopter'), one per call
+#   range           - mission range [m]
+#   rProp           - prop/rotor radius [m]
+#   cruiseSpeed     - cruise speed [m/s]
+#   mBattery        - battery mass [kg]
+#   mMotors         - motor mass [kg]
+#   mtom            - maximum take-off mass [kg]
+
+# "What If" Inputs (optional, default to the component assumptions, see ASSUMPTIONS):
+#   rotorTipMaxMachNumber   - tiltwing hover tip Mach number (hover_power_what_if.py)
+#   wingProfileCD           - tiltwing wing profile drag coefficient (cruise_power_what_if.py)
+#   etaMotor                - electric motor efficiency
+#   motorPowerDensity       - [kW / kg] (constraint2_what_if.py)
+#   batteryEnergyDensity, batteryCost, ... - see operating_cost_batch.ECONOMICS
+
+# Outputs:
+#   physics_batch   - {output name: (N,) array}
+#   range_batch     - adds E, flightTime, EReserve, costs (structured array),
+#                     DOC [$], margins (N, 6) and feasible (N,) to the physics
+'''
+
+from __future__ import print_function
+
+import math
+
+import numpy as np
+
+from vehicle import TILTWING, HELICOPTER, vehicle_key
+from operating_cost_batch import DEFAULT_ECONOMICS, operating_cost_batch
+from constraints_batch import constraint_margins, feasible
+
+# Design variables, in evaluate_batch argument order (after range)
+DESIGN_VARIABLES = ('rProp', 'cruiseSpeed', 'mBattery', 'mMotors', 'mtom')
+
+# Physics assumptions that can be varied per design point
+DEFAULT_PHYSICS = {'rotorTipMaxMachNumber': 0.65,
+                   'wingProfileCD': 0.012,
+                   'etaMotor': 0.85,
+                   'motorPowerDensity': 5.0}  # [kW / kg]
+
+DEFAULT_ASSUMPTIONS = dict(DEFAULT_PHYSICS, **DEFAULT_ECONOMICS)
+
+ASSUMPTIONS = tuple(sorted(DEFAULT_ASSUMPTIONS))
+
+# Model constants set by IndepVarComps in the optimizers
+payload = 113.398  # [kg]
+partsPerTool = 1000.0
+
+rho = 1.225  # Sea level air density [kg/m^3]
+sound = 340.2940  # Speed of sound [m/s]
+
+# Material properties shared by the structural models
+uni_rho = 1660.0
+uni_stress = 450.0e6
+bid_rho = 1660.0
+bid_shear = 47.0e6
+bid_minThk = 0.00042
+bid_bearing = 400.0e6
+core_rho = 52.0
+core_minThk = 0.0064
+glue_thk = 2.54e-4
+glue_rho = 1800.0
+rib_thk = 0.0015
+rib_width = 0.0254
+paint_thk = 0.00015
+paint_rho = 1800.0
+alum_stress = 350.0e6
+alum_rho = 2800.0
+canopy_thk = 0.003175
+canopy_rho = 1180.0
+steel_shear = 500.0e6
+
+
+def _polyarea(x1, y1):
+    return 0.5*np.abs(np.dot(x1, np.roll(y1, 1))-np.dot(y1, np.roll(x1, 1)))
+
+
+def _naca_coord(toc, stations, xShear=0.25):
+    ''' NACA 4-series airfoil coordinates for a unit chord, as in wing_mass.py / prop_mass.py '''
+    naca = 5.0 * toc * np.array([0.2969, -0.1260, -0.3516, 0.2843, -0.1015]).reshape(-1, 1)
+    coord = np.unique(stations).reshape(-1, 1)
+    tmpCol = coord[:, 0].reshape(-1, 1)
+    tmpArr = np.dot(np.concatenate((tmpCol ** 0.5, tmpCol, tmpCol ** 2.0, tmpCol ** 3.0, tmpCol ** 4.0), 1), naca)
+    coord = np.concatenate((coord, tmpArr), 1)
+    coord = np.concatenate((np.flipud(coord[1:, :]), np.dot(coord, np.array([[1, 0], [0, -1]]))))
+    coord[:, 0] = coord[:, 0] - xShear
+    return coord
+
+
+def _trim(coord, lower=None, upper=None):
+    box = np.copy(coord)
+    if upper is not None:
+        box[box[:, 0] > upper, :] = 0
+    if lower is not None:
+        box[box[:, 0] < lower, :] = 0
+    return box[~np.all(box == 0, axis=1)]
+
+
+def _caps(box):
+    ''' Upper and lower segments of a trimmed airfoil box '''
+    return box[box[:, 1] > np.mean(box[:, 1]), :], box[box[:, 1] < np.mean(box[:, 1]), :]
+
+
+def _interp(x, xp, fp):
+    ''' Linear interpolation at x of unsorted points (interp1d, without importing scipy at load) '''
+    order = np.argsort(xp)
+    return np.interp(x, xp[order], fp[order])
+
+
+def _wing_section():
+    ''' Unit chord section properties of wing_mass.py '''
+    fwdWeb = np.array([0.25, 0.35]) - 0.25
+    aftWeb = np.array([0.65, 0.75]) - 0.25
+    coord = _naca_coord(0.15, np.concatenate((fwdWeb + 0.25, aftWeb + 0.25, np.linspace(0, 1, 10))))
+
+    section = {}
+    box = _trim(coord, fwdWeb[0], aftWeb[1])
+    section['torsionArea'] = _polyarea(box[:, 0], box[:, 1])
+    section['torsionLength'] = np.sum(np.sqrt(np.sum(np.diff(box, axis=0)**2, 1)))
+
+    flap = _caps(_trim(coord, fwdWeb[0], fwdWeb[1]))
+    drag = _caps(_trim(coord, aftWeb[0], aftWeb[1]))
+    section['flapInertia'] = section['flapLength'] = section['dragInertia'] = section['dragLength'] = 0.0
+    for i, seg in enumerate(flap + drag):
+        l = np.sqrt(np.sum(np.diff(seg, axis=0)**2.0, 1))
+        c = (seg[1:, :] + seg[0:-1, :])/2.0
+        if i < 2:
+            section['flapInertia'] += abs(np.sum(l*c[:, 1]**2))
+            section['flapLength'] += np.sum(l)
+        else:
+            section['dragInertia'] += abs(np.sum(l*c[:, 0]**2))
+            section['dragLength'] += np.sum(l)
+    section['flapHeight'] = np.max(flap[0][:, 1])
+    section['dragWidth'] = np.max(drag[0][:, 0])
+
+    box = _trim(coord, upper=fwdWeb[1])
+    zUpper = _interp(fwdWeb[0], box[box[:, 1] > 0, 0], box[box[:, 1] > 0, 1])
+    zLower = _interp(fwdWeb[0], box[box[:, 1] < 0, 0], box[box[:, 1] < 0, 1])
+    section['h'] = float(zUpper - zLower)
+
+    section['skinLength'] = np.sum(np.sqrt(np.sum(np.diff(coord, axis=0)**2, 1)))
+    section['A'] = _polyarea(coord[:, 0], coord[:, 1])
+    return section
+
+
+def _blade_section():
+    ''' Unit chord section properties of prop_mass.py '''
+    fwdWeb = np.array([0.25, 0.35]) - 0.25
+    coord = _naca_coord(0.12, np.concatenate((fwdWeb + 0.25, np.linspace(0, 1, 5))))
+
+    section = {}
+    section['skinLength'] = np.sum(np.sqrt(np.sum(np.diff(coord, axis=0)**2, 1)))
+    section['thickness'] = (np.max(coord[:, 1]) - np.min(coord[:, 1]))/2.0
+    section['Ae'] = _polyarea(coord[:, 0], coord[:, 1])
+
+    section['capInertia'] = section['capLength'] = 0.0
+    for seg in _caps(_trim(coord, fwdWeb[0], fwdWeb[1])):
+        l = np.sqrt(np.sum(np.diff(seg, axis=0)**2.0, 1))
+        c = (seg[1:, :] + seg[0:-1, :])/2.0
+        section['capInertia'] += abs(np.sum(l*c[:, 1]**2))
+        section['capLength'] += np.sum(l)
+
+    box = _trim(coord, upper=fwdWeb[1])
+    z = box[box[:, 0] == fwdWeb[0], 1]
+    section['shearHeight'] = abs(z[0]-z[1])
+
+    box = np.copy(coord)
+    box[box[:, 0] < fwdWeb[0], :] = 0
+    section['coreArea'] = _polyarea(box[:, 0], box[:, 1])
+    section['maxAbsY'] = np.max(np.abs(box[:, 1]))
+    section['rRoot'] = np.max(coord[:, 1]) - np.min(coord[:, 1])/2.0  # Fitting diam is thickness
+    return section
+
+
+WING_SECTION = _wing_section()
+BLADE_SECTION = _blade_section()
+
+
+def _tip_integral(f, x):
+    ''' Integral of f from each station to the tip, rows are design points:
+        [sum(f[k]*(x[k+1]-x[k]) for k in j..N-2) for j in 0..N-1] '''
+    out = np.zeros_like(f)
+    out[:, :-1] = np.cumsum((f[:, :-1] * np.diff(x, axis=1))[:, ::-1], axis=1)[:, ::-1]
+    return out
+
+
+def wing_mass_batch(W, span, chord, winglet, fc, rProp, thrust):
+    ''' Vectorized wing_mass.py: mass of one lifting surface [kg] '''
+    sf = 1.5  # Safety factor
+    n = 3.8  # Maximum g's
+    cmocl = 0.02 / 1  # Ratio of cm/cl for sizing torsion (magnitude)
+    LoD = 7  # For drag loads
+    fudge = 1.2  # Scale up mass by this to account for misc components
+    s = WING_SECTION
+
+    xmotor = np.column_stack((2*(0.5 + rProp)/span, 2*(0.5 + 3*rProp + 0.05)/span)) * (span / 2.0)[:, None]
+    nRibs = xmotor.shape[1] + 2.0
+
+    # Beam Geometry
+    x = np.concatenate((np.linspace(0, 1, 10), np.linspace(1, 1 + winglet, 10)))[None, :] * (span / 2.0)[:, None]
+    x = np.sort(np.concatenate((x, xmotor), axis=1), axis=1)
+    dx = x[:, 1] - x[:, 0]
+    N = x.shape[1]
+
+    # Loads
+    L = (1 - (x / np.amax(x, axis=1)[:, None]) ** 2.0) ** (1.0 / 2.0)  # Elliptic lift distribution profile
+    L0 = 0.5 * n * W * fc * sf  # Total design lift force on surface
+    L = (L0 / np.sum(L[:, 0:N - 1] * np.diff(x, axis=1), axis=1))[:, None] * L  # Lift distribution
+
+    T = L * (chord * cmocl)[:, None]  # Torque distribution
+    D = L / LoD  # Drag distribution
+
+    Vx = _tip_integral(D, x)  # Shear due to drag
+    Vz = _tip_integral(L, x)  # Shear due to lift
+    Vt = thrust[:, None] * np.sum(x[:, None, :] <= xmotor[:, :, None], axis=1)  # Shear due to thrust
+
+    Mx = _tip_integral(Vz, x)  # Bending moment
+    My = _tip_integral(T, x)  # Torsion moment
+    Mz = np.maximum(_tip_integral(Vx, x), _tip_integral(Vt, x))  # Worst case of drag and thrust moment
+
+    c = chord[:, None]
+
+    # Torsion Analysis: all torsion taken in skin
+    torsionLength = s['torsionLength']*c
+    tTorsion = np.maximum(My*dx[:, None]/(2*bid_shear*s['torsionArea']*c**2), bid_minThk)
+    mTorsion = tTorsion*torsionLength*bid_rho  # Mass for torsion
+    mCore = core_minThk*torsionLength*core_rho  # Core mass
+    mGlue = glue_thk*glue_rho*torsionLength
+
+    # Flap Bending Analysis
+    flapLength = s['flapLength']*c
+    tFlap = Mx*(s['flapHeight']*c)/(s['flapInertia']*c**3*uni_stress)
+    mFlap = tFlap*flapLength*uni_rho
+    mGlue = mGlue+glue_thk*glue_rho*flapLength
+
+    # Drag Bending Analysis
+    dragLength = s['dragLength']*c
+    tDrag = Mz*(s['dragWidth']*c)/(s['dragInertia']*c**3*uni_stress)
+    mDrag = tDrag*dragLength*uni_rho
+    mGlue = mGlue+glue_thk*glue_rho*dragLength
+
+    # Shear Web Analysis: all shear taken in shear web
+    h = s['h']*c
+    mShear = np.maximum(1.5*Vz/(bid_shear*h), bid_minThk)*h*bid_rho
+
+    # Paint weight
+    mPaint = s['skinLength']*c*paint_thk*paint_rho
+
+    # Section mass
+    m = mTorsion+mCore+mFlap+mDrag+mShear+mGlue+mPaint
+
+    # Rib weight
+    mRib = (s['A']*chord**2+s['skinLength']*chord*rib_width)*rib_thk*alum_rho
+
+    return 2*(np.sum(m[:, 0:-1]*np.diff(x, axis=1), axis=1)+nRibs*mRib)*fudge
+
+
+def prop_mass_batch(rProp, thrust, tolerance=1e-8):
+    ''' Vectorized prop_mass.py: blade mass of one propeller [kg] '''
+    nBlades = 3.0  # Number of blades
+    N = 5  # Number of radial points
+    sf = 1.5  # Safety factor
+    fudge = 1.2  # Fudge factor to account for misc items
+    tipMach = 0.65  # Tip mach number
+    cmocl = 0.02 / 1.0  # Ratio of cm/cl for sizing torsion (magnitude)
+    s = BLADE_SECTION
+
+    chord = 0.1 * rProp  # Assumed prop chord
+    rootLength = rProp / 10.0  # Root fitting length [m]
+
+    # Beam Geometry
+    x = rProp[:, None] * np.linspace(0, 1, N)[None, :]
+    dx = x[:, 1] - x[:, 0]
+
+    # Loads
+    omega = sound*tipMach/rProp  # Rotational speed (for CF calc)
+    F = (sf*3.0*thrust/(rProp**3.0)/nBlades)[:, None]*(x**2.0)  # Force distribution
+    Q = F*(chord*cmocl)[:, None]  # Torque distribution
+
+    # Section properties
+    skinLength = s['skinLength']*chord
+    Ae = s['Ae']*chord**2
+    capLength = s['capLength']*chord
+    capInertia = s['capInertia']*chord**3
+    shearHeight = s['shearHeight']*chord
+    coreArea = s['coreArea']*chord**2
+    rRoot = s['rRoot']*chord
+
+    # Initial mass estimates
+    M0 = sf*thrust/nBlades*0.75*rProp  # Bending moment
+    m = uni_rho*dx*M0/(2*uni_stress*s['thickness']*chord)+skinLength*bid_minThk*dx*bid_rho
+    m = m[:, None]*np.ones(N)
+    massOld = np.sum(m, axis=1)
+
+    # Shear/Moment Calcs
+    Vz = _tip_integral(F, x)  # Shear due to lift
+    Mx = _tip_integral(Vz, x)  # Flap moment
+    My = _tip_integral(Q, x)  # Torsion moment
+
+    # Mass terms that don't depend on the centripetal force
+    mTorsion = np.maximum(My/(2.0*bid_shear*Ae[:, None]), bid_minThk)*skinLength[:, None]*bid_rho
+    mShear = np.maximum(1.5*Vz/(bid_shear*shearHeight[:, None]), bid_minThk)*shearHeight[:, None]*bid_rho
+    mFixed = mTorsion + (coreArea*core_rho + glue_thk*glue_rho*capLength +
+                         skinLength*paint_thk*paint_rho + glue_thk*glue_rho*skinLength)[:, None] + mShear
+    mFlapBending = Mx*(s['maxAbsY']*chord)[:, None]/(capInertia[:, None]*uni_stress)
+    mRib = (Ae+skinLength*rib_width)*rib_thk*alum_rho
+    MxMax = np.max(Mx, axis=1)
+
+    # Fixed point iteration on the centripetal force, each design stops once converged
+    mass = massOld
+    active = np.ones(rProp.shape, dtype=bool)
+    while np.any(active):
+        CF = (sf*(omega**2))[:, None]*_tip_integral(m * x, x)  # Centripetal force
+        tFlap = CF/(capLength*uni_stress)[:, None] + mFlapBending
+        m = mFixed + tFlap*capLength[:, None]*uni_rho
+
+        t = np.max(CF, axis=1)/(2.0*math.pi*rRoot*alum_stress) + MxMax/(3.0*math.pi*(rRoot**2)*alum_stress)
+        mRoot = 2.0*math.pi*rRoot*t*rootLength*alum_rho
+
+        massNew = nBlades*(np.sum(m[:, 0:-1] * np.diff(x, axis=1), axis=1)+2.0*mRib+mRoot)
+        mass = np.where(active, massNew, mass)
+        active &= np.abs(massNew-massOld) > tolerance
+        massOld = massNew
+
+    return fudge*mass
+
+
+def fuselage_mass_batch(length, width, height, span, weight):
+    ''' Vectorized fuselage_mass.py [kg] '''
+    ng = 3.8  # Max g lift
+    nl = 3.5  # Landing load factor
+    sf = 1.5  # Safety factor
+
+    arealWeight = bid_minThk * bid_rho + core_minThk * core_rho + paint_thk * paint_rho
+
+    Swet = 4.0 * math.pi * (((length * width / 4.0) ** 1.6 + (length * height / 4.0) ** 1.6 +
+                             (width * height / 4.0) ** 1.6) / 3.0) ** (1.0 / 1.6)
+    skinMass = Swet * arealWeight
+    bulkheadMass = 3 * math.pi * height * width / 4 * arealWeight
+    canopyMass = Swet / 8 * canopy_thk * canopy_rho
+
+    # Keel Mass due to lift
+    L = ng * weight * sf  # Lift
+    M = L * length / 2  # Peak moment
+    beamWidth = width / 3  # Keel width
+    beamHeight = height / 10  # Keel height
+    A = M * beamHeight / (4 * uni_stress * (beamHeight / 2) ** 2)
+    massKeel = A * length * uni_rho
+
+    # Keel Mass due to torsion
+    M = 0.25 * L * span / 2  # Wing torsion
+    A = beamHeight * beamWidth
+    t = 0.5 * M / (bid_shear * A)
+    massKeel = massKeel + 2 * (beamHeight + beamWidth) * t * bid_rho
+
+    # Keel Mass due to landing
+    F = sf * weight * nl * math.sqrt(1 ** 2 + 0.8 ** 2) / 2.0  # Landing force, side landing
+    A = F / steel_shear  # Required bolt area
+    d = 2 * np.sqrt(A / math.pi)  # Bolt diameter
+    t = F / (d * bid_bearing)  # Laminate thickness
+    V = math.pi * (20 * t) ** 2 * t / 3  # Pad up volume
+    massKeel = massKeel + 4 * V * bid_rho  # Mass of all 4 pad ups
+
+    return skinMass + bulkheadMass + canopyMass + massKeel
+
+
+def wire_mass_batch(span, fuselageLength, fuselageHeight, power, rProp, nMotors):
+    ''' Vectorized wire_mass.py (nMotors=8) and wire_mass_helicopter.py (nMotors=1) [kg] '''
+    if nMotors == 8:
+        xmotorSpan = 4 * (2.0*(0.5 + rProp)/span + 2.0*(0.5 + 3.0*rProp + 0.05)/span) * span / 2.0
+    else:
+        xmotorSpan = 0.0 * span / 2.0
+    cableDensity = 1e-5  # Approximate power cable pair density [kg/m/W]
+    L = nMotors * fuselageLength / 2.0 + nMotors * fuselageHeight / 2.0 + xmotorSpan
+    massCables = cableDensity * (power / nMotors) * L
+
+    wireDensity = 0.0046  # kg/m
+    wiresPerBundle = 6  # Wires per bundle
+    L = L + 10.0 * fuselageLength + 4.0 * span
+    massWires = 2.0 * wireDensity * wiresPerBundle * L
+    return massCables + massWires
+
+
+def _tooling_cost(length, width, depth):
+    ''' toolingCost() of tooling_cost.py on arrays [$] '''
+    toolSideOffset = 0.09
+    toolDepthOffset = 0.03
+    materialCost = 10000.0*(length+2*toolSideOffset)*(width+2*toolSideOffset)*(depth+toolDepthOffset)
+
+    # Machining (Rough Pass)
+    roughBitDiam = 0.05
+    roughFeed = 0.003*(3.82*200.0/(39.37*roughBitDiam))*2*0.00042
+    roughTime = (length*math.pi*depth*width/4) / (roughFeed*0.8*roughBitDiam*roughBitDiam/4)
+    roughCost = roughTime*150.0/3600.0
+
+    # Machining (Finish Pass)
+    finishBitDiam = 0.006
+    finishFeed = 0.004*(3.82*400/(39.37*finishBitDiam))*2.0*0.00042
+    a = width/2.0
+    b = depth
+    h = (a-b)**2.0 / (a+b)**2.0
+    p = math.pi*(a+b)*(1.0+3.0*h/(10.0+np.sqrt(4.0-3.0*h)))  # Ramanujan's 2nd approximation, 4-3h > 0 for h < 1
+    finishTime = (length*p/2.0) / (finishFeed*0.8*finishBitDiam) * 5.0
+    finishCost = finishTime*175.0/3600.0
+
+    return materialCost + roughCost + finishCost
+
+
+def tooling_cost_batch(Vehicle, rProp, bRef, cRef):
+    ''' Vectorized tooling_cost.py: tool cost per vehicle [$] '''
+    fuselageWidth = 1.0
+    fuselageLength = 5.0
+    toc = 0.15
+    propChord = 0.15*rProp
+    tc = _tooling_cost
+
+    if vehicle_key(Vehicle) == TILTWING:
+        fuselageHeight = 1.3
+        span = bRef
+        chord = cRef
+        xhinge = 0.8
+        winglet = 0.2
+
+        wingToolCost = 2.0*(2.0*(tc((span-fuselageWidth)/2.0, toc*chord, chord*.2) +
+                                 tc((span-fuselageWidth)/2.0, toc*chord*0.7, chord*.2) +
+                                 tc((span-fuselageWidth)/2.0, chord*0.75, 0.02)*2.0) +
+                            tc(span, toc*chord, chord*.20))
+        wingletToolCost = 4.0*(tc(winglet*span/2.0, toc*chord, chord*.2) +
+                               tc(winglet*span/2.0, toc*chord*0.7, chord*.2) +
+                               tc(winglet*span/2.0, chord*0.75, 0.02)*2.0 +
+                               tc(winglet*span/2.0, toc*chord, chord*.20))
+        canardToolCost = wingToolCost
+        propToolCost = 4.0*(tc(rProp, propChord, propChord*toc/2.0)*2.0 + tc(rProp, propChord*toc, propChord/4.0)*2.0)
+        controlToolCost = 8.0*2.0*tc((span-fuselageWidth)/2.0, (1.0-xhinge)*chord, chord*toc/4.0)
+        rotorToolCost = propToolCost + controlToolCost + wingToolCost + canardToolCost + wingletToolCost
+    else:
+        fuselageHeight = 1.6
+        rotorToolCost = 2.0*(tc(rProp, propChord, propChord*toc/2.0)*2.0 + tc(rProp, propChord*toc, propChord/4.0)*2.0)
+        rotorToolCost = rotorToolCost + \
+            2.0*(tc(rProp/4.0, propChord/4.0, propChord/4.0*toc/2.0)*2.0 +
+                 tc(rProp/4.0, propChord/4.0*toc, propChord/4.0/4.0)*2.0)
+
+    fuselageToolCost = 2.0*(tc(fuselageLength*.8, fuselageHeight, fuselageWidth/2.0)*2.0 +
+                            tc(fuselageLength*.8, fuselageWidth/2.0, fuselageHeight/4.0) +
+                            tc(fuselageWidth, fuselageHeight, 0.02)*2.0 +
+                            tc(fuselageLength*.1, fuselageWidth, fuselageHeight/3.0))
+
+    return (fuselageToolCost + rotorToolCost) / partsPerTool
+
+
+def _helicopter_power(V, W, rProp, omega, Ct, Cd0, sigma, SCdFuse):
+    ''' Forward flight power of the helicopter, as in cruise_power.py / loiter_power.py '''
+    D = 0.5 * rho * V**2 * SCdFuse  # Fuselage drag
+    alpha = np.arctan2(D, W)  # Inflow angle
+    mu = V * np.cos(alpha) / (omega * rProp)  # Advance ratio
+
+    # Solve for induced velocity /w Newton method (see "Helicopter Theory" section 4.1.1)
+    lambda_ = mu * np.tan(alpha) + Ct / (2.0 * np.sqrt(mu**2 + Ct/2.0))
+    for i in range(5):
+        lambda_ = (mu * np.tan(alpha) + Ct / 2.0 * (mu**2 + 2.0*lambda_**2) / (mu**2 + lambda_**2)**1.5) / \
+            (1.0 + Ct/2.0 * lambda_ / (mu**2 + lambda_**2)**1.5)
+    v = lambda_ * omega * rProp - V * np.sin(alpha)
+
+    # Power in forward flight (see "Helicopter Theory" section 5-12)
+    return W * (V * np.sin(alpha) + 1.3 * np.cosh(8 * mu**2) * v +
+                Cd0 * omega * rProp * (1 + 4.5 * mu**2 + 1.61 * mu**3.7) *
+                (1 - (0.03 + 0.1 * mu + 0.05 * np.sin(4.304 * mu - 0.20)) * (1-np.cos(alpha)**2)) / 8 / (Ct / sigma))
+
+
+def _minimize_scalar(f, lower, upper, xtol=1e-5):
+    ''' Vectorized bounded minimization of a unimodal f on [lower, upper], rows are design points.
+        f takes and returns (N, K) arrays. Large batches use golden-section search (one
+        evaluation per row and step); small batches, where the call overhead dominates,
+        evaluate 32 points per row and step and keep the bracket around the best one. Each row
+        stops on its own bracket, rows with a non-finite bracket are not searched. '''
+    a = np.array(lower, dtype=float)[:, None]
+    b = np.array(upper, dtype=float)[:, None]
+
+    def searching(a, b):
+        # Rows still wider than xtol; rows with a non-finite bracket (nan / inf designs) are left out,
+        # so they can't stop or prolong the search of the other rows
+        width = b - a
+        finite = np.isfinite(width)
+        return finite & (np.where(finite, width, 0.0) > xtol)
+
+    if a.size <= 64:
+        points = 32
+        step = np.linspace(0.0, 1.0, points + 2)[None, :]
+        rows = np.arange(a.size)[:, None]
+        xMin = np.empty_like(a)
+        active = np.ones(a.shape, dtype=bool)
+        while np.any(active):
+            x = a + (b - a) * step
+            k = np.argmin(f(x), axis=1)[:, None]
+            xMin = np.where(active, x[rows, k], xMin)
+            a = np.where(active, x[rows, np.maximum(k - 1, 0)], a)
+            b = np.where(active, x[rows, np.minimum(k + 1, points + 1)], b)
+            active &= searching(a, b)
+        return xMin[:, 0]
+
+    invphi = (math.sqrt(5.0) - 1.0) / 2.0
+    c = b - invphi * (b - a)
+    d = a + invphi * (b - a)
+    fc = f(c)
+    fd = f(d)
+    active = searching(a, b)
+    while np.any(active):
+        left = fc < fd
+        bNew = np.where(left, d, b)
+        aNew = np.where(left, a, c)
+        cNew = np.where(left, bNew - invphi * (bNew - aNew), d)
+        dNew = np.where(left, c, aNew + invphi * (bNew - aNew))
+        fNew = f(np.where(left, cNew, dNew))
+        fcNew, fdNew = np.where(left, fNew, fd), np.where(left, fc, fNew)
+        # Only the rows still searching move, the others keep their converged bracket
+        a, b = np.where(active, aNew, a), np.where(active, bNew, b)
+        c, d = np.where(active, cNew, c), np.where(active, dNew, d)
+        fc, fd = np.where(active, fcNew, fc), np.where(active, fdNew, fd)
+        active &= searching(a, b)
+    return ((a + b) / 2.0)[:, 0]
+
+
+def _assumptions(assumptions, defaults):
+    unknown = set(assumptions) - set(defaults)
+    if unknown:
+        raise TypeError('Unknown assumptions: {}'.format(', '.join(sorted(unknown))))
+    values = dict(defaults)
+    values.update((k, v) for k, v in assumptions.items() if v is not None)
+    return values
+
+
+def _split(assumptions):
+    physics = dict((k, v) for k, v in assumptions.items() if k in DEFAULT_PHYSICS)
+    economics = dict((k, v) for k, v in assumptions.items() if k not in DEFAULT_PHYSICS)
+    return physics, economics
+
+
+def physics_batch(Vehicle, rProp, cruiseSpeed, mBattery, mMotors, mtom, **assumptions):
+    ''' Range independent part of the model for N design points of one vehicle.
+        Returns {output name: (N,) array}. '''
+    vehicle = vehicle_key(Vehicle)
+    a = _assumptions(assumptions, DEFAULT_PHYSICS)
+    keys = sorted(a)
+    arrays = [np.ravel(x) for x in np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in
+                                                         [rProp, cruiseSpeed, mBattery, mMotors, mtom] +
+                                                         [a[k] for k in keys]])]
+    rProp, cruiseSpeed, mBattery, mMotors, mtom = arrays[:5]
+    a = dict(zip(keys, arrays[5:]))
+    V = cruiseSpeed
+    W = mtom*9.8  # MassToWeight
+    out = {'Vehicle': Vehicle, 'rProp': rProp, 'cruiseSpeed': cruiseSpeed, 'mBattery': mBattery,
+           'mMotors': mMotors, 'mtom': mtom, 'W': W, 'motorPowerDensity': a['motorPowerDensity']}
+
+    SCdFuse = 0.35  # Fuselage / landing gear area
+    k = 1.15  # Effective disk area factor (see "Helicopter Theory" Section 2-6.2)
+    Cd0Blade = 0.012  # Blade airfoil profile drag coefficient
+    sigma = 0.1  # Solidity
+    area = math.pi * rProp**2
+
+    if vehicle == TILTWING:
+        # CruisePower
+        VStall = 35  # m/s
+        CLmax = 1.1  # Whole aircraft CL, section Clmax much higher
+        bRef = 6 * rProp + 1.2  # Rough distance between hubs of outermost props
+        SRef = W / (0.5 * rho * VStall**2 * CLmax)
+        cRef = 0.5 * SRef / bRef
+        AR = bRef**2 / SRef
+        etaMotor = a['etaMotor']
+        Cd0 = a['wingProfileCD'] + SCdFuse / SRef
+        e = 1.3  # Span efficiency
+        CL = W / (0.5 * rho * V**2 * SRef)
+        etaProp = 0.8
+        D = 0.5 * rho * V**2 * (SRef * (Cd0 + CL**2 / (math.pi * AR * e)))
+        out['PCruise'] = D * V
+        out['PBattery'] = out['PCruise'] / etaProp / etaMotor
+        out['LoverD'] = W / D
+        out.update(bRef=bRef, SRef=SRef, cRef=cRef)
+
+        # HoverPower
+        nProp = 8  # Number of props / motors
+        ToverW = 1.7  # Max required T/W to handle rotor out w/ manuever margin
+        Vtip = sound * a['rotorTipMaxMachNumber'] / math.sqrt(ToverW)  # Limit tip speed at max thrust, not hover
+        THover = W / nProp
+        PHover = nProp * THover * (k * np.sqrt(THover / (2 * rho * area)) +
+                                   sigma * Cd0Blade / 8 * Vtip**3 / (THover / (rho * area)))
+        TMax = THover * ToverW
+        PMax = nProp * TMax * (k * np.sqrt(TMax / (2 * rho * area)) +
+                               sigma * Cd0Blade / 8 * (Vtip * math.sqrt(ToverW))**3 / (TMax / (rho * area)))
+        out['hoverPower_PBattery'] = PHover / etaMotor
+        out['hoverPower_PMax'] = PMax
+        out['hoverPower_PMaxBattery'] = PMax / etaMotor
+        out['hoverPower_Vtip'] = np.broadcast_to(Vtip, W.shape)
+        out['hoverPower_VAutoRotation'] = np.zeros_like(W)
+        out['TMax'] = TMax
+
+        # LoiterPower: lift coefficent at loiter a little below vehicle CLmax of ~1.1
+        CLLoiter = 1.0
+        VLoiter = np.sqrt(2.0 * W / (rho * SRef * CLLoiter))
+        DLoiter = 0.5 * rho * VLoiter**2 * (SRef * (Cd0 + CLLoiter**2 / (math.pi * AR * e)) + SCdFuse)
+        out['loiterV'] = VLoiter
+        out['loiterPower_PBattery'] = DLoiter * VLoiter / etaProp / etaMotor
+
+        # Structures
+        out['mass_wing'] = wing_mass_batch(W, bRef, cRef, 0.2, 0.4, rProp, TMax)
+        out['mass_canard'] = wing_mass_batch(W, bRef, cRef, 0.0, 0.6, rProp, TMax)
+        out['prop_mass'] = prop_mass_batch(rProp, TMax)
+        out['mass_fuselage'] = fuselage_mass_batch(5.0, 1.0, 1.65, bRef, W)
+        out['mass_wire'] = wire_mass_batch(bRef, 5.0, 1.65, out['hoverPower_PMaxBattery'], rProp, 8)
+        out['mass_rotor'] = np.zeros_like(W)
+        out['toolingCost'] = tooling_cost_batch(Vehicle, rProp, bRef, cRef)
+
+        # ConfigWeight
+        out['mass_structural'] = out['mass_wing'] + out['mass_canard'] + 8.0 * out['prop_mass'] + 8.0 * 2.0 + \
+            out['mass_fuselage'] + 0.02 * mtom
+        out['mass_m'] = 1.1 * (payload + 15.0 + 15.0 + 0.65 * 12.0 + 2.0 * 4.0 + out['mass_structural'] +
+                               mBattery + mMotors + out['mass_wire'] + 16.0)
+
+    elif vehicle == HELICOPTER:
+        # CruisePower
+        etaMotor = a['etaMotor'] * 0.98  # Motor and gearbox efficiencies
+        MTip = 0.65  # Tip Mach number constraint
+        B = 0.97  # Tip loss factor
+        omega = (sound * MTip - V) / rProp
+        Ct = W / (rho * math.pi * rProp**2 * B**2 * omega**2 * rProp**2)
+        out['PCruise'] = 1.1 * _helicopter_power(V, W, rProp, omega, Ct, Cd0Blade, sigma, SCdFuse)  # 10% tail rotor
+        out['PBattery'] = out['PCruise'] / etaMotor
+        out['LoverD'] = W / (out['PCruise'] / V)
+        out['omega'] = omega
+
+        # HoverPower
+        ToverW = 1.1  # Max required T/W for climb and operating at higher altitudes
+        Vtip = omega * rProp
+        THover = W
+        PHover = THover * (k * np.sqrt(THover / (2.0 * rho * area)) +
+                           sigma * Cd0Blade / 8.0 * Vtip**3.0 / (THover / (rho * area)))
+        TMax = THover * ToverW
+        PMax = 1.15 * TMax * (k * np.sqrt(TMax / (2.0 * rho * area)) +
+                              sigma * Cd0Blade / 8.0 * Vtip**3.0 / (TMax / (rho * area)))  # ~15% to tail rotor
+        out['hoverPower_PBattery'] = 1.1 * PHover / etaMotor  # ~10% power to tail rotor
+        out['hoverPower_PMax'] = PMax
+        out['hoverPower_PMaxBattery'] = PMax / etaMotor
+        out['hoverPower_Vtip'] = Vtip
+        out['hoverPower_VAutoRotation'] = 1.16 * np.sqrt(THover / area)
+        out['TMax'] = TMax
+        out['QMax'] = PMax / omega
+
+        # LoiterPower: speed for minimum power
+        def loiterPower(vLoiter):
+            return _helicopter_power(vLoiter, W[:, None], rProp[:, None], omega[:, None], Ct[:, None],
+                                     Cd0Blade, sigma, SCdFuse)
+        out['loiterV'] = _minimize_scalar(loiterPower, np.zeros_like(V), V)
+        out['loiterPower_PBattery'] = loiterPower(out['loiterV'][:, None])[:, 0] / etaMotor
+
+        # Structures
+        fuselageLength = 1.5 + 1.25 * rProp
+        out['prop_mass'] = prop_mass_batch(rProp, TMax)
+        out['prop_mass_tail'] = prop_mass_batch(rProp / 5.0, 1.5 * out['QMax'] / (1.25 * rProp))
+        out['mass_fuselage'] = fuselage_mass_batch(fuselageLength, 1.0, 2.0, 1.0, W)
+        out['mass_wire'] = wire_mass_batch(0.0, fuselageLength, 2.0, out['hoverPower_PMaxBattery'], rProp, 1)
+        out['mass_rotor'] = out['prop_mass']
+        out['toolingCost'] = tooling_cost_batch(Vehicle, rProp, 0.0, 0.0)
+
+        # ConfigWeight
+        mass_transmission = PMax / 1000.0 / 6.3  # 6.3 kW/kg transmission power density
+        out['mass_structural'] = out['prop_mass'] + 0.04 * mtom + out['prop_mass_tail'] + out['mass_fuselage'] + \
+            0.02 * mtom
+        out['mass_m'] = 1.1 * (payload + 15.0 + 15.0 + 0.65 * 8 + mass_transmission + out['mass_structural'] +
+                               mBattery + mMotors + out['mass_wire'] + 0)
+
+    out['mass_W'] = out['mass_m'] * 9.8
+    return out
+
+
+def range_batch(physics, range, **assumptions):
+    ''' Add missions, operating cost and constraints for `range` (broadcast against the
+        physics design points) to a physics_batch result. Returns a new dict. '''
+    econ = _assumptions(assumptions, DEFAULT_ECONOMICS)
+    range = np.asarray(range, dtype=float)
+    n = np.broadcast(physics['W'], range, *[np.asarray(v) for v in econ.values()]).size
+    out = dict((k, np.broadcast_to(v, (n,)) if isinstance(v, np.ndarray) else v) for k, v in physics.items())
+    cruiseTime = range / physics['cruiseSpeed']
+
+    # SimpleMission: 1 hop, no loiter
+    out['range'] = np.broadcast_to(range, (n,))
+    out['E'] = (physics['hoverPower_PBattery'] * 180.0 + physics['PBattery'] * cruiseTime) * 2.77778e-7  # kW-hr
+    out['flightTime'] = 180.0 + cruiseTime
+
+    # ReserveMission: 2 hops, 17 minute loiter
+    out['EReserve'] = (physics['hoverPower_PBattery'] * 360.0 + physics['PBattery'] * cruiseTime +
+                       physics['loiterPower_PBattery'] * 1020.0) * 2.77778e-7
+
+    out['costs'] = operating_cost_batch(physics['Vehicle'], physics['rProp'], out['flightTime'], out['E'],
+                                        physics['mass_structural'], physics['mBattery'], physics['mMotors'],
+                                        physics['toolingCost'], **econ)
+    out['DOC'] = out['costs']['C_costPerFlight']
+
+    out['margins'] = constraint_margins(physics['Vehicle'], physics['mBattery'], physics['mMotors'], physics['mtom'],
+                                        out['EReserve'], physics['hoverPower_PMax'],
+                                        physics['hoverPower_VAutoRotation'], physics['hoverPower_Vtip'],
+                                        physics['mass_W'], physics['mass_m'], physics['mass_rotor'],
+                                        physics['rProp'], physics['cruiseSpeed'],
+                                        batteryEnergyDensity=econ['batteryEnergyDensity'],
+                                        motorPowerDensity=physics['motorPowerDensity'])
+    out['feasible'] = feasible(out['margins'])
+    return out
+
+
+def evaluate_batch(Vehicle, range, rProp, cruiseSpeed, mBattery, mMotors, mtom, **assumptions):
+    ''' Full model for N design points of one vehicle, see range_batch for the outputs. '''
+    physicsAssumptions, economics = _split(assumptions)
+    physics = physics_batch(Vehicle, rProp, cruiseSpeed, mBattery, mMotors, mtom, **physicsAssumptions)
+    return range_batch(physics, range, **economics)
+
+
+if __name__ == "__main__":
+    # Sample Inputs: the 10 km tiltwing optimum of vahana_optimizer.py over a range sweep
+    result = evaluate_batch(u'tiltwing', np.linspace(10000.0, 200000.0, 5), 0.8463, 52.04, 114.9, 34.55, 513.4)
+    for r, doc, ok in zip(result['range'], result['DOC'], result['feasible']):
+        print("Range (km):", r / 1000.0, "DOC ($):", doc, "feasible:", ok)
@@ -0,0 +1,50 @@
+'''
+# Name: vehicle.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Vehicle type helpers shared by the batch (vectorized) kernels
+
+# The OpenMDAO components compare params['Vehicle'].lower().replace('-', '')
+# against 'tiltwing' and 'helicopter' in every branch. The batch kernels
+# normalize the vehicle type once and work with boolean masks instead.
+
+# Inputs:
+#   Vehicle     - vehicle type ('tiltwing', 'tilt-wing' or 'helicopter'),
+#                 either a single string or an array of strings
+
+# Outputs:
+#   vehicle_key     - normalized vehicle type string
+#   vehicle_masks   - (isTiltwing, isHelicopter) boolean arrays
+'''
+
+from __future__ import print_function
+
+import numpy as np
+
+TILTWING = u'tiltwing'
+HELICOPTER = u'helicopter'
+VEHICLES = (TILTWING, HELICOPTER)
+
+
+def vehicle_key(Vehicle):
+    ''' Normalize a vehicle type string, e.g. u'Tilt-Wing' -> u'tiltwing' '''
+    key = Vehicle.lower().replace('-', '')
+    if key not in VEHICLES:
+        raise ValueError('Vehicle not recognized: {}'.format(Vehicle))
+    return key
+
+
+def vehicle_masks(Vehicle, n):
+    ''' Return (isTiltwing, isHelicopter) boolean arrays of length n.
+        Vehicle may be a single string or a sequence of n strings. '''
+    if isinstance(Vehicle, (str, type(u''))):
+        key = vehicle_key(Vehicle)
+        isTiltwing = np.full(n, key == TILTWING, dtype=bool)
+    else:
+        keys = np.array([vehicle_key(v) for v in np.ravel(Vehicle)])
+        if keys.size != n:
+            raise ValueError('Expected {} vehicle types, got {}'.format(n, keys.size))
+        isTiltwing = keys == TILTWING
+    return isTiltwing, ~isTiltwing
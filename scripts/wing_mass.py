@@ -28,10 +28,10 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
+from analysis_errors import analysis_errors
 import math
 import numpy as np
-from scipy import interpolate
 
 class wing_mass(Component):
 
@@ -49,7 +49,9 @@ class wing_mass(Component):
         
         self.add_output('mass', val=1.0)
         
+    @analysis_errors
     def solve_nonlinear(self, params, unknowns, resids):
+        from scipy import interpolate  # not at load, see vahana_batch.py for the cached section
         # Setup
         N = 10  # Number of spanwise points
         sf = 1.5  # Safety factor
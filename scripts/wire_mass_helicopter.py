@@ -26,7 +26,8 @@
 
 from __future__ import print_function
 
-from openmdao.api import Component
+from openmdao.core.component import Component
+from analysis_errors import analysis_errors
 import numpy as np
 import math
 
@@ -41,6 +42,7 @@ class wire_mass(Component):
         
         self.add_output('mass', val=0.0)
     
+    @analysis_errors
     def solve_nonlinear(self, params, unknowns, resids):
         # In the future, xmotor should be a parameter array that gets passed in from the outside
         xmotor = params['xmotor']
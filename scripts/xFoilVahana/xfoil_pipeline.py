@@ -0,0 +1,218 @@
+'''
+# Name: xfoil_pipeline.py
+# Company: MetaMorph, Inc.
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# XFOIL testbench stages (populate, simulate, save metrics) and a fused runner
+
+# The testbench runs stepPopulateXFOILTemplate*, stepRunXFOILSimulation* and
+# stepSaveMetrics* as three processes, each of which re-reads and rewrites
+# testbench_manifest.json, with script.xfoil passed between them on disk.
+# The step scripts are now thin command lines around the stages below.
+# run_pipeline runs all three in one process: the manifest is read once, the
+# XFOIL script goes to XFOIL's stdin from memory, and the manifest, script and
+# logs are written once at the end. XFOIL itself still writes polar.txt and
+# plot.ps, which the save stage reads back.
+
+# Usage (in the testbench directory):
+#   python xfoil_pipeline.py            - template.xfoil, metrics of the last polar point
+#   python xfoil_pipeline.py --search   - alpha stepped from 5 deg, metrics of the best glide ratio
+
+# Inputs:
+#   testbench_manifest.json - Parameters Naca_Code, Reynolds_Number, Alpha
+
+# Outputs:
+#   testbench_manifest.json - Metrics Ncrit, CL, CD, CM, Alpha2, CL_CD_CM_Table, Glide_Ratio, Artifacts, Status
+#   script.xfoil, log/xfoil-stdout.log, log/xfoil-stderr.log (polar.txt and plot.ps from XFOIL)
+'''
+
+from __future__ import print_function
+
+import argparse
+import json
+import math
+import os
+import platform
+import posixpath
+import sys
+from string import Template
+from subprocess import Popen, PIPE, STDOUT
+
+MANIFEST = 'testbench_manifest.json'
+SCRIPT = 'script.xfoil'
+POLAR = 'polar.txt'
+TEMPLATE_DIR = os.path.dirname(os.path.realpath(__file__))
+
+# XFOIL executable by platform.system(), on the PATH elsewhere
+XFOIL = {'Windows': 'C:/OpenMETA/xfoil-and-nrel-codes/bin/xfoil.exe',
+         'Darwin': '/Applications/Xfoil.app/Contents/Resources/xfoil'}
+
+# Files of the simulation stage, by artifact tag
+RUN_ARTIFACTS = {"plot": "plot.ps",
+                 "polar table": POLAR,
+                 "XFOIL stdout log": posixpath.join("log", "xfoil-stdout.log"),
+                 "XFOIL stderr log": posixpath.join("log", "xfoil-stderr.log")}
+
+# First angle of attack of the search script [deg], and its step
+SEARCH_START = 5.0
+SEARCH_STEP = 0.5
+
+
+def load_manifest(path=MANIFEST):
+    with open(path, 'r') as f_in:
+        return json.load(f_in)
+
+
+def write_manifest(testbench_manifest, path=MANIFEST):
+    with open(path, 'w') as f_out:
+        json.dump(testbench_manifest, f_out, indent=2)
+
+
+def read_testbench_manifest_parameters(testbench_manifest):
+    parameters_dict = dict()
+    print("Reading parameters from testbench_manifest.json...")
+    print()
+    for parameter in testbench_manifest['Parameters']:
+        parameters_dict[parameter['Name']] = parameter['Value']
+        print(parameter['Name'] + ": " + str(parameter['Value']))
+    print()
+    return parameters_dict
+
+
+def script_failed(testbench_manifest, err_message):
+    ''' Mark the manifest as FAILED, without artifacts or metrics '''
+    testbench_manifest["Status"] = "FAILED"
+    testbench_manifest["Artifacts"] = []
+    testbench_manifest["Metrics"] = []
+    testbench_manifest["ErrorMessage"] = err_message
+
+
+def _search_script(naca, reynolds, alpha):
+    ''' XFOIL script stepping alpha from SEARCH_START to alpha, so XFOIL converges from a solved point '''
+    lines = ['naca ' + str(naca), 'plop', 'g', '', 'oper', 'visc ' + str(reynolds), 'pacc', POLAR, '']
+    offset = -SEARCH_STEP if SEARCH_START > alpha else SEARCH_STEP
+    # Whole steps short of alpha, so an alpha off the SEARCH_STEP grid (7.2) ends the search too
+    steps = int(math.floor(abs(alpha - SEARCH_START) / SEARCH_STEP + 1e-9))
+    for step in range(steps):
+        lines += ['alfa ' + str(SEARCH_START + step * offset), '!', '!']
+    lines += ['alfa ' + str(alpha), '!', '!', 'pacc', 'pplo', 'hard', '', 'quit']
+    return '\n'.join(lines) + '\n'
+
+
+def populate(testbench_manifest, search=False, templateDir=TEMPLATE_DIR):
+    ''' XFOIL script of the manifest parameters (KeyError for a template parameter missing from them) '''
+    replacement_dict = read_testbench_manifest_parameters(testbench_manifest)
+    replacement_dict['Naca_Code'] = int(replacement_dict.get('Naca_Code', 0))
+    if replacement_dict.get('Reynolds_Number') is None:
+        raise ValueError('Reynolds_Number must be provided')
+    if search:
+        alpha = float(replacement_dict.get('Alpha', 0))
+        return _search_script(replacement_dict['Naca_Code'], replacement_dict['Reynolds_Number'], alpha)
+    with open(os.path.join(templateDir, 'template.xfoil'), 'r') as f_in:
+        xfoil_template = Template(f_in.read())
+    return xfoil_template.substitute(replacement_dict)
+
+
+def run_xfoil(xfoil_script):
+    ''' (stdout, stderr, returncode) of XFOIL run on the script, which writes polar.txt and plot.ps '''
+    for f in ("plot.ps", POLAR):
+        if os.path.exists(f):
+            os.remove(f)
+    p = Popen([XFOIL.get(platform.system(), 'xfoil')], stdin=PIPE, stdout=PIPE, stderr=STDOUT,
+              universal_newlines=True)
+    stdout, stderr = p.communicate(input=xfoil_script)
+    return stdout, stderr, p.returncode
+
+
+def write_logs(stdout, stderr):
+    if not os.path.isdir('log'):
+        os.makedirs('log')
+    with open(os.path.join('log', 'xfoil-stdout.log'), 'w') as f_out:
+        f_out.write(stdout or '')
+    with open(os.path.join('log', 'xfoil-stderr.log'), 'w') as f_out:
+        f_out.write(stderr or '')
+
+
+def record_run_artifacts(testbench_manifest):
+    ''' Add the files of the simulation stage that exist to the manifest artifacts '''
+    artifacts = testbench_manifest["Artifacts"]
+    for k, v in RUN_ARTIFACTS.items():
+        if os.path.exists(v):
+            artifacts.append({"Tag": k, "Location": v})
+
+
+def polar_metrics(polar_text, search=False):
+    ''' Metrics of an XFOIL polar file: the last point, or with search the point of the best glide ratio '''
+    polar_lines = [line.split() for line in polar_text.splitlines()]
+
+    NCrit = None
+    for line in polar_lines:
+        for y in range(len(line) - 2):
+            if line[y] == "Ncrit" and line[y + 1] == '=':
+                NCrit = line[y + 2]
+
+    # The CL/CD/CM table follows the '------' row under its header
+    start = None
+    for x, line in enumerate(polar_lines):
+        if line and line[0][0] == '-':
+            start = x + 1
+            break
+    cl_cd_cm_table = [[float(value) for value in line] for line in polar_lines[start:] if line] \
+        if start is not None else []
+    if not cl_cd_cm_table:
+        raise ValueError('no converged points in ' + POLAR)
+
+    # max keeps the first of equal glide ratios
+    best = max(cl_cd_cm_table, key=lambda row: row[1] / row[2]) if search else cl_cd_cm_table[-1]
+    return {"Ncrit": NCrit, "CL": best[1], "CM": best[4], "CD": best[2], "Alpha2": best[0],
+            "CL_CD_CM_Table": cl_cd_cm_table, "Glide_Ratio": best[1] / best[2]}
+
+
+def save_metrics(testbench_manifest, metrics):
+    ''' Set the manifest metrics that are listed in it, and mark it OK '''
+    for metric in testbench_manifest["Metrics"]:
+        if str(metric["Name"]) in metrics:
+            metric["Value"] = metrics[str(metric["Name"])]
+    testbench_manifest["Status"] = "OK"
+
+
+def run_pipeline(search=False):
+    ''' Populate, simulate and save in one process, exit code of the testbench '''
+    testbench_manifest = load_manifest()
+    try:
+        xfoil_script = populate(testbench_manifest, search)
+    except KeyError as Argument:
+        script_failed(testbench_manifest, "Error: Run Aborted: {} does not exist in testbench_config.".format(Argument))
+        write_manifest(testbench_manifest)
+        print("Error: {} does not exist in testbench_config.".format(Argument))
+        return 1
+    testbench_manifest["Artifacts"].append({"Tag": "XFOIL Script", "Location": SCRIPT})
+
+    print("Running XFOIL simulation...")
+    stdout, stderr, returncode = run_xfoil(xfoil_script)
+    with open(SCRIPT, 'w') as f_out:
+        f_out.write(xfoil_script)
+    write_logs(stdout, stderr)
+    record_run_artifacts(testbench_manifest)
+
+    if returncode == 0:
+        try:
+            with open(POLAR, 'r') as f_in:
+                metrics = polar_metrics(f_in.read(), search)
+        except (IOError, ValueError, IndexError) as err:
+            script_failed(testbench_manifest, "Error: Run Aborted: {}".format(err))
+            returncode = 1
+        else:
+            save_metrics(testbench_manifest, metrics)
+    write_manifest(testbench_manifest)
+    print("Done.")
+    return returncode
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='XFOIL testbench: populate, simulate and save metrics in one process.')
+    parser.add_argument('--search', action='store_true',
+                        help='step alpha from 5 deg and keep the best glide ratio (the *WithSearch steps)')
+    args = parser.parse_args()
+    sys.exit(run_pipeline(args.search))